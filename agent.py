@@ -0,0 +1,177 @@
+import os
+import selectors
+import signal
+import socket
+import sys
+import time
+from core.snapshot import build_snapshot, diff_snapshot, apply_delta, encode_frame, parse_address
+
+# Un client care nu citește nu poate umple memoria agentului: peste limită e deconectat
+MAX_CLIENT_BACKLOG = 8 * 1024 * 1024
+
+
+class SnapshotAgent:
+    """Serves delta-encoded monitor snapshots to any number of clients
+
+    Every client first gets a full snapshot, then one delta per tick. All
+    sockets are non-blocking and multiplexed with `selectors`, so a slow
+    aggregator never stalls the collection loop.
+    """
+
+    def __init__(self, address):
+        self.address = address
+        family, sockaddr = parse_address(address)
+        if family == socket.AF_UNIX and os.path.exists(sockaddr):
+            os.unlink(sockaddr)
+        self._server = socket.socket(family, socket.SOCK_STREAM)
+        if family != socket.AF_UNIX:
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(sockaddr)
+        self._server.listen(16)
+        self._server.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._clients = {}   # socket -> bytearray (date netrimise)
+        self._state = None
+        self._last_finding_id = None
+        self.sent_bytes = 0
+
+    @property
+    def client_count(self):
+        return len(self._clients)
+
+    def publish(self, monitor):
+        """Take a snapshot of the monitor and queue it to every client"""
+        snapshot = build_snapshot(monitor, self._last_finding_id)
+        if snapshot['findings']:
+            self._last_finding_id = max(row[0] for row in snapshot['findings'])
+        if self._state is None:
+            # Primul snapshot: clienții deja conectați îl primesc complet
+            self._state = snapshot
+            full = dict(snapshot)
+            full['t'] = 'full'
+            frame = encode_frame(full)
+        else:
+            delta = diff_snapshot(self._state, snapshot)
+            apply_delta(self._state, delta)
+            delta['t'] = 'delta'
+            frame = encode_frame(delta)
+        for sock in list(self._clients):
+            self._queue(sock, frame)
+
+    def _queue(self, sock, frame):
+        pending = self._clients[sock]
+        pending.extend(frame)
+        if len(pending) > MAX_CLIENT_BACKLOG:
+            self._drop(sock)
+            return
+        self._selector.modify(sock, selectors.EVENT_READ | selectors.EVENT_WRITE)
+
+    def _accept(self):
+        try:
+            sock, _ = self._server.accept()
+        except OSError:
+            return
+        sock.setblocking(False)
+        self._clients[sock] = bytearray()
+        self._selector.register(sock, selectors.EVENT_READ)
+        if self._state is not None:
+            full = dict(self._state)
+            full['t'] = 'full'
+            self._queue(sock, encode_frame(full))
+
+    def _drop(self, sock):
+        self._clients.pop(sock, None)
+        try:
+            self._selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        sock.close()
+
+    def poll(self, timeout=0.0):
+        """Accept clients and flush queued data for up to `timeout` seconds"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = max(0.0, deadline - time.monotonic())
+            for key, events in self._selector.select(remaining):
+                sock = key.fileobj
+                if sock is self._server:
+                    self._accept()
+                    continue
+                if events & selectors.EVENT_READ:
+                    # Clienții nu trimit nimic; date sau EOF = închidere
+                    try:
+                        if not sock.recv(4096):
+                            self._drop(sock)
+                            continue
+                    except BlockingIOError:
+                        pass
+                    except OSError:
+                        self._drop(sock)
+                        continue
+                if events & selectors.EVENT_WRITE:
+                    self._flush(sock)
+            if time.monotonic() >= deadline:
+                break
+
+    def _flush(self, sock):
+        pending = self._clients.get(sock)
+        if pending is None:
+            return
+        try:
+            sent = sock.send(pending)
+        except BlockingIOError:
+            return
+        except OSError:
+            self._drop(sock)
+            return
+        del pending[:sent]
+        self.sent_bytes += sent
+        if not pending:
+            self._selector.modify(sock, selectors.EVENT_READ)
+
+    def close(self):
+        for sock in list(self._clients):
+            self._drop(sock)
+        self._selector.close()
+        self._server.close()
+        family, sockaddr = parse_address(self.address)
+        if family == socket.AF_UNIX:
+            try:
+                os.unlink(sockaddr)
+            except OSError:
+                pass
+
+
+def run_agent(monitor, address, interval=2.0):
+    """Headless collection loop that publishes snapshots (main.py --agent)"""
+    agent = SnapshotAgent(address)
+    # SIGTERM (systemd, kill) trece prin `finally`: socket-ul Unix e șters, indexul închis
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"📡 Agent activ pe {address} (Ctrl+C pentru oprire)")
+    if not monitor.detector.load_from_store():
+        monitor.refresh_logs(force_full=True)
+    monitor.proc_events.start()
+    try:
+        while True:
+            started = time.monotonic()
+            monitor.apply_process_events()
+            # Procesele și log-urile pe intervalele adaptive ale monitorului (bugetul de CPU)
+            monitor.scheduler.update(monitor.detector.worker_cpu())
+            monitor.refresh_processes()
+            stage_started = time.perf_counter()
+            monitor.stats_sampler.tick()
+            monitor.record_timing('stats', stage_started)
+            if monitor.logs_due():
+                monitor.refresh_logs(force_full=False)
+            stage_started = time.perf_counter()
+            agent.publish(monitor)
+            monitor.record_timing('publish', stage_started)
+            if monitor.metrics is not None:
+                monitor.metrics.update(monitor)
+            if monitor.recorder is not None:
+                monitor.recorder.maybe_record(monitor)
+            agent.poll(max(0.0, interval - (time.monotonic() - started)))
+    finally:
+        agent.close()
+        monitor.shutdown()
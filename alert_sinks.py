@@ -0,0 +1,242 @@
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from datetime import datetime
+
+# Severitatea syslog (RFC 5424) pentru fiecare categorie de găsire
+SYSLOG_SEVERITY = {'CRITICAL': 2, 'SYSTEM': 3, 'SECURITY': 4, 'NETWORK': 4, 'WARNING': 4}
+SYSLOG_FACILITY_USER = 1
+SYSLOG_TAG = 'monitor_sistem'
+
+HOSTNAME = socket.gethostname()
+
+
+def log_alert(entry):
+    """Alert dict for a categorized log finding (LogEntry)"""
+    categories = list(entry.categories)
+    return {'ts': entry.ts, 'kind': 'log', 'severity': categories[0] if categories else 'UNKNOWN',
+            'categories': categories, 'source': entry.source, 'pid': entry.pid, 'message': entry.line}
+
+
+def process_alert(info, origin):
+    """Alert dict for a process matching a detection rule (`origin`: poll or exec)"""
+    cmdline = ' '.join(info.get('cmdline') or []) or info.get('name')
+    return {'ts': time.time(), 'kind': 'process', 'severity': 'SECURITY', 'origin': origin,
+            'rule': info.get('rule'), 'pid': info['pid'], 'name': info.get('name'),
+            'user': info.get('username'), 'message': cmdline}
+
+
+def format_alert_line(alert):
+    """One JSON line per alert, with the host and an ISO time added"""
+    record = dict(alert, host=HOSTNAME, time=datetime.fromtimestamp(alert['ts']).isoformat(timespec='seconds'))
+    return json.dumps(record, ensure_ascii=False, default=str) + '\n'
+
+
+class JsonFileSink:
+    """Append-only JSON Lines file"""
+
+    def __init__(self, path):
+        self.name = f'json:{path}'
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, alerts):
+        self._file.write(''.join(format_alert_line(alert) for alert in alerts))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class UnixSocketSink:
+    """JSON Lines over a Unix stream socket, reconnecting after failures"""
+
+    def __init__(self, path, timeout=2.0):
+        self.name = f'unix:{path}'
+        self.path = path
+        self.timeout = timeout
+        self._sock = None
+
+    def write(self, alerts):
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        try:
+            self._sock.sendall(''.join(format_alert_line(alert) for alert in alerts).encode('utf-8'))
+        except OSError:
+            self.close()
+            raise
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+class SyslogSink:
+    """Local syslog via the /dev/log datagram socket (RFC 3164 framing)"""
+
+    def __init__(self, path='/dev/log', timeout=2.0):
+        self.name = f'syslog:{path}'
+        self.path = path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(path)
+
+    def write(self, alerts):
+        for alert in alerts:
+            priority = SYSLOG_FACILITY_USER * 8 + SYSLOG_SEVERITY.get(alert['severity'], 5)
+            text = f"[{alert['kind']}/{alert['severity']}] pid={alert.get('pid')} {alert['message']}"
+            self._sock.send(f"<{priority}>{SYSLOG_TAG}[{os.getpid()}]: {text}".encode('utf-8', 'replace')[:8192])
+
+    def close(self):
+        self._sock.close()
+
+
+def parse_sink(spec):
+    """Sink from `json:/cale`, `unix:/cale` or `syslog[:/dev/log]`"""
+    kind, _, target = spec.partition(':')
+    if kind == 'json' and target:
+        return JsonFileSink(target)
+    if kind == 'unix' and target:
+        return UnixSocketSink(target)
+    if kind == 'syslog':
+        return SyslogSink(target or '/dev/log')
+    raise ValueError(f"destinație de alerte necunoscută: {spec} (json:/cale, unix:/cale, syslog)")
+
+
+class _SinkWorker:
+    """Bounded queue and delivery thread of one sink"""
+
+    def __init__(self, sink, queue_size, batch_size, flush_interval):
+        self.sink = sink
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = {'sent': 0, 'dropped': 0, 'failed': 0, 'batches': 0}
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name=f'alerts-{sink.name}', daemon=True)
+        self._thread.start()
+
+    def offer(self, alert):
+        try:
+            self.queue.put_nowait(alert)
+        except queue.Full:
+            self.stats['dropped'] += 1
+
+    def _run(self):
+        backoff = 0.0
+        while True:
+            alert = self.queue.get()
+            if alert is None:
+                break
+            batch = [alert]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            # Lotul se închide la batch_size alerte sau după flush_interval de la prima
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    alert = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if alert is None:
+                    stop = True
+                    break
+                batch.append(alert)
+            try:
+                self.sink.write(batch)
+                self.stats['sent'] += len(batch)
+                self.stats['batches'] += 1
+                backoff = 0.0
+            except (OSError, ValueError) as e:
+                # Destinația indisponibilă: lotul se pierde (numărat), următoarea încercare după o pauză
+                self.stats['failed'] += len(batch)
+                self.last_error = str(e)
+                backoff = min(30.0, backoff * 2 or 1.0)
+                time.sleep(backoff)
+            if stop:
+                break
+        try:
+            self.sink.close()
+        except OSError:
+            pass
+
+    def stop(self):
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:
+            # Coada plină: ce e în ea se renunță, worker-ul trebuie să vadă oprirea
+            while True:
+                try:
+                    self.queue.get_nowait()
+                    self.stats['dropped'] += 1
+                except queue.Empty:
+                    break
+            self.queue.put_nowait(None)
+
+    def join(self, timeout):
+        self._thread.join(timeout)
+
+
+class AlertPipeline:
+    """Fan-out of detections to sinks without blocking the collectors
+
+    `publish()` only checks a token bucket and does a non-blocking put on
+    each sink's bounded queue; every sink has its own delivery thread that
+    writes in batches, so a slow or dead destination fills (and drops from)
+    its own queue and nothing else. Alerts over the rate limit, full queues
+    and failed writes are counted separately.
+    """
+
+    def __init__(self, sinks, queue_size=1000, batch_size=100, flush_interval=1.0, rate=50.0, burst=200):
+        self.rate = rate
+        self.burst = burst
+        self.published = 0
+        self.rate_limited = 0
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self.workers = [_SinkWorker(sink, queue_size, batch_size, flush_interval) for sink in sinks]
+
+    def publish(self, alert):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+        if self._tokens < 1:
+            self.rate_limited += 1
+            return False
+        self._tokens -= 1
+        self.published += 1
+        for worker in self.workers:
+            worker.offer(alert)
+        return True
+
+    def publish_entries(self, entries):
+        for entry in entries:
+            self.publish(log_alert(entry))
+
+    def dropped(self):
+        """Alerts lost to the rate limit, full queues or failed writes"""
+        return self.rate_limited + sum(w.stats['dropped'] + w.stats['failed'] for w in self.workers)
+
+    def sent(self):
+        return sum(w.stats['sent'] for w in self.workers)
+
+    def close(self, timeout=1.0):
+        """Stop the workers, waiting at most `timeout` in total for pending batches"""
+        for worker in self.workers:
+            worker.stop()
+        deadline = time.monotonic() + timeout
+        for worker in self.workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
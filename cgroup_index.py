@@ -0,0 +1,109 @@
+import os
+import re
+
+# Ordinea în care se alege ierarhia din /proc/[pid]/cgroup: v2 unificat, apoi v1
+CONTROLLER_PRIORITY = ('', 'name=systemd', 'cpu,cpuacct', 'cpu', 'memory', 'pids')
+
+# docker-<id>.scope, cri-containerd-<id>.scope, crio-<id>.scope, libpod-<id>.scope sau /docker/<id>
+_CONTAINER_RE = re.compile(r'^(?:(?:docker|cri-containerd|crio|libpod)-)?([0-9a-f]{64})(?:\.scope)?$')
+_POD_RE = re.compile(r'pod([0-9a-f_-]{36})\.slice$')
+
+
+def read_cgroup(pid, proc_root='/proc'):
+    """Cgroup path of a process (most specific hierarchy), None if it is gone"""
+    try:
+        with open(os.path.join(proc_root, str(pid), 'cgroup'), 'r') as f:
+            content = f.read()
+    except OSError:
+        return None
+    paths = {}
+    for line in content.splitlines():
+        parts = line.split(':', 2)
+        if len(parts) == 3:
+            paths.setdefault(parts[1], parts[2])
+    for controller in CONTROLLER_PRIORITY:
+        path = paths.get(controller)
+        if path and path != '/':
+            return path
+    return '/'
+
+
+def describe_cgroup(path):
+    """(kind, label) for a cgroup path: container, systemd unit, slice or the raw path"""
+    parts = [part for part in path.split('/') if part]
+    for part in reversed(parts):
+        match = _CONTAINER_RE.match(part)
+        if match:
+            pod = next((m.group(1)[:8] for m in map(_POD_RE.search, parts) if m), None)
+            label = match.group(1)[:12]
+            return 'container', f"{label} (pod {pod})" if pod else label
+    if not parts:
+        return 'root', '/'
+    last = parts[-1]
+    if last.endswith('.service') or last.endswith('.scope'):
+        return 'unit', last
+    if last.endswith('.slice'):
+        return 'slice', last
+    return 'cgroup', path
+
+
+class CgroupGroup:
+    """Aggregated CPU/memory of the processes in one cgroup"""
+
+    __slots__ = ('path', 'kind', 'label', 'cpu', 'mem', 'count', 'suspicious')
+
+    def __init__(self, path):
+        self.path = path
+        self.kind, self.label = describe_cgroup(path)
+        self.cpu = 0.0
+        self.mem = 0.0
+        self.count = 0
+        self.suspicious = 0
+
+
+class CgroupIndex:
+    """pid -> cgroup mapping kept across refreshes, with per-group totals
+
+    Only pids not seen before (or reused, detected via create_time) read
+    /proc/[pid]/cgroup; the totals are rebuilt from the process snapshot the
+    monitor already collected.
+    """
+
+    def __init__(self, proc_root='/proc'):
+        self.proc_root = proc_root
+        self._paths = {}   # pid -> (create_time, cale cgroup)
+        self.groups = []
+        self.reads = 0
+
+    def path_for(self, pid):
+        cached = self._paths.get(pid)
+        return cached[1] if cached is not None else None
+
+    def update(self, processes):
+        """Resolve new pids and recompute the groups from a process snapshot"""
+        paths = {}
+        groups = {}
+        for _, is_suspicious, info in processes:
+            pid = info['pid']
+            create_time = info.get('create_time')
+            cached = self._paths.get(pid)
+            if cached is None or cached[0] != create_time:
+                path = read_cgroup(pid, self.proc_root)
+                self.reads += 1
+                if path is None:
+                    continue
+                cached = (create_time, path)
+            paths[pid] = cached
+
+            group = groups.get(cached[1])
+            if group is None:
+                group = groups[cached[1]] = CgroupGroup(cached[1])
+            group.cpu += info.get('cpu_percent') or 0.0
+            group.mem += info.get('memory_percent') or 0.0
+            group.count += 1
+            if is_suspicious:
+                group.suspicious += 1
+        # Pid-urile dispărute din snapshot ies din index
+        self._paths = paths
+        self.groups = list(groups.values())
+        return self.groups
@@ -0,0 +1,230 @@
+import os
+import threading
+import time
+import psutil
+
+MAX_CHILDREN = 10
+# Câte intrări (pid-uri vizitate) păstrăm în cache
+MAX_CACHED = 64
+
+
+class ProcessDetails:
+    """Detail snapshot of one process, as shown by the selected-process panels"""
+
+    __slots__ = ('pid', 'create_time', 'status', 'threads', 'fds', 'open_files', 'socket_inodes',
+                 'children', 'child_count', 'partial', 'timed_out', 'error', 'fetched_at', 'duration')
+
+    def __init__(self, pid, create_time=None):
+        self.pid = pid
+        self.create_time = create_time
+        self.status = None
+        self.threads = None
+        self.fds = None
+        self.open_files = None
+        self.socket_inodes = frozenset()
+        self.children = []   # (pid, nume, cpu%, mem%)
+        self.child_count = 0
+        self.partial = False  # Scanarea fd-urilor s-a oprit la termenul limită
+        self.timed_out = False
+        self.error = None
+        self.fetched_at = 0
+        self.duration = 0.0
+
+
+class DetailFetcher:
+    """Selected-process details (status, fds, sockets, threads, children) read off the UI thread
+
+    `get()` never blocks: it returns the last known details for a pid and
+    queues a refresh once they are older than `ttl`. Only the latest request
+    is kept, so scrolling through the list does not build a backlog. The fd
+    scan stops at `timeout` and reports a partial count; a fetch stuck in
+    the kernel longer than that is abandoned to a fresh worker (at most one
+    at a time) so other processes keep getting details. If an abandoned
+    worker is still stuck when the next one stalls, the pid is still marked
+    as timed out, but no requests are queued until one of them returns.
+    """
+
+    def __init__(self, ttl=2.0, timeout=3.0, proc_root='/proc'):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.proc_root = proc_root
+        self.timeouts = 0
+        self._cache = {}        # pid -> ProcessDetails
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending = None    # (pid, create_time) cerut de UI
+        self._inflight = None   # (pid, monotonic start)
+        self._generation = 0
+        self._worker = None
+        self._stalled = None    # Worker abandonat, încă blocat într-un apel de sistem
+        self._blocked = None    # Worker curent blocat care nu a putut fi înlocuit (limita de un abandonat)
+        self._child_procs = {}  # pid copil -> psutil.Process (cpu_percent între citiri)
+
+    @property
+    def pending(self):
+        return self._pending is not None or self._inflight is not None
+
+    def get(self, pid, create_time=None):
+        """(details or None, refreshing) for `pid`; schedules a refresh when the entry is stale"""
+        now = time.monotonic()
+        with self._lock:
+            inflight = self._inflight
+            if inflight is not None and now - inflight[1] > self.timeout:
+                self._abandon_worker(now)
+                inflight = self._inflight
+            # Citit după abandon: un pid tocmai expirat își vede marcajul de timeout și nu e recerut imediat
+            details = self._cache.get(pid)
+            if details is not None and create_time is not None and details.create_time not in (None, create_time):
+                details = None  # pid refolosit de alt proces
+            if self._blocked is not None and not (self._stalled is not None and self._stalled.is_alive()):
+                # Workerul abandonat anterior a ieșit: cel blocat poate fi abandonat la rândul lui
+                self._replace_worker()
+            refreshing = inflight is not None and inflight[0] == pid
+            if self._blocked is not None:
+                return details, False
+            # După un timeout procesul e reîncercat mult mai rar, ca să nu blocheze din nou worker-ul
+            ttl = self.ttl * 10 if details is not None and details.timed_out else self.ttl
+            if not refreshing and (details is None or now - details.fetched_at >= ttl):
+                self._pending = (pid, create_time)
+                self._wakeup.set()
+                self._ensure_worker()
+                refreshing = True
+        return details, refreshing
+
+    def close(self):
+        """Let the worker exit at its next wakeup"""
+        with self._lock:
+            self._generation += 1
+            self._wakeup.set()
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, args=(self._generation,),
+                                            name='detail-fetcher', daemon=True)
+            self._worker.start()
+
+    def _abandon_worker(self, now):
+        """Mark the pid of a fetch stuck past `timeout` and replace its worker if allowed (under the lock)"""
+        pid = self._inflight[0]
+        self.timeouts += 1
+        stub = self._cache.get(pid) or ProcessDetails(pid)
+        stub.error = f"timeout după {self.timeout:.0f}s"
+        stub.timed_out = True
+        stub.fetched_at = now
+        self._store(stub)
+        self._inflight = None
+        self._pending = None
+        if self._stalled is not None and self._stalled.is_alive():
+            # Există deja un worker abandonat: cel curent rămâne, dar nu mai primește cereri până revine
+            self._blocked = self._worker
+            return
+        self._replace_worker()
+
+    def _replace_worker(self):
+        """Leave the current worker behind (its result is discarded) and start a new one"""
+        self._stalled = self._worker
+        self._blocked = None
+        self._generation += 1
+        self._worker = None
+        self._wakeup.set()
+        self._ensure_worker()
+
+    def _store(self, details):
+        self._cache[details.pid] = details
+        if len(self._cache) > MAX_CACHED:
+            oldest = min(self._cache.values(), key=lambda d: d.fetched_at)
+            del self._cache[oldest.pid]
+
+    def _run(self, generation):
+        while True:
+            self._wakeup.wait()
+            with self._lock:
+                if generation != self._generation:
+                    return
+                request = self._pending
+                self._pending = None
+                self._wakeup.clear()
+                if request is None:
+                    continue
+                self._inflight = (request[0], time.monotonic())
+
+            details = self.fetch(*request)
+
+            with self._lock:
+                # Un worker abandonat nu suprascrie nimic: rezultatul lui a fost deja înlocuit
+                if generation != self._generation:
+                    return
+                self._store(details)
+                self._inflight = None
+                if self._blocked is threading.current_thread():
+                    self._blocked = None
+
+    def fetch(self, pid, create_time=None):
+        """Read the details of one process synchronously (worker thread)"""
+        started = time.monotonic()
+        details = ProcessDetails(pid, create_time)
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                details.status = proc.status()
+                details.threads = proc.num_threads()
+                if details.create_time is None:
+                    details.create_time = proc.create_time()
+            self._scan_fds(details, started + self.timeout)
+            self._read_children(details, proc)
+        except psutil.NoSuchProcess:
+            details.error = "procesul nu mai există"
+        except psutil.AccessDenied:
+            details.error = "acces refuzat"
+        details.duration = time.monotonic() - started
+        details.fetched_at = time.monotonic()
+        return details
+
+    def _scan_fds(self, details, deadline):
+        """Count fds, regular files and socket inodes from /proc/[pid]/fd, stopping at `deadline`"""
+        fd_dir = os.path.join(self.proc_root, str(details.pid), 'fd')
+        try:
+            fds = os.listdir(fd_dir)
+        except PermissionError:
+            return
+        except OSError:
+            raise psutil.NoSuchProcess(details.pid)
+        details.fds = len(fds)
+        files = 0
+        inodes = set()
+        # readlink pe fiecare fd, fără fdinfo/stat ca psutil.open_files(): un proces cu 100k fd-uri rămâne ieftin
+        for count, fd in enumerate(fds):
+            if count & 1023 == 0 and count and time.monotonic() > deadline:
+                details.partial = True
+                break
+            try:
+                target = os.readlink(os.path.join(fd_dir, fd))
+            except OSError:
+                continue
+            if target.startswith('/'):
+                files += 1
+            elif target.startswith('socket:['):
+                inodes.add(int(target[8:-1]))
+        details.open_files = files
+        details.socket_inodes = frozenset(inodes)
+
+    def _read_children(self, details, proc):
+        children = proc.children(recursive=True)
+        details.child_count = len(children)
+        known = self._child_procs
+        current = {}
+        for child in children[:MAX_CHILDREN]:
+            # Același obiect Process între citiri, ca cpu_percent să aibă un interval de referință
+            cached = known.get(child.pid)
+            if cached is not None and cached.is_running():
+                child = cached
+            try:
+                with child.oneshot():
+                    details.children.append((child.pid, child.name(), child.cpu_percent(interval=None),
+                                             child.memory_percent()))
+                current[child.pid] = child
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        if len(known) > MAX_CACHED * MAX_CHILDREN:
+            known.clear()
+        known.update(current)
@@ -4,23 +4,26 @@ import time
 import subprocess
 import psutil
 import glob
-from datetime import datetime
-from collections import defaultdict
+from operator import attrgetter
+from collections import Counter, defaultdict, deque
+from core.log_time import LogTimeIndex, merge_by_time, parse_log_timestamp
+from core.log_history import LogHistoryScanner
+from core.ngram_index import TrigramIndex
+from core.rate_window import RateTracker, DEFAULT_RATE_RULES_PATH
+from core.log_template import TemplateMiner
+from core.log_entry import LogEntry, CATEGORY_BITS, categories_to_mask
+from core.process_rules import ProcessRuleEngine, DEFAULT_RULES_PATH
+from core.pid_findings import PidFindingIndex, extract_pid
+from core.log_chunks import categorize_line
+
+# Ultimele intrări reținute în ordinea id-urilor (delta-urile de snapshot aleg după id, nu după timp)
+RECENT_BY_ID = 1000
 
 class SuspiciousActivityDetector:
-    def __init__(self):
-        self.suspicious_process_patterns = [
-            re.compile(r'nc\s', re.IGNORECASE),
-            re.compile(r'\bnmap\b', re.IGNORECASE),
-            re.compile(r'\btcpdump\b', re.IGNORECASE),
-            re.compile(r'\bhping\b', re.IGNORECASE),
-            re.compile(r'\bwget\b\s.*http', re.IGNORECASE),
-            re.compile(r'curl\s.*http', re.IGNORECASE),
-            re.compile(r'chmod\s.*777', re.IGNORECASE),
-            re.compile(r'/tmp/', re.IGNORECASE),
-            re.compile(r'\.exe\b', re.IGNORECASE),
-            re.compile(r'\bpython\b.*-c\s', re.IGNORECASE),
-        ]
+    def __init__(self, store=None, rate_rules=None, rules_path=DEFAULT_RULES_PATH,
+                 rate_rules_path=DEFAULT_RATE_RULES_PATH):
+        # Reguli pentru procese suspicioase, din fișier JSON (reîncărcat la modificare)
+        self.process_rules = ProcessRuleEngine(rules_path)
         
         # Precompile log patterns
         self.log_patterns = {
@@ -52,45 +55,37 @@ class SuspiciousActivityDetector:
         }
 
         self.seen_logs = set()
-        self.log_categories = defaultdict(list)
+        self.log_categories = Counter()  # Intrări per categorie la ultima scanare
         self.last_full_scan = 0
         self.debug_stats = defaultdict(int)
-        self.log_cache = []  # Cache pentru log-urile găsite
+        self.log_cache = []  # Cache pentru log-urile găsite (cele mai recente, descrescător)
+        self.timeline = LogTimeIndex()  # Toate intrările reținute, ordonate după timpul evenimentului
+        self.history_scanner = None  # Scanare opțională a arhivelor rotite (syslog.1, *.gz, *.xz)
+        self.search_index = TrigramIndex()  # Index de trigrame peste intrările din timeline
+        self.recent_by_id = deque(maxlen=RECENT_BY_ID)  # Arhivele și proc-events au id-uri noi dar timpi vechi
+        self._next_entry_id = 0
+        self.store = store  # Index persistent (LogStore) sau None
+        self.alerts = None  # AlertPipeline opțional: găsirile live trimise spre destinații externe
+        self.file_offsets = {}  # path -> (inode, offset) până la care fișierul a fost citit
+        self._archives_persisted = 0
+        self.rate_tracker = RateTracker(rate_rules, rate_rules_path)  # Contoare cu fereastră glisantă pentru rafale
+        self._live_marks = {}  # sursă -> (ts maxim, liniile cu acel ts) deja numărate
+        self.templates = TemplateMiner()  # Șabloane de mesaje (linii repetitive grupate)
+        self.pid_findings = PidFindingIndex()  # pid -> găsirile procesului (din prefixul nume[pid]:)
+
 
+    def match_process(self, info):
+        """Name of the rule a process info dict matches, or None"""
+        return self.process_rules.match(info)
 
     def is_suspicious_process(self, process):
         """Check if a process is suspicious"""
         try:
-            cmdline = ' '.join(process.cmdline())
-            name = process.name()
-
-            # Check for suspicious patterns in the command line
-            for pattern in self.suspicious_process_patterns:
-                if pattern.search(cmdline):
-                    return True
-
-            # Check for high CPU usage
-            if process.cpu_percent() > 95:
-                safe = ['chrome', 'firefox', 'python3', 'code', 'top', 'htop', 'stress']
-                if name.lower() not in safe:
-                    return True
-
-            # Check for processes running from suspicious locations
-            try:
-                exe_path = process.exe()
-                if any(p in exe_path for p in ['/tmp', '/dev/shm', '/var/tmp']):
-                    return True
-            except:
-                pass
-
-            # Check for suspicious process names
-            if name.lower() in ['nc', 'ncat', 'telnet', 'ftp', 'socat']:
-                return True
-
+            info = process.as_dict(attrs=['name', 'cmdline', 'username', 'exe', 'memory_percent'])
+            info['cpu_percent'] = process.cpu_percent()
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             return False
-
-        return False
+        return self.match_process(info) is not None
 
     def _try_access_log_file(self, path):
         """Check if a log file is accessible"""
@@ -98,10 +93,7 @@ class SuspiciousActivityDetector:
             if not os.path.isfile(path):
                 return False
             
-            # Check if the file is not too large (max 100MB)
-            if os.path.getsize(path) > 100 * 1024 * 1024:
-                return False
-            
+            # Fără limită de mărime: scanarea live citește doar coada fișierului
             # Check if we have read permissions
             if not os.access(path, os.R_OK):
                 return False
@@ -151,16 +143,8 @@ class SuspiciousActivityDetector:
 
     def _categorize_log_entry(self, line):
         """Categorize a log line"""
-        matched = []
-        line_lower = line.lower()
-        
-        for category, patterns in self.log_patterns.items():
-            for pattern in patterns:
-                if pattern.search(line_lower):
-                    matched.append(category)
-                    break  # Break after the first match in this category
-        
-        return matched
+        # Aceeași funcție rulează și în procesele worker ale scanării pe bucăți
+        return categorize_line(line, self.log_patterns)
 
     def _scan_single_log(self, log_file):
         """Scan a single log file"""
@@ -174,12 +158,17 @@ class SuspiciousActivityDetector:
                 file_size = f.tell()
                 
                 # Read at most the last 100KB for performance
-                if file_size > 100 * 1024:  # If file > 100KB
-                    f.seek(max(0, file_size - 100 * 1024))  # Read the last 100KB
-                else:
-                    f.seek(0)
+                start = max(0, file_size - 100 * 1024)
+                
+                # Skip what an earlier scan (or session) already read from the same file
+                inode = os.fstat(f.fileno()).st_ino
+                known = self.file_offsets.get(log_file)
+                if known and known[0] == inode and known[1] <= file_size:
+                    start = max(start, known[1])
                 
+                f.seek(start)
                 lines = f.readlines()
+                self.file_offsets[log_file] = (inode, file_size)
                 
             # Process the last 500 lines
             lines = lines[-500:]
@@ -190,6 +179,9 @@ class SuspiciousActivityDetector:
             return results
 
         processed_lines = 0
+        source = os.path.basename(log_file)
+        scan_time = time.time()
+        last_ts = None
         for line in lines:
             line = line.strip()
             
@@ -197,6 +189,12 @@ class SuspiciousActivityDetector:
             if not line or len(line) < 10:
                 continue
             
+            # Timestamp of the event itself; continuation lines inherit the previous one
+            ts = parse_log_timestamp(line, scan_time)
+            if ts is None:
+                ts = last_ts if last_ts is not None else scan_time
+            last_ts = ts
+            
             # Avoid duplicates
             if line in self.seen_logs:
                 continue
@@ -208,14 +206,10 @@ class SuspiciousActivityDetector:
             categories = self._categorize_log_entry(line)
             
             if categories:
-                entry = {
-                    'file': os.path.basename(log_file),
-                    'content': line[:500],  # Limit the content
-                    'timestamp': datetime.now().strftime('%H:%M:%S'),
-                    'categories': categories,
-                    'raw_line': line
-                }
-                results.append(entry)
+                results.append(LogEntry(ts, source, line, categories_to_mask(categories), extract_pid(line)))
+        
+        # Files are mostly chronological already, so this sort is close to linear
+        results.sort(key=attrgetter('ts'))
         
         self.debug_stats[f'processed_{os.path.basename(log_file)}'] = processed_lines
         self.debug_stats[f'found_{os.path.basename(log_file)}'] = len(results)
@@ -228,7 +222,7 @@ class SuspiciousActivityDetector:
         
         try:
             # Read the last 500 entries from the journal
-            cmd = ['journalctl', '-n', '500', '--no-pager', '-q']
+            cmd = ['journalctl', '-n', '500', '--no-pager', '-q', '-o', 'short-iso']
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
             
             if result.returncode != 0:
@@ -237,11 +231,18 @@ class SuspiciousActivityDetector:
             lines = result.stdout.split('\n')
             self.debug_stats['journalctl_lines'] = len(lines)
             
+            scan_time = time.time()
+            last_ts = None
             for line in lines:
                 line = line.strip()
                 if not line or len(line) < 10:
                     continue
                 
+                ts = parse_log_timestamp(line, scan_time)
+                if ts is None:
+                    ts = last_ts if last_ts is not None else scan_time
+                last_ts = ts
+                
                 if line in self.seen_logs:
                     continue
                 
@@ -249,20 +250,173 @@ class SuspiciousActivityDetector:
                 categories = self._categorize_log_entry(line)
                 
                 if categories:
-                    entry = {
-                        'file': 'journalctl',
-                        'content': line[:500],
-                        'timestamp': datetime.now().strftime('%H:%M:%S'),
-                        'categories': categories,
-                        'raw_line': line
-                    }
-                    results.append(entry)
+                    results.append(LogEntry(ts, 'journalctl', line, categories_to_mask(categories), extract_pid(line)))
         
         except Exception as e:
             self.debug_stats['journalctl_error'] = str(e)
         
+        results.sort(key=attrgetter('ts'))
         return results
 
+    def load_from_store(self, seconds=86400):
+        """Load the recent window from the persistent index instead of rescanning"""
+        if self.store is None:
+            return 0
+        entries = self.store.load_recent(seconds, self.timeline.max_entries)
+        # Rândurile scrise înainte de extragerea pid-ului îl primesc la încărcare
+        for entry in entries:
+            if entry.pid is None:
+                entry.pid = extract_pid(entry.line)
+        self._retain(entries)
+        self.seen_logs.update(e.line for e in entries)
+        self.file_offsets = self.store.load_file_offsets()
+        self.log_cache = self.timeline.latest(500)
+        self.debug_stats['loaded_from_store'] = len(entries)
+        return len(entries)
+
+    def _persist(self, new_results):
+        """Write new findings and scan state to the persistent index"""
+        if self.store is None:
+            return
+        self.store.add(new_results)
+        self.store.flush()
+        self.store.save_file_offsets(self.file_offsets)
+        scanner = self.history_scanner
+        if scanner is not None:
+            if scanner.offsets_changed:
+                scanner.offsets_changed = False
+                self.store.save_archive_offsets(scanner.offsets)
+            finished = scanner.finished[self._archives_persisted:]
+            if finished:
+                self.store.mark_archives(finished)
+                self._archives_persisted += len(finished)
+
+    def start_history_scan(self):
+        """Start (or resume) the background scan of rotated log archives"""
+        if self.history_scanner is None:
+            completed = offsets = None
+            if self.store is not None:
+                completed = self.store.load_archive_marks()
+                offsets = self.store.load_archive_offsets()
+            self.history_scanner = LogHistoryScanner(self._categorize_log_entry, completed=completed,
+                                                     log_patterns=self.log_patterns, offsets=offsets)
+        self.history_scanner.start()
+
+    def worker_cpu(self):
+        """CPU seconds used so far by the archive scan's worker processes"""
+        return self.history_scanner.stats['worker_cpu'] if self.history_scanner is not None else 0.0
+
+    def stop_history_scan(self):
+        if self.history_scanner is not None:
+            self.history_scanner.stop()
+
+    def _retain(self, entries, reread=()):
+        """Add time-sorted entries to the time, search and template indexes
+
+        Repeats of a flooding template only update its count (see
+        TemplateMiner.admit), so they do not evict other findings. Entries
+        in `reread` (ids of objects re-read by a full rescan) stay out of
+        recent_by_id, so snapshot deltas do not send them again.
+        """
+        search_index = self.search_index
+        admit = self.templates.admit
+        add_pid = self.pid_findings.add
+        kept = []
+        for entry in entries:
+            if not admit(entry):
+                continue
+            entry.id = self._next_entry_id
+            self._next_entry_id += 1
+            search_index.add(entry.id, entry)
+            add_pid(entry)
+            kept.append(entry)
+        self.recent_by_id.extend(entry for entry in kept if id(entry) not in reread)
+        self.debug_stats['collapsed'] = self.templates.collapsed
+        for evicted in self.timeline.add_sorted(kept):
+            search_index.remove(evicted.id)
+            self.pid_findings.remove(evicted)
+
+    def search(self, query, candidates=None):
+        """Ids of retained entries containing `query` (see TrigramIndex.search)"""
+        return self.search_index.search(query, candidates)
+
+    def _unseen_live(self, per_source_results):
+        """Per-source results without the entries earlier scans already counted
+
+        A full rescan (or D) forgets seen_logs and re-reads old lines; each
+        source keeps a high-water mark (newest ts and the lines at that ts) so
+        re-read lines are not counted (or published) twice.
+        """
+        marks = self._live_marks
+        fresh_results = []
+        for results in per_source_results:
+            source = results[0].source
+            mark_ts, mark_lines = marks.get(source, (None, frozenset()))
+            if mark_ts is not None:
+                results = [entry for entry in results if entry.ts > mark_ts
+                           or (entry.ts == mark_ts and entry.line not in mark_lines)]
+                if not results:
+                    continue
+            last_ts = results[-1].ts
+            lines = {entry.line for entry in results if entry.ts == last_ts}
+            marks[source] = (last_ts, lines | mark_lines if last_ts == mark_ts else lines)
+            fresh_results.append(results)
+        return fresh_results
+
+    def _track_rates(self, per_source_results):
+        """Feed live findings to the rate counters in event order; returns the alerts raised"""
+        alerts = []
+        self.rate_tracker.maybe_reload()
+        observe = self.rate_tracker.observe
+        for entry in merge_by_time(per_source_results):
+            alerts.extend(observe(entry))
+        self.debug_stats['rate_alerts'] = self.rate_tracker.alerts_raised
+        return alerts
+
+    def record_process_alerts(self, infos):
+        """Record suspicious execs caught by the process event stream as findings"""
+        entries = []
+        for info in infos:
+            line = (f"Proces suspicios (exec) [{info['rule']}]: pid={info['pid']} "
+                    f"user={info.get('username')} {' '.join(info.get('cmdline') or []) or info.get('name')}")
+            entries.append(LogEntry(time.time(), 'proc-events', line,
+                                    CATEGORY_BITS['SECURITY'], info['pid']))
+        entries.sort(key=attrgetter('ts'))
+        self._index_entries([entries])
+        self._persist(entries)
+        self.debug_stats['total_entries'] = len(self.timeline)
+
+    def _index_entries(self, per_source_results, reread=()):
+        """Merge per-source results into the time index and refresh the cache"""
+        for results in per_source_results:
+            for entry in results:
+                for category in entry.categories:
+                    self.log_categories[category] += 1
+
+        new_results = merge_by_time(per_source_results)
+        self._retain(new_results, reread)
+        
+        # Cache-ul afișat: cele mai recente 500 de intrări, cele noi primele
+        self.log_cache = self.timeline.latest(500)
+        return new_results
+
+    def collect_history(self):
+        """Merge archive findings produced by the background scanner; returns the count"""
+        if self.history_scanner is None:
+            return 0
+        entries = self.history_scanner.drain()
+        if not entries:
+            # Loturi goale (progres, arhivă terminată): doar starea scanării se salvează
+            if self.history_scanner.offsets_changed:
+                self._persist(entries)
+            return 0
+        entries.sort(key=attrgetter('ts'))
+        self._index_entries([entries])
+        self._persist(entries)
+        self.debug_stats['total_entries'] = len(self.timeline)
+        self.debug_stats['history_entries'] += len(entries)
+        return len(entries)
+
     def scan_logs(self, force_full_scan=False):
         """Scanează log-urile păstrând intrările existente"""
         if force_full_scan:
@@ -270,9 +424,14 @@ class SuspiciousActivityDetector:
             self.debug_stats.clear()
             self.last_full_scan = time.time()
             self.log_cache = []  # Reset cache la scanare completă
+            self.timeline.clear()
+            self.search_index.clear()
+            self.pid_findings.clear()
+            self.templates.clear()
+            self.file_offsets.clear()
 
         self.log_categories.clear()
-        new_results = []
+        per_source_results = []
         
         # Scanează fișierele de log
         log_files = self.get_log_files()
@@ -283,31 +442,37 @@ class SuspiciousActivityDetector:
             else:
                 results = self._scan_single_log(log_file)
             
-            for entry in results:
-                for category in entry['categories']:
-                    self.log_categories[category].append(entry)
-            
-            new_results.extend(results)
+            if results:
+                per_source_results.append(results)
 
-        # Adaugă noile rezultate la cache-ul existent
-        all_results = self.log_cache + new_results
-        
-        # Sortează după prioritate
-        def log_sort_key(entry):
-            categories = entry['categories']
-            priority_order = ['CRITICAL', 'SECURITY', 'NETWORK', 'SYSTEM', 'WARNING']
-            for i, priority in enumerate(priority_order):
-                if priority in categories:
-                    return i
-            return 99
-
-        all_results.sort(key=log_sort_key)
-        
-        # Actualizează cache-ul cu toate intrările
-        self.log_cache = all_results[:500]  # Păstrează doar ultimele 500
+        # Rafalele se detectează doar pe sursele live: arhivele au timpi din trecut,
+        # în afara ferestrei contoarelor. Liniile recitite la o scanare completă nu se renumără
+        # și nici nu se retrimit destinațiilor de alerte sau în delta-urile de snapshot (recent_by_id).
+        unseen_results = self._unseen_live(per_source_results)
+        unseen = {id(entry) for results in unseen_results for entry in results}
+        reread = {id(entry) for results in per_source_results for entry in results if id(entry) not in unseen}
+        alerts = self._track_rates(unseen_results)
+        if alerts:
+            per_source_results.append(alerts)
+            unseen_results.append(alerts)
+        if self.alerts is not None:
+            for results in unseen_results:
+                self.alerts.publish_entries(results)
+
+        # Rezultatele gata ale scanării de arhive intră în aceeași interclasare
+        if self.history_scanner is not None:
+            history_entries = self.history_scanner.drain()
+            if history_entries:
+                history_entries.sort(key=attrgetter('ts'))
+                per_source_results.append(history_entries)
+                self.debug_stats['history_entries'] += len(history_entries)
+
+        # Interclasare k-way după timpul evenimentului, apoi inserare în indexul temporal
+        new_results = self._index_entries(per_source_results, reread)
+        self._persist(new_results)
         
         # Actualizează statisticile
-        self.debug_stats['total_entries'] = len(all_results)
+        self.debug_stats['total_entries'] = len(self.timeline)
         self.debug_stats['returned_entries'] = len(self.log_cache)
         self.debug_stats['cache_size'] = len(self.seen_logs)
         
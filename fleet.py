@@ -0,0 +1,181 @@
+import curses
+import errno
+import selectors
+import socket
+import time
+from core.snapshot import FrameReader, apply_delta, parse_address
+from ui.utils import init_colors
+from ui.fleet_view import draw_fleet_summary, draw_host_details
+
+RECONNECT_DELAY = 5.0
+STALE_AFTER = 10.0  # Secunde fără date după care un host e considerat inactiv
+
+
+class HostConnection:
+    """State of one agent: socket, frame reader and the reconstructed snapshot"""
+
+    def __init__(self, address):
+        self.address = address
+        self.sock = None
+        self.reader = None
+        self.snapshot = None
+        self.connected = False
+        self.error = None
+        self.last_update = 0
+        self.next_attempt = 0
+        self.received_bytes = 0
+
+    @property
+    def name(self):
+        if self.snapshot is not None:
+            return self.snapshot.get('host') or self.address
+        return self.address
+
+    @property
+    def status(self):
+        if not self.connected:
+            return 'DECONECTAT'
+        if self.snapshot is None:
+            return 'CONECTARE'
+        if time.time() - self.last_update > STALE_AFTER:
+            return 'INACTIV'
+        return 'OK'
+
+
+class FleetClient:
+    """Non-blocking connections to many agents, multiplexed with `selectors`"""
+
+    def __init__(self, addresses):
+        self.hosts = [HostConnection(address) for address in addresses]
+        self._selector = selectors.DefaultSelector()
+
+    def _connect(self, host):
+        family, sockaddr = parse_address(host.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            sock.connect(sockaddr)
+        except BlockingIOError:
+            pass  # Conectare TCP în curs: finalizată la EVENT_WRITE
+        except OSError as e:
+            sock.close()
+            host.error = e.strerror or str(e)
+            host.next_attempt = time.time() + RECONNECT_DELAY
+            return
+        host.sock = sock
+        host.reader = FrameReader()
+        host.snapshot = None
+        self._selector.register(sock, selectors.EVENT_READ | selectors.EVENT_WRITE, host)
+
+    def _disconnect(self, host, error):
+        if host.sock is not None:
+            try:
+                self._selector.unregister(host.sock)
+            except (KeyError, ValueError):
+                pass
+            host.sock.close()
+        host.sock = None
+        host.connected = False
+        host.error = error
+        host.next_attempt = time.time() + RECONNECT_DELAY
+
+    def poll(self, timeout=0.0):
+        """Connect/reconnect agents and process whatever data has arrived"""
+        now = time.time()
+        for host in self.hosts:
+            if host.sock is None and now >= host.next_attempt:
+                self._connect(host)
+
+        for key, events in self._selector.select(timeout):
+            host = key.data
+            if events & selectors.EVENT_WRITE:
+                err = host.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if err:
+                    self._disconnect(host, errno.errorcode.get(err, str(err)))
+                    continue
+                host.connected = True
+                host.error = None
+                self._selector.modify(host.sock, selectors.EVENT_READ, host)
+            if events & selectors.EVENT_READ:
+                self._read(host)
+
+    def _read(self, host):
+        try:
+            data = host.sock.recv(262144)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._disconnect(host, e.strerror or str(e))
+            return
+        if not data:
+            self._disconnect(host, 'conexiune închisă')
+            return
+        host.connected = True
+        host.received_bytes += len(data)
+        try:
+            messages = host.reader.feed(data)
+        except ValueError as e:
+            self._disconnect(host, str(e))
+            return
+        for message in messages:
+            kind = message.pop('t', None)
+            if kind == 'full':
+                host.snapshot = message
+            elif kind == 'delta' and host.snapshot is not None:
+                apply_delta(host.snapshot, message)
+            host.last_update = time.time()
+
+    def close(self):
+        for host in self.hosts:
+            if host.sock is not None:
+                self._disconnect(host, None)
+        self._selector.close()
+
+
+class FleetMonitor:
+    """Aggregator TUI: fleet summary with per-host drill-down (main.py --fleet)"""
+
+    def __init__(self, addresses):
+        self.client = FleetClient(addresses)
+        self.selected_index = 0
+        self.detail_host = None
+        self.scroll_offset = 0
+
+    def run(self, stdscr):
+        init_colors()
+        curses.curs_set(0)
+        stdscr.nodelay(1)
+        stdscr.timeout(200)
+        try:
+            while True:
+                self.client.poll(0)
+                height, width = stdscr.getmaxyx()
+                stdscr.erase()
+                if self.detail_host is None:
+                    draw_fleet_summary(stdscr, height, width, self.client.hosts, self.selected_index)
+                else:
+                    draw_host_details(stdscr, height, width, self.detail_host, self.scroll_offset)
+                stdscr.refresh()
+
+                key = stdscr.getch()
+                if key in [ord('q'), ord('Q')]:
+                    break
+                if self.detail_host is None:
+                    if key == 27:
+                        break
+                    elif key == curses.KEY_UP:
+                        self.selected_index = max(0, self.selected_index - 1)
+                    elif key == curses.KEY_DOWN:
+                        self.selected_index = min(len(self.client.hosts) - 1, self.selected_index + 1)
+                    elif key == ord('\n') and self.client.hosts:
+                        self.detail_host = self.client.hosts[self.selected_index]
+                        self.scroll_offset = 0
+                else:
+                    if key in [27, curses.KEY_BACKSPACE, 127, curses.KEY_LEFT]:
+                        self.detail_host = None
+                    elif key == curses.KEY_UP:
+                        self.scroll_offset = max(0, self.scroll_offset - 1)
+                    elif key == curses.KEY_DOWN:
+                        self.scroll_offset += 1
+        finally:
+            self.client.close()
@@ -0,0 +1,122 @@
+import curses
+from datetime import datetime
+from core.log_entry import CATEGORY_BITS, mask_to_categories
+from ui.utils import load_color, draw_progress_bar, draw_core_grid
+from ui.log_view import format_log_time, format_log_category, get_category_color
+
+STATUS_COLORS = {'OK': 1, 'CONECTARE': 2, 'INACTIV': 2, 'DECONECTAT': 3}
+
+
+def _finding_counts(snapshot):
+    """Critical and security findings among the snapshot's recent findings"""
+    critical = security = 0
+    for row in snapshot.get('findings', []):
+        mask = row[3]
+        if mask & CATEGORY_BITS['CRITICAL']:
+            critical += 1
+        if mask & CATEGORY_BITS['SECURITY']:
+            security += 1
+    return critical, security
+
+
+def draw_fleet_summary(stdscr, height, width, hosts, selected_index):
+    """Desenează tabelul cu toate host-urile agregate"""
+    try:
+        connected = sum(1 for host in hosts if host.status == 'OK')
+        title = f"FLOTĂ: {connected}/{len(hosts)} host-uri active"
+        stdscr.addstr(0, 2, title, curses.A_BOLD | curses.color_pair(2))
+        now_text = datetime.now().strftime('%H:%M:%S')
+        stdscr.addstr(0, width - len(now_text) - 2, now_text, curses.A_DIM)
+        stdscr.addstr(1, 2, "─" * (width - 4))
+
+        header = (f"{'HOST':<20} {'STARE':<10} {'CPU%':>6} {'MEM%':>6} {'DISK%':>6} "
+                  f"{'LOAD':>6} {'PROC':>6} {'SUSP':>5} {'CRIT':>5} {'SEC':>5}  ACTUALIZAT")
+        stdscr.addstr(2, 2, header[:width - 4], curses.A_BOLD)
+
+        y = 3
+        for index, host in enumerate(hosts):
+            if y >= height - 3:
+                break
+            status = host.status
+            snapshot = host.snapshot
+            if snapshot is not None:
+                stats = snapshot.get('stats', {})
+                load = (stats.get('load_avg') or [0.0])[0]
+                critical, security = _finding_counts(snapshot)
+                updated = datetime.fromtimestamp(host.last_update).strftime('%H:%M:%S')
+                line = (f"{host.name[:20]:<20} {status:<10} {stats.get('cpu_percent') or 0:>6.1f} "
+                        f"{stats.get('mem_percent') or 0:>6.1f} {stats.get('disk_percent') or 0:>6.1f} "
+                        f"{load:>6.2f} {len(snapshot.get('processes', {})):>6} "
+                        f"{snapshot.get('suspicious', 0):>5} {critical:>5} {security:>5}  {updated}")
+            else:
+                line = f"{host.name[:20]:<20} {status:<10} {host.error or ''}"
+
+            attr = curses.color_pair(STATUS_COLORS.get(status, 0))
+            if snapshot is not None and (snapshot.get('suspicious') or _finding_counts(snapshot)[0]):
+                attr = curses.color_pair(3) | curses.A_BOLD
+            if index == selected_index:
+                attr |= curses.A_REVERSE
+            stdscr.addstr(y, 2, line[:width - 4], attr)
+            y += 1
+
+        help_text = "↑/↓:selectează | ENTER:detalii host | Q/ESC:ieșire"
+        stdscr.addstr(height - 1, 2, help_text[:width - 4], curses.A_DIM)
+    except curses.error:
+        pass
+
+
+def draw_host_details(stdscr, height, width, host, scroll_offset):
+    """Desenează detaliile unui host: statistici, procese după CPU, descoperiri recente"""
+    try:
+        snapshot = host.snapshot
+        stdscr.addstr(0, 2, f"HOST: {host.name} ({host.address}) - {host.status}",
+                      curses.A_BOLD | curses.color_pair(2))
+        if snapshot is None:
+            stdscr.addstr(2, 4, host.error or "Se așteaptă primul snapshot...", curses.A_DIM)
+            stdscr.addstr(height - 1, 2, "ESC/←:înapoi | Q:ieșire", curses.A_DIM)
+            return
+
+        stats = snapshot.get('stats', {})
+        draw_progress_bar(stdscr, 1, 2, 30, stats.get('cpu_percent') or 0.0, "CPU")
+        draw_progress_bar(stdscr, 2, 2, 30, stats.get('mem_percent') or 0.0, "RAM")
+        draw_progress_bar(stdscr, 3, 2, 30, stats.get('disk_percent') or 0.0, "DISK")
+        load = stats.get('load_avg') or [0.0, 0.0, 0.0]
+        stdscr.addstr(1, 50, f"Load: {' '.join(f'{v:.2f}' for v in load)}")
+        stdscr.addstr(2, 50, f"Procese: {len(snapshot.get('processes', {}))} | "
+                             f"Suspicioase: {snapshot.get('suspicious', 0)}")
+        if stats.get('per_core'):
+            draw_core_grid(stdscr, 3, 50, width - 52, stats['per_core'], rows=1)
+
+        # Procese după CPU (partea de sus) și descoperiri recente (partea de jos)
+        list_height = max(3, (height - 8) // 2)
+        stdscr.addstr(5, 2, "─" * (width - 4))
+        header = f"{'PID':<8} {'USER':<10} {'NAME':<18} {'CPU%':>6} {'MEM%':>6}  CMD"
+        stdscr.addstr(6, 2, header[:width - 4], curses.A_BOLD)
+
+        rows = sorted(snapshot.get('processes', {}).items(), key=lambda item: item[1][2], reverse=True)
+        scroll_offset = min(scroll_offset, max(0, len(rows) - list_height))
+        y = 7
+        for pid, (name, user, cpu, mem, rule, cmdline) in rows[scroll_offset:scroll_offset + list_height]:
+            line = f"{pid:<8} {user[:10]:<10} {name[:18]:<18} {cpu:>6.1f} {mem:>6.1f}  {cmdline}"
+            attr = curses.color_pair(3) if rule else load_color(cpu)
+            stdscr.addstr(y, 2, line[:width - 4], attr)
+            y += 1
+
+        y = 7 + list_height
+        stdscr.addstr(y, 2, "─" * (width - 4))
+        title = "DESCOPERIRI RECENTE"
+        if snapshot.get('findings_omitted'):
+            title += f" ({snapshot['findings_omitted']} omise la transmisie)"
+        stdscr.addstr(y + 1, 2, title, curses.A_BOLD)
+        y += 2
+        for finding_id, ts, source, mask, pid, line in reversed(snapshot.get('findings', [])):
+            if y >= height - 2:
+                break
+            category = format_log_category(mask_to_categories(mask))
+            text = f"{format_log_time(ts):<8} {category:<9} {source[:11]:<12} {line}"
+            stdscr.addstr(y, 2, text[:width - 4], get_category_color(category))
+            y += 1
+
+        stdscr.addstr(height - 1, 2, "↑/↓:derulează procese | ESC/←:înapoi | Q:ieșire", curses.A_DIM)
+    except curses.error:
+        pass
@@ -0,0 +1,145 @@
+import mmap
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from core.log_time import parse_log_timestamp
+from core.log_entry import categories_to_mask
+from core.pid_findings import extract_pid
+
+# Fișierele necomprimate peste acest prag se împart în bucăți pentru procesele worker
+PARALLEL_MIN_SIZE = 32 * 1024 * 1024
+CHUNK_SIZE = 16 * 1024 * 1024
+# Procesele worker nu depășesc acest număr, oricâte nuclee are mașina
+MAX_WORKERS = 4
+
+_patterns = None  # Tiparele de categorii, primite o singură dată de fiecare worker
+
+
+def categorize_line(line, log_patterns):
+    """Categories whose patterns match a log line (first match per category)"""
+    matched = []
+    line_lower = line.lower()
+    for category, patterns in log_patterns.items():
+        for pattern in patterns:
+            if pattern.search(line_lower):
+                matched.append(category)
+                break
+    return matched
+
+
+def chunk_boundaries(path, chunk_size=CHUNK_SIZE, start=0):
+    """(start, end) byte ranges of about `chunk_size` that begin and end on line boundaries
+
+    `start` must itself be a line boundary (an offset reported by a previous scan).
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            ranges = []
+            while start < size:
+                end = data.find(b'\n', min(start + chunk_size, size) - 1)
+                end = size if end < 0 else end + 1
+                ranges.append((start, end))
+                start = end
+    return ranges
+
+
+def _init_worker(log_patterns):
+    global _patterns
+    _patterns = log_patterns
+
+
+def scan_chunk(path, start, end, reference_time):
+    """Classify the lines of one byte range (runs in a worker process)
+
+    Returns (lines seen, [(ts, line, mask, pid, end offset)], last ts, CPU
+    seconds). Lines before the first timestamp of the chunk get ts None; the
+    caller gives them the last timestamp of the previous chunk.
+    """
+    cpu_started = time.process_time()
+    found = []
+    lines = 0
+    last_ts = None
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if hasattr(data, 'madvise'):
+                data.madvise(mmap.MADV_SEQUENTIAL, start - start % mmap.PAGESIZE, end - start + start % mmap.PAGESIZE)
+            position = start
+            while position < end:
+                newline = data.find(b'\n', position, end)
+                if newline < 0:
+                    newline = end
+                line = data[position:newline].decode('utf-8', 'ignore').strip()
+                position = min(newline + 1, end)
+                if not line or len(line) < 10:
+                    continue
+                lines += 1
+                ts = parse_log_timestamp(line, reference_time)
+                if ts is None:
+                    ts = last_ts
+                last_ts = ts
+                categories = categorize_line(line, _patterns)
+                if categories:
+                    found.append((ts, line, categories_to_mask(categories), extract_pid(line), position))
+    return lines, found, last_ts, time.process_time() - cpu_started
+
+
+class ChunkedLogScanner:
+    """Scan large uncompressed logs in newline-aligned chunks on a process pool
+
+    Each worker maps the file itself, so no file data crosses process
+    boundaries; only matching lines come back. At most `workers * 2` chunks
+    are in flight and results are consumed in file order, so memory depends
+    on the chunk size, not on the file size. Workers report the CPU time of
+    each chunk, since the parent's process_time() does not include them.
+    """
+
+    def __init__(self, log_patterns, workers=None, chunk_size=CHUNK_SIZE):
+        self.log_patterns = log_patterns
+        self.workers = workers or max(1, min(MAX_WORKERS, (os.cpu_count() or 2) - 1))
+        self.chunk_size = chunk_size
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            # forkserver: worker-ii nu moștenesc firele și starea procesului cu interfața
+            context = multiprocessing.get_context('forkserver')
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=context,
+                                             initializer=_init_worker, initargs=(self.log_patterns,))
+        return self._pool
+
+    def scan(self, path, reference_time, stop_event=None, start=0):
+        """Yield (chunk end, lines seen, [(ts, line, mask, pid, end offset)], worker CPU) per chunk, in file order"""
+        ranges = deque(chunk_boundaries(path, self.chunk_size, start))
+        pool = self._get_pool()
+        pending = deque()
+        last_ts = reference_time
+        try:
+            while ranges or pending:
+                while ranges and len(pending) < self.workers * 2:
+                    chunk_start, chunk_end = ranges.popleft()
+                    pending.append((chunk_end, pool.submit(scan_chunk, path, chunk_start, chunk_end, reference_time)))
+                if stop_event is not None and stop_event.is_set():
+                    return
+                chunk_end, future = pending.popleft()
+                lines, found, chunk_last_ts, cpu = future.result()
+                # Liniile de continuare de la începutul bucății moștenesc timpul bucății anterioare
+                for i, (ts, line, mask, pid, offset) in enumerate(found):
+                    if ts is not None:
+                        break
+                    found[i] = (last_ts, line, mask, pid, offset)
+                if chunk_last_ts is not None:
+                    last_ts = chunk_last_ts
+                yield chunk_end, lines, found, cpu
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,61 @@
+import sys
+
+# Ordinea categoriilor definește și biții din mască
+CATEGORY_ORDER = ['CRITICAL', 'SECURITY', 'NETWORK', 'SYSTEM', 'WARNING']
+CATEGORY_BITS = {name: 1 << i for i, name in enumerate(CATEGORY_ORDER)}
+
+# Lungimea afișată a unei linii (restul rămâne în detalii)
+CONTENT_LIMIT = 500
+
+
+def categories_to_mask(categories):
+    mask = 0
+    for category in categories:
+        mask |= CATEGORY_BITS.get(category, 0)
+    return mask
+
+
+def mask_to_categories(mask):
+    return [name for name in CATEGORY_ORDER if mask & CATEGORY_BITS[name]]
+
+
+# Câte un tuplu partajat per mască posibilă; intrările nu își mai țin propria listă
+_MASK_CATEGORIES = [tuple(mask_to_categories(mask)) for mask in range(1 << len(CATEGORY_ORDER))]
+
+
+class LogEntry:
+    """One categorized log finding
+
+    The line is stored once, the source name is interned (shared by every
+    entry of the same file), categories are a bitmask and the timestamp stays
+    numeric until it is rendered.
+    """
+
+    __slots__ = ('ts', 'source', 'line', 'mask', 'pid', 'id')
+
+    def __init__(self, ts, source, line, mask, pid=None):
+        self.ts = ts
+        self.source = sys.intern(source)
+        self.line = line
+        self.mask = mask
+        self.pid = pid
+        self.id = None
+
+    @property
+    def file(self):
+        return self.source
+
+    @property
+    def content(self):
+        return self.line[:CONTENT_LIMIT]
+
+    @property
+    def raw_line(self):
+        return self.line
+
+    @property
+    def categories(self):
+        return _MASK_CATEGORIES[self.mask]
+
+    def has_category(self, name):
+        return bool(self.mask & CATEGORY_BITS.get(name, 0))
@@ -0,0 +1,241 @@
+import glob
+import gzip
+import lzma
+import os
+import queue
+import re
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from core.log_time import parse_log_timestamp
+from core.log_entry import LogEntry, categories_to_mask
+from core.pid_findings import extract_pid
+from core.log_chunks import ChunkedLogScanner, PARALLEL_MIN_SIZE
+
+# Fișiere rotite: syslog.1, auth.log.2.gz, kern.log.3.xz, messages-20240101.gz ...
+ARCHIVE_GLOBS = ['/var/log/*', '/var/log/*/*']
+ARCHIVE_NAME_RE = re.compile(r'(\.\d+(\.(gz|xz))?|\.(gz|xz)|-\d{8}(\.(gz|xz))?)$')
+# Jurnalele binare de autentificare (utmp) se rotesc la fel, dar nu conțin text
+BINARY_LOG_RE = re.compile(r'^(wtmp|btmp|utmp|lastlog|faillog)\b')
+
+
+def open_archive(path):
+    """Open a (possibly compressed) log archive as a streaming binary file
+
+    Offsets (tell/seek) are positions in the decompressed stream; seeking in a
+    compressed archive decompresses up to the target.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.xz'):
+        return lzma.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def archive_key(path):
+    """Identity of an archive that survives renames (syslog.1 -> syslog.2)"""
+    st = os.stat(path)
+    return (st.st_dev, st.st_ino, st.st_size, int(st.st_mtime))
+
+
+class LogHistoryScanner:
+    """Background scanner for rotated and compressed log archives
+
+    Archives are decompressed as streams, line by line, so memory is bounded by
+    the result queue (`max_batches` x `batch_size` entries) and not by archive
+    size. Large uncompressed archives are instead split into chunks classified
+    on a process pool (given `log_patterns`). Finished archives are recorded
+    in `completed` and never rescanned.
+
+    Each result batch carries the byte offset just past its last line. An
+    archive interrupted by stop() or by a restart resumes from the offset
+    of the last batch queued (same session) or drained (`offsets`, saved
+    by the caller), so findings already delivered are not read again.
+    """
+
+    def __init__(self, categorize, completed=None, batch_size=500, max_batches=16, log_patterns=None,
+                 offsets=None):
+        self._categorize = categorize
+        self._log_patterns = log_patterns
+        self.completed = set(completed) if completed else set()
+        self.finished = []  # Chei terminate (și preluate cu drain) în această sesiune, în ordine
+        self.offsets = dict(offsets) if offsets else {}  # cheie -> offset al ultimului lot preluat
+        self.offsets_changed = False
+        self._queued = dict(self.offsets)  # cheie -> offset al ultimului lot pus în coadă
+        self.batch_size = batch_size
+        self.results = queue.Queue(maxsize=max_batches)
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {
+            'archives_total': 0,
+            'archives_done': 0,
+            'lines': 0,
+            'found': 0,
+            'current': None,
+            'errors': 0,
+            'worker_cpu': 0.0,  # Secunde CPU ale proceselor worker (în afara process_time-ului propriu)
+        }
+
+    def find_archives(self):
+        """Return the rotated archives that have not been scanned yet"""
+        archives = []
+        for pattern in ARCHIVE_GLOBS:
+            for path in glob.glob(pattern):
+                if not ARCHIVE_NAME_RE.search(path) or BINARY_LOG_RE.match(os.path.basename(path)):
+                    continue
+                try:
+                    if not os.path.isfile(path) or not os.access(path, os.R_OK):
+                        continue
+                    key = archive_key(path)
+                except OSError:
+                    continue
+                if key not in self.completed:
+                    archives.append((path, key))
+        return archives
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='log-history', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _put(self, key, offset, batch):
+        """Blocking put that still honours stop(); gives back-pressure to the reader
+
+        `offset` None marks the archive as read to the end.
+        """
+        while not self._stop.is_set():
+            try:
+                self.results.put((key, offset, batch), timeout=0.5)
+                if offset is not None:
+                    self._queued[key] = offset
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        archives = self.find_archives()
+        self.stats['archives_total'] = len(archives)
+        self.stats['archives_done'] = 0
+
+        chunked = None
+        try:
+            for path, key in archives:
+                if self._stop.is_set():
+                    break
+                self.stats['current'] = os.path.basename(path)
+                start = self._queued.get(key, 0)
+                if self._log_patterns is not None and not path.endswith(('.gz', '.xz')) and key[2] >= PARALLEL_MIN_SIZE:
+                    if chunked is None:
+                        chunked = ChunkedLogScanner(self._log_patterns)
+                    try:
+                        done = self._scan_archive_chunked(chunked, path, key, start)
+                    except BrokenProcessPool:
+                        # Worker-ii nu pornesc (sau au murit): restul arhivelor se citesc în flux, în acest fir,
+                        # de la capătul ultimului lot deja pus în coadă
+                        self.stats['errors'] += 1
+                        self._log_patterns = None
+                        done = self._scan_archive(path, key, self._queued.get(key, start))
+                else:
+                    done = self._scan_archive(path, key, start)
+                if done and self._put(key, None, []):
+                    self.completed.add(key)
+                    self.stats['archives_done'] += 1
+        finally:
+            if chunked is not None:
+                chunked.close()
+
+        self.stats['current'] = None
+
+    def _scan_archive_chunked(self, chunked, path, key, start=0):
+        """Scan one large uncompressed archive on the process pool; True when read to the end"""
+        source = os.path.basename(path)
+        try:
+            for chunk_end, lines, found, cpu in chunked.scan(path, key[3], self._stop, start):
+                self.stats['lines'] += lines
+                self.stats['worker_cpu'] += cpu
+                # Loturile păstrează ordinea din fișier; fiecare bucată vine deja sortată pe linii
+                for i in range(0, len(found), self.batch_size):
+                    part = found[i:i + self.batch_size]
+                    batch = [LogEntry(ts, source, line, mask, pid) for ts, line, mask, pid, _ in part]
+                    self.stats['found'] += len(batch)
+                    if not self._put(key, part[-1][4], batch):
+                        return False
+                # Bucată fără găsiri: progresul avansează oricum până la capătul ei
+                if not found and not self._put(key, chunk_end, []):
+                    return False
+        except OSError:
+            self.stats['errors'] += 1
+        return not self._stop.is_set()
+
+    def _scan_archive(self, path, key, start=0):
+        """Stream one archive from byte `start`; returns True when it was read to the end"""
+        source = os.path.basename(path)
+        # Anul lipsește din liniile syslog: referința e momentul rotirii, nu acum
+        reference_time = key[3]
+        batch = []
+        last_ts = None
+        offset = start
+
+        try:
+            with open_archive(path) as f:
+                if start:
+                    f.seek(start)
+                for raw in f:
+                    if self._stop.is_set():
+                        return False
+                    offset += len(raw)
+                    line = raw.decode('utf-8', 'ignore').strip()
+                    if not line or len(line) < 10:
+                        continue
+                    self.stats['lines'] += 1
+
+                    ts = parse_log_timestamp(line, reference_time)
+                    if ts is None:
+                        ts = last_ts if last_ts is not None else reference_time
+                    last_ts = ts
+
+                    categories = self._categorize(line)
+                    if not categories:
+                        continue
+
+                    batch.append(LogEntry(ts, source, line, categories_to_mask(categories), extract_pid(line)))
+                    if len(batch) >= self.batch_size:
+                        self.stats['found'] += len(batch)
+                        if not self._put(key, offset, batch):
+                            return False
+                        batch = []
+        except (OSError, EOFError, lzma.LZMAError):
+            # Arhivă coruptă/trunchiată: o marcăm oricum ca să nu reîncercăm la nesfârșit
+            self.stats['errors'] += 1
+
+        if batch:
+            self.stats['found'] += len(batch)
+            if not self._put(key, offset, batch):
+                return False
+        return True
+
+    def drain(self, max_batches=4):
+        """Collect finished result batches without blocking, recording the progress they carry"""
+        entries = []
+        for _ in range(max_batches):
+            try:
+                key, offset, batch = self.results.get_nowait()
+            except queue.Empty:
+                break
+            entries.extend(batch)
+            if offset is None:
+                self.offsets.pop(key, None)
+                self.finished.append(key)
+            else:
+                self.offsets[key] = offset
+            self.offsets_changed = True
+        return entries
@@ -0,0 +1,204 @@
+import os
+import sqlite3
+import time
+import zlib
+from core.log_entry import LogEntry, CATEGORY_BITS
+
+DEFAULT_DB_PATH = os.path.expanduser('~/.local/share/monitor_sistem/findings.db')
+
+
+class LogStore:
+    """Persistent SQLite index of categorized log findings
+
+    Findings are indexed by time, category (partial index per category bit),
+    source and pid; FTS5 is used for text search when SQLite provides it.
+    Writes are buffered and flushed in one transaction per scan.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, retention_days=30):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.has_fts = False
+        self._pending = []
+        self._counts = {}
+        self._create_schema()
+        self.prune(time.time() - retention_days * 86400)
+
+    def _create_schema(self):
+        c = self.conn
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS findings (
+                id INTEGER PRIMARY KEY,
+                ts REAL NOT NULL,
+                source TEXT NOT NULL,
+                category_mask INTEGER NOT NULL,
+                pid INTEGER,
+                line_hash INTEGER NOT NULL,
+                line TEXT NOT NULL
+            )""")
+        c.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_findings_dedup ON findings(source, ts, line_hash)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_findings_ts ON findings(ts)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_findings_source ON findings(source, ts)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_findings_pid ON findings(pid, ts) WHERE pid IS NOT NULL')
+        for name, bit in CATEGORY_BITS.items():
+            # Bitul e literal în SQL ca indexul parțial să poată fi folosit de interogări
+            c.execute(f'CREATE INDEX IF NOT EXISTS idx_findings_{name.lower()} '
+                      f'ON findings(ts) WHERE category_mask & {bit}')
+
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS archives (
+                dev INTEGER, ino INTEGER, size INTEGER, mtime INTEGER,
+                PRIMARY KEY (dev, ino, size, mtime)
+            )""")
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS archive_offsets (
+                dev INTEGER, ino INTEGER, size INTEGER, mtime INTEGER, offset INTEGER,
+                PRIMARY KEY (dev, ino, size, mtime)
+            )""")
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS file_offsets (
+                path TEXT PRIMARY KEY, ino INTEGER, offset INTEGER
+            )""")
+
+        try:
+            c.execute("CREATE VIRTUAL TABLE IF NOT EXISTS findings_fts "
+                      "USING fts5(line, content='findings', content_rowid='id')")
+            c.execute("""
+                CREATE TRIGGER IF NOT EXISTS findings_fts_insert AFTER INSERT ON findings BEGIN
+                    INSERT INTO findings_fts(rowid, line) VALUES (new.id, new.line);
+                END""")
+            c.execute("""
+                CREATE TRIGGER IF NOT EXISTS findings_fts_delete AFTER DELETE ON findings BEGIN
+                    INSERT INTO findings_fts(findings_fts, rowid, line) VALUES ('delete', old.id, old.line);
+                END""")
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite fără FTS5: căutarea revine la LIKE
+            self.has_fts = False
+        c.commit()
+
+    def add(self, entries):
+        """Buffer entries for the next flush"""
+        self._pending.extend(entries)
+
+    def flush(self):
+        """Write buffered entries in a single transaction; returns rows inserted"""
+        if not self._pending:
+            return 0
+        rows = [(e.ts, e.source, e.mask, e.pid, zlib.crc32(e.line.encode('utf-8', 'ignore')), e.line)
+                for e in self._pending]
+        self._pending = []
+        with self.conn:
+            cur = self.conn.executemany(
+                'INSERT OR IGNORE INTO findings (ts, source, category_mask, pid, line_hash, line) '
+                'VALUES (?, ?, ?, ?, ?, ?)', rows)
+            inserted = max(0, cur.rowcount)
+        if inserted:
+            self._counts.clear()
+        return inserted
+
+    def prune(self, before_ts):
+        with self.conn:
+            self.conn.execute('DELETE FROM findings WHERE ts < ?', (before_ts,))
+        self._counts.clear()
+
+    def _where(self, category=None, source=None, pid=None, start=None, end=None):
+        clauses, params = [], []
+        if category in CATEGORY_BITS:
+            clauses.append(f'category_mask & {CATEGORY_BITS[category]}')
+        if source is not None:
+            clauses.append('source = ?')
+            params.append(source)
+        if pid is not None:
+            clauses.append('pid = ?')
+            params.append(pid)
+        if start is not None:
+            clauses.append('ts >= ?')
+            params.append(start)
+        if end is not None:
+            clauses.append('ts < ?')
+            params.append(end)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    @staticmethod
+    def _row_to_entry(row):
+        ts, source, mask, pid, line = row
+        return LogEntry(ts, source, line, mask, pid)
+
+    def page(self, offset=0, limit=50, **filters):
+        """Return one page of findings, newest first"""
+        where, params = self._where(**filters)
+        cur = self.conn.execute(
+            f'SELECT ts, source, category_mask, pid, line FROM findings{where} '
+            f'ORDER BY ts DESC LIMIT ? OFFSET ?', params + [limit, offset])
+        return [self._row_to_entry(row) for row in cur]
+
+    def count(self, **filters):
+        """Number of findings matching the filters (cached until the next insert)"""
+        key = tuple(sorted(filters.items()))
+        cached = self._counts.get(key)
+        if cached is None:
+            where, params = self._where(**filters)
+            cached = self.conn.execute(f'SELECT count(*) FROM findings{where}', params).fetchone()[0]
+            self._counts[key] = cached
+        return cached
+
+    def load_recent(self, seconds, limit):
+        """Return the findings of the last `seconds` seconds, oldest first"""
+        entries = self.page(0, limit, start=time.time() - seconds)
+        entries.reverse()
+        return entries
+
+    def search(self, text, limit=200):
+        """Full-text search, newest first"""
+        if self.has_fts:
+            phrase = '"' + text.replace('"', '""') + '"'
+            try:
+                cur = self.conn.execute(
+                    'SELECT f.ts, f.source, f.category_mask, f.pid, f.line FROM findings_fts '
+                    'JOIN findings f ON f.id = findings_fts.rowid '
+                    'WHERE findings_fts MATCH ? ORDER BY f.ts DESC LIMIT ?', (phrase, limit))
+                return [self._row_to_entry(row) for row in cur]
+            except sqlite3.OperationalError:
+                pass
+        cur = self.conn.execute(
+            'SELECT ts, source, category_mask, pid, line FROM findings '
+            "WHERE line LIKE ? ESCAPE '\\' ORDER BY ts DESC LIMIT ?",
+            ('%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%', limit))
+        return [self._row_to_entry(row) for row in cur]
+
+    def load_archive_marks(self):
+        return set(self.conn.execute('SELECT dev, ino, size, mtime FROM archives'))
+
+    def mark_archives(self, keys):
+        with self.conn:
+            self.conn.executemany('INSERT OR IGNORE INTO archives VALUES (?, ?, ?, ?)', keys)
+            self.conn.executemany('DELETE FROM archive_offsets WHERE dev = ? AND ino = ? AND size = ? AND mtime = ?',
+                                  keys)
+
+    def load_archive_offsets(self):
+        """Byte offsets up to which partially scanned archives were read"""
+        return {tuple(row[:4]): row[4] for row in
+                self.conn.execute('SELECT dev, ino, size, mtime, offset FROM archive_offsets')}
+
+    def save_archive_offsets(self, offsets):
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO archive_offsets VALUES (?, ?, ?, ?, ?)',
+                                  [key + (offset,) for key, offset in offsets.items()])
+
+    def load_file_offsets(self):
+        return {path: (ino, offset) for path, ino, offset in
+                self.conn.execute('SELECT path, ino, offset FROM file_offsets')}
+
+    def save_file_offsets(self, offsets):
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO file_offsets VALUES (?, ?, ?)',
+                                  [(path, ino, offset) for path, (ino, offset) in offsets.items()])
+
+    def close(self):
+        self.flush()
+        self.conn.close()
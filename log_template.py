@@ -0,0 +1,172 @@
+import re
+from collections import OrderedDict
+
+WILDCARD = '<*>'
+
+# Peste atâtea apariții ale aceluiași șablon într-o fereastră, restul doar se numără
+COLLAPSE_AFTER = 50
+COLLAPSE_WINDOW = 60
+
+# Părți variabile: numere (porturi, PID-uri, ore, IP-uri), hex cu cifre, 0x...
+_VARIABLE_RE = re.compile(r'0x[0-9a-f]+|(?=[0-9a-f]*\d)[0-9a-f]{8,}|\d+(?:[.:]\d+)*', re.IGNORECASE)
+
+
+def mask_line(line):
+    """Tokens of a log line with the variable parts replaced by WILDCARD"""
+    return _VARIABLE_RE.sub(WILDCARD, line).split()
+
+
+class LogCluster:
+    """One message template with its occurrence count and first/last example entries"""
+
+    __slots__ = ('id', 'key', 'tokens', 'count', 'first_seen', 'last_seen', 'first', 'sample', 'categories',
+                 'window', 'window_count', 'collapsed')
+
+    def __init__(self, cluster_id, key, tokens, entry):
+        self.id = cluster_id
+        self.key = key  # Cheia bucket-ului; șablonul se poate generaliza, cheia rămâne
+        self.tokens = tokens
+        self.count = 0
+        self.first_seen = entry.ts
+        self.last_seen = entry.ts
+        self.first = entry
+        self.sample = entry  # Ultimul exemplu
+        self.categories = list(entry.categories)
+        self.window = None
+        self.window_count = 0
+        self.collapsed = 0  # Apariții ținute doar ca număr, fără intrare proprie
+
+    @property
+    def template(self):
+        return ' '.join(self.tokens)
+
+    def similarity(self, tokens):
+        """Share of positions where the template and `tokens` agree (wildcards match anything)"""
+        equal = 0
+        for mine, theirs in zip(self.tokens, tokens):
+            if mine == theirs or mine == WILDCARD:
+                equal += 1
+        return equal / len(tokens)
+
+    def merge(self, tokens, entry):
+        for i, (mine, theirs) in enumerate(zip(self.tokens, tokens)):
+            if mine != theirs and mine != WILDCARD:
+                self.tokens[i] = WILDCARD
+        self.count += 1
+        ts = entry.ts
+        if ts < self.first_seen:
+            self.first_seen = ts
+            self.first = entry
+        if ts >= self.last_seen:
+            self.last_seen = ts
+            self.sample = entry
+        for category in entry.categories:
+            if category not in self.categories:
+                self.categories.append(category)
+
+
+class TemplateMiner:
+    """Online Drain-style clustering of log lines into templates
+
+    Lines are bucketed by token count and their first constant tokens, then
+    matched against the (few) templates of that bucket only, so the cost per
+    line does not grow with the number of templates. The number of templates
+    is capped; the least recently seen one is evicted first.
+
+    `admit()` also collapses floods: past `collapse_after` occurrences of one
+    template in a `collapse_window` of event time, further lines only raise
+    the template's count and last example instead of being kept one by one.
+    """
+
+    def __init__(self, similarity=0.5, max_clusters=2000, max_per_bucket=64, key_tokens=3,
+                 collapse_after=COLLAPSE_AFTER, collapse_window=COLLAPSE_WINDOW):
+        self.similarity = similarity
+        self.collapse_after = collapse_after
+        self.collapse_window = collapse_window
+        self.collapsed = 0
+        self.max_clusters = max_clusters
+        self.max_per_bucket = max_per_bucket
+        self.key_tokens = key_tokens
+        self._buckets = {}
+        self._clusters = OrderedDict()  # id -> cluster, ordonat după ultima potrivire
+        self._next_id = 0
+        self.version = 0
+
+    def __len__(self):
+        return len(self._clusters)
+
+    def clear(self):
+        self._buckets = {}
+        self._clusters = OrderedDict()
+        self.collapsed = 0
+        self.version += 1
+
+    def _bucket_key(self, tokens):
+        constant = [t for t in tokens[:self.key_tokens * 2] if WILDCARD not in t]
+        return (len(tokens),) + tuple(constant[:self.key_tokens])
+
+    def add(self, entry):
+        """Assign an entry to a template (creating one if needed); returns the cluster"""
+        tokens = mask_line(entry.content)
+        if not tokens:
+            return None
+        key = self._bucket_key(tokens)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = bucket = []
+
+        best, best_score = None, self.similarity
+        for cluster in bucket:
+            score = cluster.similarity(tokens)
+            if score >= best_score:
+                best, best_score = cluster, score
+                if score == 1.0:
+                    break
+
+        if best is None:
+            if len(bucket) >= self.max_per_bucket:
+                self._evict(min(bucket, key=lambda c: c.last_seen))
+            best = LogCluster(self._next_id, key, tokens, entry)
+            self._next_id += 1
+            bucket.append(best)
+            self._clusters[best.id] = best
+            if len(self._clusters) > self.max_clusters:
+                self._evict(next(iter(self._clusters.values())))
+        else:
+            self._clusters.move_to_end(best.id)
+
+        best.merge(tokens, entry)
+        self.version += 1
+        return best
+
+    def admit(self, entry):
+        """Add an entry to its template; False when it only counts (template flooding)"""
+        cluster = self.add(entry)
+        if cluster is None:
+            return True
+        window = int(entry.ts // self.collapse_window)
+        if window != cluster.window:
+            cluster.window = window
+            cluster.window_count = 0
+        cluster.window_count += 1
+        if cluster.window_count <= self.collapse_after:
+            return True
+        cluster.collapsed += 1
+        self.collapsed += 1
+        return False
+
+    def _evict(self, cluster):
+        self._clusters.pop(cluster.id, None)
+        bucket = self._buckets.get(cluster.key)
+        if bucket is not None and cluster in bucket:
+            bucket.remove(cluster)
+            if not bucket:
+                del self._buckets[cluster.key]
+
+    def clusters(self, category=None, since=None):
+        """Templates, most recently seen first"""
+        result = [c for c in self._clusters.values()
+                  if (category is None or category in c.categories)
+                  and (since is None or c.last_seen >= since)]
+        result.sort(key=lambda c: c.last_seen, reverse=True)
+        return result
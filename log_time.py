@@ -0,0 +1,213 @@
+import bisect
+import calendar
+import heapq
+import time
+from operator import attrgetter
+
+MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+
+# Cache-uri pentru baza de timp (epoch) a unei zile/ore; evită mktime/timegm per linie
+_local_hour_cache = {}
+_utc_day_cache = {}
+_year_cache = [None, None]  # [oră (epoch // 3600), anul local curent]
+_boot_time = None
+
+
+def _local_hour_base(year, month, day, hour):
+    """Epoch of a local-time hour, cached (DST-correct at hour granularity)"""
+    key = (year, month, day, hour)
+    base = _local_hour_cache.get(key)
+    if base is None:
+        if len(_local_hour_cache) > 4096:
+            _local_hour_cache.clear()
+        base = time.mktime((year, month, day, hour, 0, 0, 0, 0, -1))
+        _local_hour_cache[key] = base
+    return base
+
+
+def _utc_day_base(year, month, day):
+    """Epoch of a UTC midnight, cached"""
+    key = (year, month, day)
+    base = _utc_day_cache.get(key)
+    if base is None:
+        if len(_utc_day_cache) > 4096:
+            _utc_day_cache.clear()
+        base = calendar.timegm((year, month, day, 0, 0, 0, 0, 0, 0))
+        _utc_day_cache[key] = base
+    return base
+
+
+def _get_boot_time():
+    """Boot time from /proc/stat, used for kernel '[secs.usecs]' prefixes"""
+    global _boot_time
+    if _boot_time is None:
+        _boot_time = 0.0
+        try:
+            with open('/proc/stat', 'r') as f:
+                for line in f:
+                    if line.startswith('btime '):
+                        _boot_time = float(line.split()[1])
+                        break
+        except OSError:
+            pass
+    return _boot_time
+
+
+def parse_syslog_timestamp(line, now=None):
+    """Parse 'Oct 19 12:34:56' (classic syslog, no year) into epoch seconds"""
+    month = MONTHS.get(line[0:3])
+    if month is None or line[3] != ' ' or line[9] != ':' or line[12] != ':':
+        return None
+    day = int(line[4:6])
+    hour = int(line[7:9])
+    minute = int(line[10:12])
+    second = int(line[13:15])
+
+    if now is None:
+        now = time.time()
+    hour_key = int(now // 3600)
+    if _year_cache[0] != hour_key:
+        _year_cache[0] = hour_key
+        _year_cache[1] = time.localtime(now).tm_year
+    year = _year_cache[1]
+    ts = _local_hour_base(year, month, day, hour) + minute * 60 + second
+    # Fără an în linie: o dată "în viitor" aparține anului trecut
+    if ts > now + 86400:
+        ts = _local_hour_base(year - 1, month, day, hour) + minute * 60 + second
+    return ts
+
+
+def parse_iso_timestamp(line):
+    """Parse 'YYYY-MM-DD[T ]HH:MM:SS[.frac][Z|+HH:MM|+HHMM]' into epoch seconds"""
+    if line[4] != '-' or line[7] != '-' or line[13] != ':' or line[16] != ':':
+        return None
+    year = int(line[0:4])
+    month = int(line[5:7])
+    day = int(line[8:10])
+    hour = int(line[11:13])
+    minute = int(line[14:16])
+    second = int(line[17:19])
+
+    pos = 19
+    fraction = 0.0
+    if pos < len(line) and line[pos] in '.,':
+        end = pos + 1
+        while end < len(line) and line[end].isdigit():
+            end += 1
+        if end > pos + 1:
+            fraction = float('0.' + line[pos + 1:end])
+        pos = end
+
+    tz = line[pos:pos + 1]
+    if tz == 'Z':
+        return _utc_day_base(year, month, day) + hour * 3600 + minute * 60 + second + fraction
+    if tz in ('+', '-') and line[pos + 1:pos + 3].isdigit():
+        offset_hours = int(line[pos + 1:pos + 3])
+        offset_minutes_str = line[pos + 4:pos + 6] if line[pos + 3:pos + 4] == ':' else line[pos + 3:pos + 5]
+        offset_minutes = int(offset_minutes_str) if offset_minutes_str.isdigit() else 0
+        offset = offset_hours * 3600 + offset_minutes * 60
+        if tz == '-':
+            offset = -offset
+        return _utc_day_base(year, month, day) + hour * 3600 + minute * 60 + second + fraction - offset
+
+    # Fără fus orar: ora locală
+    return _local_hour_base(year, month, day, hour) + minute * 60 + second + fraction
+
+
+def parse_log_timestamp(line, now=None):
+    """Return the epoch timestamp at the start of a log line, or None
+
+    Recognized: syslog ('Oct 19 12:34:56'), ISO8601 (rsyslog high precision,
+    journalctl -o short-iso), unix seconds (journalctl -o short-unix) and the
+    kernel '[ 1234.567890]' uptime prefix.
+    """
+    if len(line) < 15:
+        return None
+    try:
+        first = line[0]
+        if first.isdigit():
+            if line[4] == '-':
+                return parse_iso_timestamp(line)
+            # journalctl -o short-unix: "1697712345.123456 host ..."
+            token = line.split(' ', 1)[0]
+            if '.' in token and token.replace('.', '', 1).isdigit():
+                return float(token)
+            return None
+        if first == '[':
+            close = line.find(']', 1, 20)
+            if close > 0:
+                return _get_boot_time() + float(line[1:close])
+            return None
+        if first.isalpha():
+            return parse_syslog_timestamp(line, now)
+    except (ValueError, IndexError, OverflowError):
+        return None
+    return None
+
+
+class LogTimeIndex:
+    """Time-ordered entry store with bisect-based range queries
+
+    Entries carry an epoch `ts` attribute; the store keeps a parallel list
+    of keys so that range queries are two bisects.
+    """
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._keys = []
+        self._entries = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._keys = []
+        self._entries = []
+
+    def add_sorted(self, entries):
+        """Add a batch of entries already sorted by ts; returns the entries evicted"""
+        if not entries:
+            return []
+
+        if not self._keys or entries[0].ts >= self._keys[-1]:
+            # Cazul obișnuit: intrările noi sunt mai recente decât tot ce avem
+            self._entries.extend(entries)
+            self._keys.extend(e.ts for e in entries)
+        else:
+            merged = list(heapq.merge(self._entries, entries, key=attrgetter('ts')))
+            self._entries = merged
+            self._keys = [e.ts for e in merged]
+
+        overflow = len(self._entries) - self.max_entries
+        if overflow > 0:
+            evicted = self._entries[:overflow]
+            del self._entries[:overflow]
+            del self._keys[:overflow]
+            return evicted
+        return []
+
+    def range(self, start=None, end=None):
+        """Return the entries with start <= ts < end, oldest first"""
+        lo = 0 if start is None else bisect.bisect_left(self._keys, start)
+        hi = len(self._keys) if end is None else bisect.bisect_left(self._keys, end)
+        return self._entries[lo:hi]
+
+    def since(self, seconds, now=None):
+        """Return the entries from the last `seconds` seconds, oldest first"""
+        if now is None:
+            now = time.time()
+        return self.range(now - seconds)
+
+    def latest(self, count):
+        """Return the newest `count` entries, newest first"""
+        if count <= 0:
+            return []
+        return self._entries[:-count - 1:-1]
+
+
+def merge_by_time(sources):
+    """K-way merge of per-source entry lists (each sorted by ts)"""
+    return list(heapq.merge(*sources, key=attrgetter('ts')))
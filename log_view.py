@@ -1,5 +1,29 @@
 import curses
+import time
 from datetime import datetime
+from ui.utils import draw_input_line
+
+# Ferestre de timp disponibile în tab-ul de log-uri (secunde; None = tot)
+LOG_TIME_WINDOWS = [None, 300, 3600, 86400]
+
+def format_time_window(seconds):
+    """Format a time window for display"""
+    if seconds is None:
+        return "tot"
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    return f"{seconds // 3600}h"
+
+def format_log_time(ts, full=False):
+    """Format an epoch timestamp at render time (HH:MM:SS today, date otherwise)"""
+    if ts is None:
+        return '??:??:??'
+    moment = datetime.fromtimestamp(ts)
+    if full:
+        return moment.strftime('%Y-%m-%d %H:%M:%S')
+    if moment.date() == datetime.now().date():
+        return moment.strftime('%H:%M:%S')
+    return moment.strftime('%d.%m.%y')
 
 def format_log_category(categories):
     """Format log categories for display"""
@@ -29,6 +53,10 @@ def draw_log_header(stdscr, y, width, monitor):
         # Title with current filter
         filter_text = f"({monitor.log_filter})" if monitor.log_filter != 'ALL' else "(TOATE)"
         title = f"LOG-URI SUSPICIOASE {filter_text}"
+        if monitor.log_time_window:
+            title += f" [ultimele {format_time_window(monitor.log_time_window)}]"
+        if monitor.log_grouped:
+            title += " [GRUPATE]"
         
         # Update information
         last_scan_text = f"Ultima scan: {datetime.fromtimestamp(monitor.last_log_scan).strftime('%H:%M:%S')}" if monitor.last_log_scan > 0 else "Niciun scan"
@@ -36,11 +64,17 @@ def draw_log_header(stdscr, y, width, monitor):
         stdscr.addstr(y, 2, title, curses.A_BOLD | curses.color_pair(2))
         stdscr.addstr(y, width - len(last_scan_text) - 2, last_scan_text, curses.A_DIM)
         
-        # Separator line
+        # Separator line (hosts the search field when a search is active)
         stdscr.addstr(y + 1, 2, "─" * (width - 4))
+        if monitor.log_search_typing or monitor.log_search_query:
+            draw_input_line(stdscr, y + 1, 2, " Căutare: /", monitor.log_search_query,
+                            width // 2, active=monitor.log_search_typing)
         
         # Column headers
-        header = f"{'TIMP':<8} {'TIP':<9} {'FIȘIER':<12} {'CONȚINUT'}"
+        if monitor.log_grouped:
+            header = f"{'ULTIMA':<8} {'TIP':<9} {'APARIȚII':>8}  {'ȘABLON'}"
+        else:
+            header = f"{'TIMP':<8} {'TIP':<9} {'FIȘIER':<12} {'CONȚINUT'}"
         stdscr.addstr(y + 2, 2, header, curses.A_BOLD)
         
         return y + 3
@@ -50,10 +84,10 @@ def draw_log_header(stdscr, y, width, monitor):
 def draw_log_entry(stdscr, y, width, log_entry, is_highlighted=False):
     """Draw a log entry"""
     try:
-        timestamp = log_entry.get('timestamp', '??:??:??')
-        categories = log_entry.get('categories', [])
-        file_name = log_entry.get('file', 'unknown')[:11]
-        content = log_entry.get('content', '')
+        timestamp = format_log_time(log_entry.ts)
+        categories = log_entry.categories
+        file_name = log_entry.source[:11]
+        content = log_entry.content
         
         # Determine main category and color
         main_category = format_log_category(categories)
@@ -88,6 +122,21 @@ def draw_log_entry(stdscr, y, width, log_entry, is_highlighted=False):
     except curses.error:
         return False
 
+def draw_log_group_entry(stdscr, y, width, cluster, is_highlighted=False):
+    """Draw a message template with its occurrence count"""
+    try:
+        main_category = format_log_category(cluster.categories)
+        color = get_category_color(main_category)
+        if is_highlighted:
+            color |= curses.A_REVERSE
+        
+        line = (f"{format_log_time(cluster.last_seen):<8} {main_category:<9} "
+                f"{cluster.count:>8}  {cluster.template}")
+        stdscr.addstr(y, 2, line[:width - 4], color)
+        return True
+    except curses.error:
+        return False
+
 def draw_log_statistics(stdscr, y, width, monitor):
     """Draw log statistics"""
     try:
@@ -102,9 +151,39 @@ def draw_log_statistics(stdscr, y, width, monitor):
         cache_size = stats.get('cache_size', 0)
         
         stats_line = f"Total găsite: {total_entries} | Afișate: {returned_entries} | Cache: {cache_size}"
+        if stats.get('collapsed'):
+            # Repetări ale aceluiași șablon păstrate doar ca număr (vizibile cu G)
+            stats_line += f" | Comasate: {stats['collapsed']}"
+        
+        # Progresul scanării de arhive rotite
+        scanner = getattr(monitor.detector, 'history_scanner', None)
+        if scanner is not None:
+            h = scanner.stats
+            state = "activă" if scanner.running else "oprită"
+            stats_line += (f" | Arhive ({state}): {h['archives_done']}/{h['archives_total']}"
+                           f", {h['found']} găsite")
+            if h['current']:
+                stats_line += f" [{h['current']}]"
         
         stdscr.addstr(y, 2, "STATISTICI:", curses.A_BOLD)
-        stdscr.addstr(y + 1, 2, stats_line, curses.A_DIM)
+        stdscr.addstr(y + 1, 2, stats_line[:width - 4], curses.A_DIM)
+        
+        # Rate pe fereastra glisantă (ultimul minut)
+        tracker = getattr(monitor.detector, 'rate_tracker', None)
+        if tracker is not None:
+            now = time.time()
+            rates = tracker.category_rates(now)
+            rate_line = f"Rată/{tracker.window}s: " + " ".join(
+                f"{category[:4]}={count}" for category, count in rates.items())
+            top = tracker.top_sources(now)
+            if top:
+                rate_line += " | Surse: " + ", ".join(f"{source}={count}" for source, count in top)
+            rate_line += f" | Alerte rată: {tracker.alerts_raised}"
+            rate_error = getattr(tracker, 'error', None)
+            if rate_error:
+                rate_line += f" | rate_rules.json invalid: {rate_error}"
+            attr = curses.color_pair(3) | curses.A_BOLD if tracker.alerts_raised or rate_error else curses.A_DIM
+            stdscr.addstr(y + 2, 2, rate_line[:width - 4], attr)
         
         # Statistics by category
         if hasattr(monitor.detector, 'log_categories'):
@@ -114,10 +193,10 @@ def draw_log_statistics(stdscr, y, width, monitor):
             stdscr.addstr(y, 2, "PE CATEGORII:", curses.A_BOLD)
             y += 1
             
-            for category, entries in categories.items():
-                if entries:
+            for category, count in categories.items():
+                if count:
                     color = get_category_color(category)
-                    category_line = f"  {category}: {len(entries)} intrări"
+                    category_line = f"  {category}: {count} intrări"
                     stdscr.addstr(y, 2, category_line, color)
                     y += 1
                     
@@ -143,17 +222,16 @@ def draw_log_details_panel(stdscr, height, width, selected_log):
         stdscr.addstr(panel_y, 2, "DETALII LOG SELECTAT", curses.A_BOLD | curses.color_pair(2))
         
         # Basic info
-        timestamp = selected_log.get('timestamp', 'N/A')
-        file_name = selected_log.get('file', 'N/A')
-        categories = selected_log.get('categories', [])
+        timestamp = format_log_time(selected_log.ts, full=True)
+        file_name = selected_log.source
+        categories = selected_log.categories
         
         stdscr.addstr(panel_y + 1, 4, f"Timp: {timestamp}")
-        stdscr.addstr(panel_y + 1, 20, f"Fișier: {file_name}")
-        stdscr.addstr(panel_y + 1, 40, f"Categorii: {', '.join(categories)}")
+        stdscr.addstr(panel_y + 1, 32, f"Fișier: {file_name}")
+        stdscr.addstr(panel_y + 1, 56, f"Categorii: {', '.join(categories)}")
         
         # Full content
-        content = selected_log.get('content', '')
-        raw_line = selected_log.get('raw_line', content)
+        raw_line = selected_log.line
         
         stdscr.addstr(panel_y + 3, 4, "CONȚINUT COMPLET:", curses.A_BOLD)
         
@@ -188,20 +266,73 @@ def draw_log_details_panel(stdscr, height, width, selected_log):
 def draw_suspicious_logs(stdscr, height, width, monitor):
     """Main function for drawing suspicious logs"""
     try:
-        # Filter logs by current filter
-        if monitor.log_filter == 'ALL':
-            filtered_logs = monitor.suspicious_logs
-        else:
-            filtered_logs = [
-                log for log in monitor.suspicious_logs 
-                if monitor.log_filter in log.get('categories', [])
-            ]
-        
         # Draw header
         current_y = draw_log_header(stdscr, 6, width, monitor)
         
+        # Calculate display area
+        stats_panel_height = 12  # Space for statistics
+        available_height = height - current_y - 3 - stats_panel_height
+        
+        category = monitor.log_filter if monitor.log_filter != 'ALL' else None
+        store = getattr(monitor.detector, 'store', None)
+        
+        draw_row = draw_log_entry
+        if monitor.log_grouped:
+            # Șabloane (cele mai recent văzute primele); căutarea filtrează textul șablonului
+            since = datetime.now().timestamp() - monitor.log_time_window if monitor.log_time_window else None
+            templates = monitor.detector.templates
+            source_logs = templates.clusters(since=since)
+            filtered_logs = templates.clusters(category, since) if category else source_logs
+            if monitor.log_search_query:
+                query = monitor.log_search_query.lower()
+                filtered_logs = [c for c in filtered_logs if query in c.template.lower()]
+            total_logs = len(source_logs)
+            filtered_count = len(filtered_logs)
+            if monitor.log_scroll_offset >= filtered_count:
+                monitor.log_scroll_offset = max(0, filtered_count - 1)
+            visible_logs = filtered_logs[monitor.log_scroll_offset:
+                                         monitor.log_scroll_offset + available_height]
+            draw_row = draw_log_group_entry
+        elif store is not None and not monitor.log_time_window and not monitor.log_search_query:
+            # Page straight from the persistent index: only the visible rows are loaded
+            total_logs = store.count()
+            filtered_count = store.count(category=category) if category else total_logs
+            if monitor.log_scroll_offset >= filtered_count:
+                monitor.log_scroll_offset = max(0, filtered_count - 1)
+            visible_logs = store.page(monitor.log_scroll_offset, available_height, category=category)
+        else:
+            # Search (trigram index) or time window (bisect over the time index), newest first
+            if monitor.log_search_query:
+                source_logs = monitor.get_log_search_results()
+                if monitor.log_time_window:
+                    cutoff = datetime.now().timestamp() - monitor.log_time_window
+                    source_logs = [log for log in source_logs if log.ts >= cutoff]
+            elif monitor.log_time_window:
+                source_logs = monitor.detector.timeline.since(monitor.log_time_window)[::-1]
+            else:
+                source_logs = monitor.suspicious_logs
+            
+            # Filter logs by current filter
+            if category is None:
+                filtered_logs = source_logs
+            else:
+                filtered_logs = [
+                    log for log in source_logs 
+                    if log.has_category(category)
+                ]
+            total_logs = len(source_logs)
+            filtered_count = len(filtered_logs)
+            
+            # Adjust scroll offset
+            if monitor.log_scroll_offset >= filtered_count:
+                monitor.log_scroll_offset = max(0, filtered_count - 1)
+            
+            # Draw visible logs
+            visible_logs = filtered_logs[monitor.log_scroll_offset:
+                                       monitor.log_scroll_offset + available_height]
+        
         # Statistics
-        stats_text = f"Filtrate: {len(filtered_logs)} din {len(monitor.suspicious_logs)}"
+        stats_text = f"Filtrate: {filtered_count} din {total_logs}"
         if monitor.log_filter != 'ALL':
             stats_text += f" | Filtru: {monitor.log_filter}"
             
@@ -210,24 +341,12 @@ def draw_suspicious_logs(stdscr, height, width, monitor):
         except curses.error:
             pass
         
-        # Calculate display area
-        stats_panel_height = 12  # Space for statistics
-        available_height = height - current_y - 3 - stats_panel_height
-        
-        # Adjust scroll offset
-        if monitor.log_scroll_offset >= len(filtered_logs):
-            monitor.log_scroll_offset = max(0, len(filtered_logs) - 1)
-        
-        # Draw visible logs
-        visible_logs = filtered_logs[monitor.log_scroll_offset:
-                                   monitor.log_scroll_offset + available_height]
-        
         y = current_y
         for idx, log_entry in enumerate(visible_logs):
             # For now, we don't have log selection, but we can add it later
             is_highlighted = False  # Can be implemented later
             
-            if not draw_log_entry(stdscr, y, width, log_entry, is_highlighted):
+            if not draw_row(stdscr, y, width, log_entry, is_highlighted):
                 break
                 
             y += 1
@@ -236,9 +355,9 @@ def draw_suspicious_logs(stdscr, height, width, monitor):
                 break
         
         # Draw scroll indicator
-        if len(filtered_logs) > available_height:
-            scroll_pos = int((monitor.log_scroll_offset / len(filtered_logs)) * available_height)
-            scroll_size = max(1, int((available_height / len(filtered_logs)) * available_height))
+        if filtered_count > available_height:
+            scroll_pos = int((monitor.log_scroll_offset / filtered_count) * available_height)
+            scroll_size = max(1, int((available_height / filtered_count) * available_height))
             
             for i in range(available_height):
                 char = '█' if scroll_pos <= i < scroll_pos + scroll_size else '░'
@@ -256,8 +375,10 @@ def draw_suspicious_logs(stdscr, height, width, monitor):
         # But if we add log selection, we can call draw_log_details_panel here.
         
         # Message if no logs
-        if not filtered_logs:
+        if not filtered_count:
             no_logs_msg = "Niciun log suspicios găsit"
+            if monitor.log_search_query:
+                no_logs_msg += f" pentru '{monitor.log_search_query}'"
             if monitor.log_filter != 'ALL':
                 no_logs_msg += f" pentru filtrul {monitor.log_filter}"
             try:
@@ -267,7 +388,7 @@ def draw_suspicious_logs(stdscr, height, width, monitor):
                 pass
         
         # Key help
-        help_text = "TAB:schimbă | ↑/↓:navighează | F:filtru | R:reîmprospătează | Shift+F:scan complet | D:curăță cache"
+        help_text = "TAB:schimbă | ↑/↓:navighează | F:filtru | /:caută | T:interval | G:grupare | A:arhive | R:reîmprospătează | Shift+F:scan complet | D:curăță cache"
         try:
             stdscr.addstr(height - 1, 2, help_text[:width-4], curses.A_DIM)
         except curses.error:
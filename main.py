@@ -135,14 +135,111 @@ def print_welcome():
     print("║ • TAB: Schimbare între tab-uri                                ║")
     print("║ • ↑/↓: Navigare / Selectare proces                            ║")
     print("║ • S: Afișare doar procese suspicioase                         ║")
-    print("║ • C/M: Sortare după CPU/Memorie                               ║")
+    print("║ • N: Afișare doar procese cu activitate de rețea              ║")
+    print("║ • C/M/I: Sortare după CPU/Memorie/I/O disc                    ║")
     print("║ • F: Filtrare log-uri                                         ║")
     print("║ • H: Ajutor                                                   ║")
     print("║ • Q/ESC: Ieșire                                               ║")
+    print("╠═══════════════════════════════════════════════════════════════╣")
+    print("║ MOD FLOTĂ:                                                    ║")
+    print("║ • --agent [host:]port|unix:/cale  Servește snapshot-uri       ║")
+    print("║ • --fleet adresa1,adresa2,...     Vedere agregată host-uri    ║")
+    print("║ • --metrics [host:]port           Endpoint Prometheus         ║")
+    print("╠═══════════════════════════════════════════════════════════════╣")
+    print("║ ÎNREGISTRARE:                                                 ║")
+    print("║ • --record fișier                 Înregistrează sesiunea      ║")
+    print("║ • --replay fișier                 Redă o înregistrare         ║")
+    print("║ • --alerts json:f,unix:s,syslog   Trimite detecțiile          ║")
+    print("╠═══════════════════════════════════════════════════════════════╣")
+    print("║ RESURSE:                                                      ║")
+    print("║ • --cpu-budget procent            Buget CPU (implicit 2%)     ║")
     print("╚═══════════════════════════════════════════════════════════════╝")
 
+def get_flag_value(flag):
+    """Valoarea unui argument `--flag valoare` sau `--flag=valoare` (None dacă lipsește)"""
+    args = sys.argv[1:]
+    for i, arg in enumerate(args):
+        if arg == flag and i + 1 < len(args):
+            return args[i + 1]
+        if arg.startswith(flag + '='):
+            return arg.split('=', 1)[1]
+    return None
+
+def apply_cpu_budget(monitor):
+    """Bugetul de CPU al monitorului din --cpu-budget (procent dintr-un nucleu)"""
+    value = get_flag_value('--cpu-budget')
+    if value is None:
+        return
+    try:
+        budget = float(value.rstrip('%'))
+        if budget <= 0:
+            raise ValueError(value)
+    except ValueError:
+        print(f"⚠️  --cpu-budget invalid: {value} (ex: --cpu-budget 2)")
+        return
+    monitor.scheduler.budget = budget / 100
+
+def run_remote_mode(agent_address, fleet_addresses, metrics_address=None, record_path=None, alert_specs=None):
+    """Mod agent (fără interfață, servește snapshot-uri) sau agregator (vedere flotă)"""
+    if not check_dependencies():
+        return 1
+    try:
+        if agent_address:
+            from core.monitor import SystemMonitor
+            from core.agent import run_agent
+            monitor = SystemMonitor()
+            apply_cpu_budget(monitor)
+            if metrics_address:
+                monitor.start_metrics(metrics_address)
+            if record_path:
+                monitor.start_recording(record_path)
+            if alert_specs:
+                monitor.start_alerts(alert_specs)
+            try:
+                run_agent(monitor, agent_address)
+            except KeyboardInterrupt:
+                print("\n👋 Agent oprit.")
+        else:
+            from core.fleet import FleetMonitor
+            addresses = [a.strip() for a in fleet_addresses.split(',') if a.strip()]
+            curses.wrapper(FleetMonitor(addresses).run)
+    except KeyboardInterrupt:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"❌ Eroare de rețea: {e}")
+        return 1
+    return 0
+
+def run_replay_mode(path):
+    """Redă o înregistrare făcută cu --record prin aceleași vederi de procese/log-uri"""
+    if not check_dependencies():
+        return 1
+    try:
+        from core.replay import ReplayMonitor
+        replay = ReplayMonitor(path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Înregistrarea nu poate fi deschisă: {e}")
+        return 1
+    try:
+        curses.wrapper(replay.run)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
 def main():
     """Funcția principală a aplicației"""
+    # --agent [host:]port|unix:/cale  sau  --fleet adresa1,adresa2,...
+    agent_address = get_flag_value('--agent')
+    fleet_addresses = get_flag_value('--fleet')
+    metrics_address = get_flag_value('--metrics')
+    record_path = get_flag_value('--record')
+    replay_path = get_flag_value('--replay')
+    alert_specs = get_flag_value('--alerts')
+    if replay_path:
+        return run_replay_mode(replay_path)
+    if agent_address or fleet_addresses:
+        return run_remote_mode(agent_address, fleet_addresses, metrics_address, record_path, alert_specs)
+
     try:
         print_welcome()
         
@@ -193,6 +290,26 @@ def main():
         # Inițializare și pornire monitor
         print("🔄 Inițializare monitor sistem...")
         monitor = SystemMonitor()
+        apply_cpu_budget(monitor)
+        metrics_address = get_flag_value('--metrics')
+        if metrics_address:
+            try:
+                monitor.start_metrics(metrics_address)
+                print(f"📊 Metrici Prometheus: http://{metrics_address}/metrics")
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Endpoint-ul de metrici nu a pornit: {e}")
+        if record_path:
+            try:
+                monitor.start_recording(record_path)
+                print(f"⏺  Înregistrare sesiune în: {record_path}")
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Înregistrarea nu a pornit: {e}")
+        if alert_specs:
+            try:
+                monitor.start_alerts(alert_specs)
+                print(f"🚨 Detecții trimise către: {alert_specs}")
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Destinațiile de alerte nu au pornit: {e}")
         
         # Pornire interfață curses
         print("🎯 Pornire interfață...")
@@ -208,6 +325,9 @@ def main():
             print("   2. Dimensiunea terminalului este suficientă (min 80x24)")
             print("   3. Nu rulezi în medii care nu suportă curses (ex: unele IDE)")
             return 1
+        finally:
+            # Și la Ctrl+C: alertele din cozi se livrează, indexul persistent se închide curat
+            monitor.shutdown()
             
     except KeyboardInterrupt:
         print("\n👋 Aplicația a fost oprită de utilizator.")
@@ -0,0 +1,155 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from core.log_entry import CATEGORY_ORDER
+from core.snapshot import parse_address
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _MetricsWriter:
+    """Accumulates samples in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self.lines = []
+
+    def metric(self, name, kind, help_text, samples):
+        """`samples` is a list of (labels dict or None, value)"""
+        self.lines.append(f'# HELP {name} {help_text}')
+        self.lines.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            if value is None:
+                continue
+            if labels:
+                label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                self.lines.append(f'{name}{{{label_text}}} {value}')
+            else:
+                self.lines.append(f'{name} {value}')
+
+    def render(self):
+        return ('\n'.join(self.lines) + '\n').encode('utf-8')
+
+
+def render_metrics(monitor, scrapes=0):
+    """Prometheus text for a monitor's cached state (no /proc access, no log scans)"""
+    stats = monitor.stats_sampler.stats
+    detector = monitor.detector
+    w = _MetricsWriter()
+
+    w.metric('monitor_cpu_percent', 'gauge', 'Total CPU utilization.', [(None, stats.get('cpu_percent'))])
+    w.metric('monitor_core_cpu_percent', 'gauge', 'Per-core CPU utilization.',
+             [({'core': i}, value) for i, value in enumerate(stats.get('per_core') or [])])
+    w.metric('monitor_cpu_state_percent', 'gauge', 'CPU time share by state.',
+             [({'state': state}, value) for state, value in (stats.get('cpu_breakdown') or {}).items()])
+    w.metric('monitor_memory_percent', 'gauge', 'Memory utilization.', [(None, stats.get('mem_percent'))])
+    w.metric('monitor_disk_percent', 'gauge', 'Root filesystem utilization.', [(None, stats.get('disk_percent'))])
+    w.metric('monitor_network_percent', 'gauge', 'Network throughput relative to the monitor scale.',
+             [(None, stats.get('net_percent'))])
+    w.metric('monitor_load_average', 'gauge', 'System load average.',
+             [({'period': period}, value) for period, value in zip(('1m', '5m', '15m'), stats.get('load_avg') or ())])
+
+    w.metric('monitor_processes', 'gauge', 'Processes on the host.', [(None, monitor.total_process_count)])
+    w.metric('monitor_processes_suspicious', 'gauge', 'Processes matching a detection rule.',
+             [(None, monitor.suspicious_count)])
+    rules = detector.process_rules
+    w.metric('monitor_process_rules', 'gauge', 'Process detection rules in effect, by source (file or defaults).',
+             [({'source': 'file' if rules.loaded_from else 'defaults', 'path': rules.path}, rules.rule_count)])
+    w.metric('monitor_process_rules_config_error', 'gauge',
+             'Whether the process rules file failed to load (the previous rules stay in effect).',
+             [({'error': rules.error} if rules.error else None, 1 if rules.error else 0)])
+
+    w.metric('monitor_findings_last_scan', 'gauge', 'Findings per category in the last log scan.',
+             [({'category': c}, detector.log_categories.get(c, 0)) for c in CATEGORY_ORDER])
+    w.metric('monitor_findings_retained', 'gauge', 'Findings held in the in-memory time index.',
+             [(None, len(detector.timeline))])
+    tracker = detector.rate_tracker
+    now = time.time()
+    w.metric('monitor_findings_window', 'gauge', f'Findings per category in the last {tracker.window}s.',
+             [({'category': c}, count) for c, count in tracker.category_rates(now).items()])
+    w.metric('monitor_rate_alerts_total', 'counter', 'Rate alerts raised.', [(None, tracker.alerts_raised)])
+
+    events = monitor.proc_events
+    w.metric('monitor_proc_events_total', 'counter', 'Process connector events handled.',
+             [({'event': kind}, count) for kind, count in events.stats.items()])
+
+    alerts = monitor.alerts
+    if alerts is not None:
+        w.metric('monitor_alerts_published_total', 'counter', 'Detections accepted by the alert pipeline.',
+                 [(None, alerts.published)])
+        w.metric('monitor_alerts_rate_limited_total', 'counter', 'Detections dropped by the alert rate limit.',
+                 [(None, alerts.rate_limited)])
+        for stat, help_text in (('sent', 'Alerts delivered to a sink.'),
+                                ('dropped', 'Alerts dropped because a sink queue was full.'),
+                                ('failed', 'Alerts lost to failed sink writes.')):
+            w.metric(f'monitor_alerts_{stat}_total', 'counter', help_text,
+                     [({'sink': worker.sink.name}, worker.stats[stat]) for worker in alerts.workers])
+
+    timings = monitor.timings
+    w.metric('monitor_stage_last_seconds', 'gauge', 'Duration of the last run of a collection stage.',
+             [({'stage': stage}, f'{t[0]:.6f}') for stage, t in timings.items()])
+    w.metric('monitor_stage_seconds_total', 'counter', 'Total time spent in a collection stage.',
+             [({'stage': stage}, f'{t[1]:.6f}') for stage, t in timings.items()])
+    w.metric('monitor_stage_runs_total', 'counter', 'Runs of a collection stage.',
+             [({'stage': stage}, t[2]) for stage, t in timings.items()])
+
+    w.metric('monitor_metrics_scrapes_total', 'counter', 'Scrapes served by this endpoint.', [(None, scrapes)])
+    w.metric('monitor_metrics_generated_timestamp_seconds', 'gauge', 'When this page was rendered.',
+             [(None, f'{now:.3f}')])
+    return w.render()
+
+
+class MetricsExporter:
+    """HTTP /metrics endpoint served from a pre-rendered page
+
+    The monitor loop re-renders the page at most every `min_interval`
+    seconds; scrape threads only hand out the cached bytes, so scrape
+    frequency has no effect on the collectors.
+    """
+
+    def __init__(self, address, min_interval=1.0):
+        family, sockaddr = parse_address(address)
+        if family != socket.AF_INET:
+            raise ValueError('endpoint-ul de metrici necesită [host:]port')
+        self.address = address
+        self.min_interval = min_interval
+        self.scrapes = 0
+        self._page = b''
+        self._last_render = 0
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = exporter._page  # Referința se schimbă atomic; nu e nevoie de lock
+                exporter.scrapes += 1
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Fără zgomot pe terminalul curses
+
+        self._server = ThreadingHTTPServer(sockaddr, Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics', daemon=True)
+        self._thread.start()
+
+    def update(self, monitor, force=False):
+        """Re-render the cached page if it is older than `min_interval`"""
+        now = time.time()
+        if force or now - self._last_render >= self.min_interval:
+            self._page = render_metrics(monitor, self.scrapes)
+            self._last_render = now
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -3,16 +3,37 @@ import time
 import psutil
 import gc
 from datetime import datetime
+from operator import attrgetter
+import sqlite3
 from core.detector import SuspiciousActivityDetector
-from ui.utils import init_colors, draw_system_stats
-from ui.process_view import draw_process_list, select_process, deselect_process, handle_process_navigation, collect_processes_with_cpu
-from ui.log_view import draw_suspicious_logs
+from core.log_store import LogStore
+from core.socket_index import SocketIndex
+from core.ngram_index import MIN_QUERY_LENGTH
+from core.stats_sampler import SystemStatsSampler
+from core.proc_events import ProcEventListener
+from core.cgroup_index import CgroupIndex
+from core.process_filter import ProcessFilter
+from core.thread_sampler import ThreadSampler
+from core.detail_fetcher import DetailFetcher
+from core.scheduler import AdaptiveScheduler
+from ui.utils import init_colors, draw_system_stats, handle_text_input
+from ui.process_view import draw_process_list, select_process, deselect_process, handle_process_navigation, collect_processes_with_cpu, draw_cgroup_list, filter_cgroup_processes, sort_cgroup_groups, sort_processes, process_rank
+from ui.log_view import draw_suspicious_logs, LOG_TIME_WINDOWS
 
 class SystemMonitor:
     def __init__(self):
-        self.detector = SuspiciousActivityDetector()
+        try:
+            self.log_store = LogStore()
+        except (sqlite3.Error, OSError):
+            self.log_store = None  # Fără index persistent: doar memorie
+        self.detector = SuspiciousActivityDetector(store=self.log_store)
+        self.socket_index = SocketIndex()
+        self.stats_sampler = SystemStatsSampler()
+        # Evenimente exec/exit din kernel (root); fără ele rămâne doar polling-ul
+        self.proc_events = ProcEventListener(self.detector.match_process)
         self.current_tab = 0
         self.show_only_suspicious = False
+        self.show_only_network = False
         self.suspicious_logs = []
         self.log_scroll_offset = 0
         self.process_scroll_offset = 0
@@ -22,16 +43,92 @@ class SystemMonitor:
         self.sort_by = 'cpu'
         self.sort_reverse = True
         self.log_filter = 'ALL'
+        self.log_time_window = None
+        self.log_search_query = ''
+        self.log_search_typing = False
+        self.log_grouped = False  # Vedere pe șabloane de mesaje în loc de linii individuale
+        self._log_search_cache = None  # (query, index version, ids, entries newest-first)
         self.show_full_process_info = True
+        self.cgroup_index = CgroupIndex()
+        self.process_grouped = False  # Vedere pe cgroup / unitate systemd / container
+        self.cgroup_filter = None     # Calea grupului deschis (drill-down)
+        self.cgroup_selected_index = 0
+        self.cgroup_scroll_offset = 0
+        self.process_filter = None  # ProcessFilter compilat din textul introdus cu /
+        self.process_filter_text = ''
+        self.process_filter_typing = False
+        self.process_filter_error = None
+        self.thread_sampler = ThreadSampler()
+        self.thread_view = False  # Panoul de thread-uri în locul celui cu procese copil
+        self.detail_fetcher = DetailFetcher()  # Fișiere/socket-uri/copii ai procesului selectat, în fundal
         self.show_help = False
         self.processes_cache = []
+        self.suspicious_count = 0
+        self.total_process_count = 0
         self.last_process_refresh = 0
-        self.process_refresh_interval = 1.5
+        # Intervalele de colectare se adaptează costului măsurat (main.py --cpu-budget)
+        self.scheduler = AdaptiveScheduler()
+        self.scheduler.add('processes', 1.5, 0.5, 15.0, weight=3)
+        self.scheduler.add('logs', 30.0, 10.0, 300.0)
         self.last_gc_run = 0
         self.last_cpu_measurement = 0  # Track last CPU measurement time
+        self.io_cache = {}  # pid -> (read_bytes, write_bytes, timestamp, read/s, write/s)
+        self.timings = {}  # etapă -> [ultima durată, durată totală, rulări]
+        self.metrics = None  # Endpoint Prometheus opțional (main.py --metrics)
+        self.recorder = None  # Înregistrare a sesiunii (main.py --record)
+        self.alerts = None  # Destinații pentru detecții (main.py --alerts)
+        self._alerted_processes = {}  # pid -> create_time al procesului deja raportat
+        self.matched_processes = []  # Toate procesele care se potrivesc unei reguli (doar cu alertele active)
+        self._shut_down = False
+
+    def record_timing(self, stage, started):
+        """Record how long a collection stage took (since perf_counter value `started`)"""
+        elapsed = time.perf_counter() - started
+        timing = self.timings.get(stage)
+        if timing is None:
+            self.timings[stage] = [elapsed, elapsed, 1]
+        else:
+            timing[0] = elapsed
+            timing[1] += elapsed
+            timing[2] += 1
+
+    def start_metrics(self, address):
+        from core.metrics import MetricsExporter
+        self.metrics = MetricsExporter(address)
+
+    def start_recording(self, path):
+        from core.recorder import SessionRecorder
+        self.recorder = SessionRecorder(path)
+
+    def start_alerts(self, specs):
+        from core.alert_sinks import AlertPipeline, parse_sink
+        sinks = []
+        try:
+            for spec in specs.split(','):
+                if spec.strip():
+                    sinks.append(parse_sink(spec.strip()))
+        except (OSError, ValueError):
+            for sink in sinks:
+                sink.close()
+            raise
+        self.alerts = AlertPipeline(sinks)
+        self.detector.alerts = self.alerts
+
+    def publish_process_alerts(self, infos, origin):
+        """Send suspicious processes not reported before (pid + create_time) to the alert sinks"""
+        from core.alert_sinks import process_alert
+        alerted = self._alerted_processes
+        for info in infos:
+            create_time = info.get('create_time') or 0
+            if alerted.get(info['pid']) == create_time:
+                continue
+            alerted[info['pid']] = create_time
+            self.alerts.publish(process_alert(info, origin))
 
     def refresh_logs(self, force_full=False):
         """Refresh logs without resetting cache on partial scans"""
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
         # Only reset seen logs on full scan
         if force_full:
             self.detector.seen_logs.clear()
@@ -39,6 +136,12 @@ class SystemMonitor:
         self.suspicious_logs = self.detector.scan_logs(force_full_scan=force_full)
         self.log_scroll_offset = 0
         self.last_log_scan = time.time()
+        self.record_timing('logs', started)
+        self.scheduler.record('logs', time.thread_time() - cpu_started)
+
+    def logs_due(self, hidden=False):
+        """Whether the adaptive log scan interval has elapsed"""
+        return time.time() - self.last_log_scan > self.scheduler.interval('logs', hidden)
 
     def clear_log_cache(self):
         self.detector.seen_logs.clear()
@@ -51,12 +154,92 @@ class SystemMonitor:
         self.log_filter = filters[(current_index + 1) % len(filters)]
         self.log_scroll_offset = 0
 
-    def refresh_processes(self, force=False):
-        """Refresh process list with frequency control"""
+    def get_log_search_results(self):
+        """Entries matching the search query, newest first; narrows the previous result while typing"""
+        query = self.log_search_query
+        index = self.detector.search_index
+        if len(query) < MIN_QUERY_LENGTH:
+            return self.detector.log_cache
+        cache = self._log_search_cache
+        if cache is not None and cache[0] == query and cache[1] == index.version:
+            return cache[3]
+
+        candidates = None
+        if (cache is not None and cache[1] == index.version and cache[0]
+                and query.lower().startswith(cache[0].lower())):
+            candidates = cache[2]
+        ids = self.detector.search(query, candidates)
+        entries = sorted(index.entries(ids), key=attrgetter('ts'), reverse=True)
+        self._log_search_cache = (query, index.version, ids, entries)
+        return entries
+
+    def handle_log_search_key(self, key):
+        self.log_search_query, state = handle_text_input(self.log_search_query, key)
+        if state == 'cancel':
+            self.log_search_query = ''
+            self.log_search_typing = False
+        elif state == 'done':
+            self.log_search_typing = False
+        self.log_scroll_offset = 0
+
+    def handle_process_filter_key(self, key):
+        """Edit the process filter; ENTER compiles and applies it on a fresh collection"""
+        self.process_filter_text, state = handle_text_input(self.process_filter_text, key)
+        if state == 'edit':
+            return
+        if state == 'cancel':
+            self.process_filter_text = ''
+            self.process_filter = None
+            self.process_filter_error = None
+        else:
+            try:
+                text = self.process_filter_text.strip()
+                self.process_filter = ProcessFilter(text) if text else None
+            except ValueError as e:
+                # Expresie invalidă: câmpul rămâne deschis, filtrul anterior rămâne activ
+                self.process_filter_error = str(e)
+                return
+            self.process_filter_error = None
+        self.process_filter_typing = False
+        deselect_process(self)
+        self.process_scroll_offset = 0
+        self.refresh_processes(force=True)
+
+    def toggle_history_scan(self):
+        scanner = self.detector.history_scanner
+        if scanner is not None and scanner.running:
+            self.detector.stop_history_scan()
+        else:
+            self.detector.start_history_scan()
+
+    def cycle_log_time_window(self):
+        current_index = LOG_TIME_WINDOWS.index(self.log_time_window) if self.log_time_window in LOG_TIME_WINDOWS else 0
+        self.log_time_window = LOG_TIME_WINDOWS[(current_index + 1) % len(LOG_TIME_WINDOWS)]
+        self.log_scroll_offset = 0
+
+    def refresh_processes(self, force=False, hidden=False):
+        """Refresh process list with frequency control (adaptive interval, longer while hidden)"""
         current_time = time.time()
-        if force or current_time - self.last_process_refresh > self.process_refresh_interval:
-            self.processes_cache, _ = collect_processes_with_cpu(self)
+        if force or current_time - self.last_process_refresh > self.scheduler.interval('processes', hidden):
+            started = time.perf_counter()
+            cpu_started = time.thread_time()
+            # Un singur parse /proc/net per ciclu, partajat de filtru și de panouri
+            self.socket_index.refresh()
+            self.record_timing('sockets', started)
+            # Etapele nu se suprapun: 'processes' nu include parsarea socket-urilor
+            started = time.perf_counter()
+            self.processes_cache, self.suspicious_count = collect_processes_with_cpu(self)
+            if self.alerts is not None:
+                # Potrivirile vin de pe toate procesele, nu din lista filtrată a vederii
+                self.publish_process_alerts(self.matched_processes, 'poll')
+                live = self.cpu_times_cache
+                self._alerted_processes = {pid: ct for pid, ct in self._alerted_processes.items() if pid in live}
+            self.stats_sampler.set_process_count(self.total_process_count)
             self.last_process_refresh = current_time
+            if self.process_grouped:
+                self.cgroup_index.update(self.processes_cache)
+            self.record_timing('processes', started)
+            self.scheduler.record('processes', time.thread_time() - cpu_started)
             
             # Periodic garbage collection
             if current_time - self.last_gc_run > 30:
@@ -66,17 +249,77 @@ class SystemMonitor:
             return True
         return False
 
-    def get_current_processes(self):
-        """Return current process list, sorted according to settings"""
-        sort_key = 'cpu_percent' if self.sort_by == 'cpu' else 'memory_percent'
-        sorted_processes = sorted(self.processes_cache, 
-                                key=lambda x: x[2].get(sort_key, 0), 
-                                reverse=self.sort_reverse)
-        return sorted_processes
+    def apply_process_events(self):
+        """Apply queued exec/exit events to the process snapshot between polls"""
+        events = self.proc_events.drain()
+        if self.proc_events.resync_needed:
+            # Evenimente pierdute: snapshot-ul incremental nu mai e de încredere
+            self.proc_events.resync_needed = False
+            self.refresh_processes(force=True)
+            return
+        if not events:
+            return
+
+        positions = {entry[2]['pid']: i for i, entry in enumerate(self.processes_cache)}
+        exited = set()
+        added = {}
+        alerts = []
+        for kind, pid, info in events:
+            if kind == 'exit':
+                exited.add(pid)
+                added.pop(pid, None)
+                continue
+            exited.discard(pid)
+            if info.get('rule'):
+                alerts.append(info)
+            if pid in positions:
+                # exec într-un proces existent: programul (și verdictul) s-au schimbat
+                proc, _, old_info = self.processes_cache[positions[pid]]
+                old_info.update(name=info['name'], cmdline=info['cmdline'])
+                old_info.pop('rule', None)
+                if info.get('rule'):
+                    old_info['rule'] = info['rule']
+                self.processes_cache[positions[pid]] = (proc, bool(info.get('rule')), old_info)
+            elif (not self.show_only_network and (info.get('rule') or not self.show_only_suspicious)
+                    and (self.process_filter is None or self.process_filter.matches(info))):
+                added[pid] = info
+
+        for pid, info in added.items():
+            try:
+                self.processes_cache.append((psutil.Process(pid), bool(info.get('rule')), info))
+            except psutil.NoSuchProcess:
+                pass
+        if exited:
+            self.processes_cache = [entry for entry in self.processes_cache if entry[2]['pid'] not in exited]
+        self.total_process_count += len(added) - len(exited & positions.keys())
+        self.suspicious_count = sum(1 for entry in self.processes_cache if entry[1])
+        if self.process_grouped:
+            self.cgroup_index.update(self.processes_cache)
+
+        if alerts:
+            # Procesele scurte prinse la exec rămân vizibile în tab-ul de log-uri
+            self.detector.record_process_alerts(alerts)
+            if self.alerts is not None:
+                self.publish_process_alerts(alerts, 'exec')
+            self.suspicious_logs = self.detector.log_cache
+
+    def get_current_processes(self, limit=None):
+        """Return current process list, sorted according to settings (only the first `limit` if given)"""
+        return sort_processes(filter_cgroup_processes(self, self.processes_cache),
+                              self.sort_by, self.sort_reverse, limit)
+
+    def update_selected_index(self):
+        """Keep the selected process index in sync after a sort change (one pass, no full sort)"""
+        if self.selected_process_pid:
+            rank = process_rank(filter_cgroup_processes(self, self.processes_cache),
+                                self.selected_process_pid, self.sort_by, self.sort_reverse)
+            if rank is not None:
+                self.selected_process_index = rank
 
     def handle_process_selection_keys(self, key):
         """Handle keys for process selection"""
-        current_processes = self.get_current_processes()
+        # Navigarea are nevoie doar de procesele până la vecinul celui selectat
+        current_processes = self.get_current_processes((self.selected_process_index or 0) + 2)
         
         if key == curses.KEY_UP:
             handle_process_navigation(self, current_processes, curses.KEY_UP)
@@ -90,41 +333,73 @@ class SystemMonitor:
                 if current_processes:
                     select_process(self, 0, current_processes)
 
+    def toggle_thread_view(self):
+        self.thread_view = not self.thread_view
+        if self.thread_view and self.selected_process_pid:
+            self.thread_sampler.sample(self.selected_process_pid, force=True)
+        elif not self.thread_view:
+            self.thread_sampler.reset()
+
+    def toggle_process_grouping(self):
+        self.process_grouped = not self.process_grouped
+        self.cgroup_filter = None
+        self.cgroup_selected_index = 0
+        self.cgroup_scroll_offset = 0
+        deselect_process(self)
+        self.process_scroll_offset = 0
+        if self.process_grouped:
+            self.cgroup_index.update(self.processes_cache)
+
+    def handle_cgroup_keys(self, key):
+        """Navigation in the cgroup view and drill-down into a group"""
+        if self.cgroup_filter is not None:
+            # În interiorul unui grup: ←/BACKSPACE revine la lista de grupuri
+            if key in [curses.KEY_LEFT, curses.KEY_BACKSPACE, 127]:
+                self.cgroup_filter = None
+                deselect_process(self)
+                self.process_scroll_offset = 0
+                return True
+            return False
+        if key == curses.KEY_UP:
+            self.cgroup_selected_index = max(0, self.cgroup_selected_index - 1)
+        elif key == curses.KEY_DOWN:
+            self.cgroup_selected_index += 1
+        elif key == ord('\n'):
+            groups = sort_cgroup_groups(self)
+            if groups:
+                index = min(self.cgroup_selected_index, len(groups) - 1)
+                self.cgroup_filter = groups[index].path
+                self.process_scroll_offset = 0
+        else:
+            return False
+        return True
+
     def handle_process_sorting_keys(self, key):
         """Handle keys for process sorting"""
         if key in [ord('c'), ord('C')]:
             self.sort_by = 'cpu'
             # Keep selected process after sort change
-            if self.selected_process_pid:
-                current_processes = self.get_current_processes()
-                for idx, (proc, is_susp, info) in enumerate(current_processes):
-                    if info.get('pid') == self.selected_process_pid:
-                        self.selected_process_index = idx
-                        break
+            self.update_selected_index()
         elif key in [ord('m'), ord('M')]:
             self.sort_by = 'memory'
             # Keep selected process after sort change
-            if self.selected_process_pid:
-                current_processes = self.get_current_processes()
-                for idx, (proc, is_susp, info) in enumerate(current_processes):
-                    if info.get('pid') == self.selected_process_pid:
-                        self.selected_process_index = idx
-                        break
+            self.update_selected_index()
+        elif key in [ord('i'), ord('I')]:
+            self.sort_by = 'io'
+            # Primul eșantion pentru toate procesele; ratele apar de la refresh-ul următor
+            self.refresh_processes(force=True)
+            # Keep selected process after sort change
+            self.update_selected_index()
         elif key in [ord('r'), ord('R')]:
             self.sort_reverse = not self.sort_reverse
             # Keep selected process after sort reversal
-            if self.selected_process_pid:
-                current_processes = self.get_current_processes()
-                for idx, (proc, is_susp, info) in enumerate(current_processes):
-                    if info.get('pid') == self.selected_process_pid:
-                        self.selected_process_index = idx
-                        break
+            self.update_selected_index()
 
     def draw_help_overlay(self, stdscr, height, width):
         """Display help overlay"""
         try:
             # Calculate help window dimensions
-            help_height = min(22, height - 4)
+            help_height = min(33, height - 4)
             help_width = min(75, width - 4)
             start_y = (height - help_height) // 2
             start_x = (width - help_width) // 2
@@ -150,18 +425,29 @@ class SystemMonitor:
                 "  ↑/↓          - Navighează prin lista de procese",
                 "  ENTER        - Selectează/deselectează proces",
                 "  S            - Comută afișarea doar a proceselor suspicioase",
+                "  N            - Comută afișarea doar a proceselor cu activitate de rețea",
                 "  C            - Sortează după utilizarea CPU",
                 "  M            - Sortează după utilizarea memoriei",
+                "  I            - Sortează după I/O pe disc (citire + scriere/s)",
                 "  R            - Inversează ordinea de sortare",
                 "  P            - Comută afișarea informațiilor detaliate",
+                "  T            - Thread-urile procesului selectat (CPU% per thread)",
+                "  /            - Filtru (ex: user=postgres cpu>5 name~worker exe!~/usr/)",
+                "  G            - Grupează pe cgroup (unitate systemd / container)",
+                "  ←/BACKSPACE  - Din procesele unui grup înapoi la grupuri",
                 "  F5           - Reîmprospătează lista de procese manual",
+                "  *            - (lângă stare) procesul are găsiri în log-uri",
                 "",
                 "TAB LOG-URI:",
                 "  ↑/↓          - Navighează prin log-uri",
                 "  F            - Ciclează prin filtrele de log-uri",
+                "  T            - Ciclează intervalul de timp (tot/5m/1h/24h)",
+                "  /            - Căutare incrementală (ENTER păstrează, ESC anulează)",
                 "  Shift+F      - Reîmprospătează log-urile (scan complet)",
                 "  R            - Reîmprospătează log-urile (scan rapid)",
                 "  D            - Șterge cache-ul de log-uri",
+                "  A            - Pornește/oprește scanarea arhivelor rotite (.1, .gz, .xz)",
+                "  G            - Grupează log-urile pe șabloane de mesaje",
                 "",
                 "NOTĂ: Procesul selectat rămâne fix chiar dacă lista se reordonează.",
                 "",
@@ -190,33 +476,79 @@ class SystemMonitor:
         except curses.error:
             pass
 
+    def shutdown(self):
+        """Stop background workers and flush the persistent index (once; later calls do nothing)"""
+        if self._shut_down:
+            return
+        self._shut_down = True
+        self.detector.stop_history_scan()
+        self.proc_events.stop()
+        self.detail_fetcher.close()
+        if self.metrics is not None:
+            self.metrics.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.alerts is not None:
+            self.alerts.close()
+        if self.log_store is not None:
+            try:
+                self.log_store.close()
+            except sqlite3.Error:
+                pass
+
     def run(self, stdscr):
         init_colors()
         curses.curs_set(0)
         stdscr.nodelay(1)
         stdscr.timeout(1000)
-        self.refresh_logs(force_full=True)  # Initial full scan
+        # Startup from the persistent index; full scan only when it is empty
+        if self.detector.load_from_store():
+            self.refresh_logs(force_full=False)
+        else:
+            self.refresh_logs(force_full=True)
+        self.proc_events.start()
         self.refresh_processes(force=True)
 
         while True:
             height, width = stdscr.getmaxyx()
             stdscr.clear()
 
-            # Refresh logs periodically but keep existing entries
-            if self.current_tab == 1 and time.time() - self.last_log_scan > 30:
+            # Refresh logs periodically but keep existing entries (always while recording or alerting)
+            recording = self.recorder is not None
+            background = recording or self.alerts is not None
+            self.scheduler.update(self.detector.worker_cpu())
+            if (self.current_tab == 1 or background) and self.logs_due(hidden=self.current_tab != 1):
                 self.refresh_logs(force_full=False)
+            elif self.current_tab == 1 and self.detector.collect_history():
+                self.suspicious_logs = self.detector.log_cache
 
-            # Refresh processes
-            if self.current_tab == 0:
-                self.refresh_processes()
+            # Refresh processes (events between polls, full poll on its interval)
+            self.apply_process_events()
+            if self.current_tab == 0 or background:
+                self.refresh_processes(hidden=self.current_tab != 0)
+            # Thread-urile se citesc doar cât timp panoul lor e deschis
+            if self.thread_view and self.current_tab == 0 and self.selected_process_pid:
+                self.thread_sampler.sample(self.selected_process_pid)
 
-            # Draw system stats
-            draw_system_stats(stdscr)
+            # Draw system stats (I/O only for metrics whose cadence elapsed)
+            started = time.perf_counter()
+            self.stats_sampler.tick()
+            self.record_timing('stats', started)
+            if self.metrics is not None:
+                self.metrics.update(self)
+            if recording:
+                self.recorder.maybe_record(self)
+            
+            started = time.perf_counter()
+            draw_system_stats(stdscr, self.stats_sampler.stats)
 
             # Draw current tab content
             if not self.show_help:
                 if self.current_tab == 0:
-                    draw_process_list(stdscr, height, width, self)
+                    if self.process_grouped and self.cgroup_filter is None:
+                        draw_cgroup_list(stdscr, height, width, self)
+                    else:
+                        draw_process_list(stdscr, height, width, self)
                 elif self.current_tab == 1:
                     draw_suspicious_logs(stdscr, height, width, self)
 
@@ -228,28 +560,68 @@ class SystemMonitor:
                     f"Tab: {tab_name}",
                 ]
                 
+                rules_error = None
                 if self.current_tab == 0:
+                    # Sursa regulilor active; o eroare de reîncărcare rămâne vizibilă până la corectare
+                    rules = self.detector.process_rules
+                    rules_error = rules.error
+                    if rules_error:
+                        status_parts.append(f"REGULI: process_rules.json invalid ({rules_error}), "
+                                            f"active: {'fișier anterior' if rules.loaded_from else 'implicite'}")
+                    else:
+                        status_parts.append(f"Reguli: {'fișier' if rules.loaded_from else 'implicite'} ({rules.rule_count})")
                     if self.selected_process_pid:
                         status_parts.append(f"PID selectat: {self.selected_process_pid}")
                     status_parts.append(f"Sortare: {self.sort_by.upper()}")
                     if self.show_only_suspicious:
                         status_parts.append("DOAR SUSPICIOASE")
+                    if self.show_only_network:
+                        status_parts.append("DOAR REȚEA")
+                    if self.process_filter is not None:
+                        status_parts.append(f"Filtru: {self.process_filter.text}")
+                    if self.process_grouped:
+                        status_parts.append(f"Grupuri cgroup: {len(self.cgroup_index.groups)}")
+                    if self.proc_events.running:
+                        status_parts.append(f"Exec: {self.proc_events.stats['exec']}")
                 
+                scheduler = self.scheduler
+                status_parts.append(f"Refresh proc/log: {scheduler.interval('processes', self.current_tab != 0):.1f}s/"
+                                    f"{scheduler.interval('logs', self.current_tab != 1):.0f}s")
+                status_parts.append(f"CPU propriu: {scheduler.cpu_percent:.1f}%/{scheduler.budget * 100:g}%")
+                if self.alerts is not None:
+                    status_parts.append(f"Alerte: {self.alerts.sent()} trimise/{self.alerts.dropped()} pierdute")
+                if recording:
+                    status_parts.append(f"REC {self.recorder.bytes_written / (1024 * 1024):.1f}M")
                 status_parts.append("H=Ajutor")
                 status = " | ".join(status_parts)
                 
                 try:
-                    stdscr.addstr(height - 2, 2, status[:width-4], curses.A_DIM)
+                    stdscr.addstr(height - 2, 2, status[:width-4],
+                                  curses.color_pair(3) | curses.A_BOLD if rules_error else curses.A_DIM)
                 except curses.error:
                     pass
             else:
                 self.draw_help_overlay(stdscr, height, width)
+            self.record_timing('draw', started)
 
             stdscr.refresh()
+            # Redesenare mai rapidă cât timp detaliile procesului selectat se încarcă
+            if self.selected_process_pid and self.detail_fetcher.pending:
+                stdscr.timeout(200)
+            elif self.current_tab == 0:
+                # Sub o secundă când procesele sunt ieftine de colectat
+                stdscr.timeout(min(1000, int(self.scheduler.interval('processes') * 1000)))
+            else:
+                stdscr.timeout(1000)
             key = stdscr.getch()
 
             # Key handling
-            if key in [ord('q'), ord('Q'), 27]:
+            if self.current_tab == 1 and self.log_search_typing and key != -1:
+                self.handle_log_search_key(key)
+            elif self.current_tab == 0 and self.process_filter_typing and key != -1:
+                self.handle_process_filter_key(key)
+            elif key in [ord('q'), ord('Q'), 27]:
+                self.shutdown()
                 break
             elif key in [ord('h'), ord('H')]:
                 self.show_help = not self.show_help
@@ -263,15 +635,28 @@ class SystemMonitor:
                 if self.current_tab == 0:
                     self.refresh_processes(force=True)
             elif self.current_tab == 0:
-                if key in [curses.KEY_UP, curses.KEY_DOWN, ord('\n')]:
+                if self.process_grouped and self.handle_cgroup_keys(key):
+                    pass
+                elif key in [ord('g'), ord('G')]:
+                    self.toggle_process_grouping()
+                elif key == ord('/'):
+                    self.process_filter_typing = True
+                elif key in [ord('t'), ord('T')]:
+                    self.toggle_thread_view()
+                elif key in [curses.KEY_UP, curses.KEY_DOWN, ord('\n')]:
                     self.handle_process_selection_keys(key)
-                elif key in [ord('c'), ord('C'), ord('m'), ord('M'), ord('r'), ord('R')]:
+                elif key in [ord('c'), ord('C'), ord('m'), ord('M'), ord('i'), ord('I'), ord('r'), ord('R')]:
                     self.handle_process_sorting_keys(key)
                 elif key in [ord('s'), ord('S')]:
                     self.show_only_suspicious = not self.show_only_suspicious
                     deselect_process(self)
                     self.process_scroll_offset = 0
                     self.refresh_processes(force=True)
+                elif key in [ord('n'), ord('N')]:
+                    self.show_only_network = not self.show_only_network
+                    deselect_process(self)
+                    self.process_scroll_offset = 0
+                    self.refresh_processes(force=True)
                 elif key in [ord('p'), ord('P')]:
                     self.show_full_process_info = not self.show_full_process_info
             elif self.current_tab == 1:
@@ -286,8 +671,19 @@ class SystemMonitor:
                         self.refresh_logs(force_full=True)
                     else:
                         self.cycle_log_filter()
+                elif key in [ord('t'), ord('T')]:
+                    self.cycle_log_time_window()
+                elif key == ord('/'):
+                    self.log_search_typing = True
+                    self.log_scroll_offset = 0
+                elif key in [ord('a'), ord('A')]:
+                    self.toggle_history_scan()
+                elif key in [ord('g'), ord('G')]:
+                    self.log_grouped = not self.log_grouped
+                    self.log_scroll_offset = 0
                 elif key in [ord('d'), ord('D')]:
                     self.detector.seen_logs.clear()  # Clear cache but keep current logs
+                    self.detector.file_offsets.clear()
 
             time.sleep(0.05)
    
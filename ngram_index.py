@@ -0,0 +1,106 @@
+from array import array
+
+# Sub această lungime o interogare nu poate folosi indexul (ar fi o scanare liniară)
+MIN_QUERY_LENGTH = 3
+
+
+def trigrams(text):
+    """Distinct trigrams of a string, case-folded"""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Trigram index over retained log entries for substring search
+
+    Posting lists are compact `array('I')` of document ids. Documents are the
+    entries themselves: trigrams come from the first `max_text` characters of
+    `entry.line`, case-folded while indexing and while verifying a match, so
+    no lower-cased copy of the line is kept. Removed documents are dropped
+    from `_docs` right away and purged from the posting lists by a periodic
+    rebuild, so eviction stays O(1).
+    """
+
+    def __init__(self, max_text=500):
+        self.max_text = max_text
+        self._postings = {}
+        self._docs = {}       # doc_id -> entry
+        self._removed = 0
+        self.version = 0      # Crește la fiecare modificare; invalidează rezultatele memorate
+
+    def __len__(self):
+        return len(self._docs)
+
+    def clear(self):
+        self._postings = {}
+        self._docs = {}
+        self._removed = 0
+        self.version += 1
+
+    def add(self, doc_id, entry):
+        self._docs[doc_id] = entry
+        postings = self._postings
+        for gram in trigrams(entry.line[:self.max_text]):
+            plist = postings.get(gram)
+            if plist is None:
+                postings[gram] = plist = array('I')
+            plist.append(doc_id)
+        self.version += 1
+
+    def remove(self, doc_id):
+        if self._docs.pop(doc_id, None) is not None:
+            self._removed += 1
+            self.version += 1
+            if self._removed > max(1024, len(self._docs)):
+                self._rebuild()
+
+    def _rebuild(self):
+        """Drop ids of removed documents from every posting list"""
+        postings = {}
+        max_text = self.max_text
+        for doc_id in sorted(self._docs):
+            for gram in trigrams(self._docs[doc_id].line[:max_text]):
+                plist = postings.get(gram)
+                if plist is None:
+                    postings[gram] = plist = array('I')
+                plist.append(doc_id)
+        self._postings = postings
+        self._removed = 0
+
+    def search(self, query, candidates=None):
+        """Return the ids of documents containing `query` (case-insensitive)
+
+        `candidates` narrows the search to a previous result set; this is what
+        makes typing one more character cheap.
+        """
+        query = query.lower()
+        docs = self._docs
+        if not query:
+            return list(docs) if candidates is None else list(candidates)
+
+        if len(query) >= 3:
+            # Lista cea mai scurtă dintre trigramele interogării dă candidații
+            shortest = None
+            for gram in trigrams(query):
+                plist = self._postings.get(gram)
+                if plist is None:
+                    return []
+                if shortest is None or len(plist) < len(shortest):
+                    shortest = plist
+            # Rezultatul anterior (prefix al interogării) poate fi și mai restrâns
+            if candidates is None or len(shortest) < len(candidates):
+                candidates = shortest
+        elif candidates is None:
+            candidates = docs
+
+        result = []
+        max_text = self.max_text
+        for doc_id in candidates:
+            entry = docs.get(doc_id)
+            if entry is not None and query in entry.line[:max_text].lower():
+                result.append(doc_id)
+        return result
+
+    def entries(self, doc_ids):
+        docs = self._docs
+        return [docs[i] for i in doc_ids if i in docs]
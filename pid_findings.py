@@ -0,0 +1,82 @@
+import re
+from operator import attrgetter
+
+# `host nume[pid]:` în syslog; journalctl -o short-iso afișează la fel _PID-ul intrării
+_SYSLOG_PID_RE = re.compile(r'\s[^\s\[\]:]+\[(\d+)\]:\s')
+# Prefixul (timestamp, host, program) încape în primele caractere ale liniei
+PREFIX_LENGTH = 160
+
+# Găsiri păstrate per pid (cele mai recente)
+MAX_PER_PID = 50
+
+
+def extract_pid(line):
+    """PID from a syslog/journal `name[pid]:` prefix, None when the line has none"""
+    match = _SYSLOG_PID_RE.search(line, 0, PREFIX_LENGTH)
+    return int(match.group(1)) if match else None
+
+
+class PidFindingIndex:
+    """pid -> recent findings, kept in step with the detector's timeline
+
+    Entries are added and evicted together with the timeline, so looking up
+    a process's findings (or whether it has any) is a dict access rather
+    than a pass over log_cache. A pid may have been reused: callers pass the
+    process create_time as `since` to ignore findings of an older process.
+    """
+
+    def __init__(self, max_per_pid=MAX_PER_PID):
+        self.max_per_pid = max_per_pid
+        self._by_pid = {}  # pid -> intrări ordonate după ts
+
+    def __len__(self):
+        return len(self._by_pid)
+
+    def add(self, entry):
+        if entry.pid is None:
+            return
+        entries = self._by_pid.get(entry.pid)
+        if entries is None:
+            self._by_pid[entry.pid] = [entry]
+            return
+        entries.append(entry)
+        # Loturile vin sortate, dar arhivele (mai vechi) pot ajunge după intrările live
+        if entries[-2].ts > entry.ts:
+            entries.sort(key=attrgetter('ts'))
+        if len(entries) > self.max_per_pid:
+            del entries[0]
+
+    def remove(self, entry):
+        entries = self._by_pid.get(entry.pid)
+        if not entries:
+            return
+        if entries[0] is entry:
+            del entries[0]
+        else:
+            for i, candidate in enumerate(entries):
+                if candidate is entry:
+                    del entries[i]
+                    break
+        if not entries:
+            del self._by_pid[entry.pid]
+
+    def clear(self):
+        self._by_pid.clear()
+
+    def has_findings(self, pid, since=None):
+        entries = self._by_pid.get(pid)
+        return bool(entries) and (since is None or entries[-1].ts >= since)
+
+    def findings(self, pid, since=None, limit=None):
+        """Findings of `pid` newer than `since`, newest first"""
+        entries = self._by_pid.get(pid)
+        if not entries:
+            return []
+        result = []
+        for entry in reversed(entries):
+            if since is not None and entry.ts < since:
+                break
+            result.append(entry)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
@@ -0,0 +1,235 @@
+import errno
+import os
+import pwd
+import queue
+import socket
+import struct
+import threading
+
+# Linux proc connector (CN_PROC) peste netlink; vezi include/uapi/linux/cn_proc.h
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+NLMSG_DONE = 3
+
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+
+_NLMSGHDR = struct.Struct('=IHHII')      # len, type, flags, seq, pid
+_CN_MSG = struct.Struct('=IIIIHH')       # idx, val, seq, ack, len, flags
+_EVENT_HEADER = struct.Struct('=IIQ')    # what, cpu, timestamp_ns
+_PID_PAIR = struct.Struct('=II')         # pid, tgid
+_FORK = struct.Struct('=IIII')           # parent pid/tgid, child pid/tgid
+
+_user_cache = {}
+_boot_times = {}   # proc_root -> btime din /proc/stat
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+
+def _username(uid):
+    name = _user_cache.get(uid)
+    if name is None:
+        try:
+            name = pwd.getpwuid(uid).pw_name
+        except KeyError:
+            name = str(uid)
+        _user_cache[uid] = name
+    return name
+
+
+def _boot_time(proc_root):
+    btime = _boot_times.get(proc_root)
+    if btime is None:
+        with open(f'{proc_root}/stat', 'rb') as f:
+            for line in f:
+                if line.startswith(b'btime'):
+                    btime = float(line.split()[1])
+                    break
+        _boot_times[proc_root] = btime
+    return btime
+
+
+def read_proc_info(pid, proc_root='/proc'):
+    """Read name, cmdline, user, exe and start time of a live process straight from /proc
+
+    Returns None when the process is already gone; this is the step that
+    races short-lived processes, so it reads as little as possible. The
+    start time is computed like psutil's create_time (starttime / clock
+    ticks + btime), so both sources agree on the same process.
+    """
+    base = f'{proc_root}/{pid}'
+    try:
+        with open(f'{base}/cmdline', 'rb') as f:
+            raw = f.read()
+        with open(f'{base}/stat', 'rb') as f:
+            stat = f.read()
+        uid = os.stat(base).st_uid
+        create_time = float(stat.rsplit(b')', 1)[1].split()[19]) / CLOCK_TICKS + _boot_time(proc_root)
+    except (OSError, IndexError, ValueError, TypeError):
+        return None
+    # comm apare între paranteze (poate conține spații sau paranteze)
+    name = stat[stat.find(b'(') + 1:stat.rfind(b')')].decode('utf-8', 'replace')
+    try:
+        exe = os.readlink(f'{base}/exe')
+    except OSError:
+        exe = None
+    return {
+        'pid': pid,
+        'name': name,
+        'cmdline': [arg.decode('utf-8', 'replace') for arg in raw.split(b'\0') if arg],
+        'username': _username(uid),
+        'exe': exe,
+        'cpu_percent': 0.0,
+        'memory_percent': 0.0,
+        'create_time': create_time,
+    }
+
+
+class ProcEventListener:
+    """Fork/exec/exit stream from the kernel proc connector (requires root)
+
+    A reader thread handles each exec immediately: it reads the new program's
+    cmdline from /proc and evaluates the detection rules before a short-lived
+    process can exit. Results are queued for the UI thread, which applies
+    them to the process snapshot with `drain()`.
+    """
+
+    def __init__(self, match, proc_root='/proc', max_pending=10000):
+        self._match = match
+        self.proc_root = proc_root
+        self.events = queue.Queue(maxsize=max_pending)
+        self._sock = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.error = None
+        self.stats = {'fork': 0, 'exec': 0, 'exit': 0, 'alerts': 0, 'lost': 0}
+        # Evenimente pierdute (buffer plin): snapshot-ul trebuie recitit complet
+        self.resync_needed = False
+
+    @staticmethod
+    def supported():
+        return hasattr(socket, 'AF_NETLINK') and os.geteuid() == 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _send_op(self, op):
+        payload = struct.pack('=I', op)
+        cn = _CN_MSG.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0)
+        header = _NLMSGHDR.pack(_NLMSGHDR.size + len(cn) + len(payload), NLMSG_DONE, 0, 0, os.getpid())
+        self._sock.send(header + cn + payload)
+
+    def start(self):
+        """Subscribe to process events; returns False when unavailable (polling stays)"""
+        if self.running:
+            return True
+        if not self.supported():
+            self.error = 'necesită root și netlink'
+            return False
+        try:
+            self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+            self._sock.bind((0, CN_IDX_PROC))
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+            self._sock.settimeout(0.5)
+            self._send_op(PROC_CN_MCAST_LISTEN)
+        except OSError as e:
+            self.error = str(e)
+            self._close()
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='proc-events', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        if self._sock is not None:
+            try:
+                self._send_op(PROC_CN_MCAST_IGNORE)
+            except OSError:
+                pass
+        self._close()
+
+    def _close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _push(self, event):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.stats['lost'] += 1
+            self.resync_needed = True
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                data = self._sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:  # Kernel-ul a aruncat evenimente
+                    self.stats['lost'] += 1
+                    self.resync_needed = True
+                    continue
+                self.error = str(e)
+                break
+            try:
+                self._parse(data)
+            except Exception as e:
+                # Un mesaj malformat sau o eroare la evaluarea regulilor nu oprește firul
+                self.error = f"eveniment ignorat: {e}"
+
+    def _parse(self, data):
+        offset = 0
+        while offset + _NLMSGHDR.size <= len(data):
+            msg_len = _NLMSGHDR.unpack_from(data, offset)[0]
+            if msg_len < _NLMSGHDR.size:
+                break
+            event_offset = offset + _NLMSGHDR.size + _CN_MSG.size
+            if event_offset + _EVENT_HEADER.size <= offset + msg_len:
+                self._handle_event(data, event_offset)
+            offset += (msg_len + 3) & ~3
+
+    def _handle_event(self, data, offset):
+        what = _EVENT_HEADER.unpack_from(data, offset)[0]
+        body = offset + _EVENT_HEADER.size
+
+        if what == PROC_EVENT_EXEC:
+            pid, tgid = _PID_PAIR.unpack_from(data, body)
+            if pid != tgid:
+                return
+            self.stats['exec'] += 1
+            info = read_proc_info(pid, self.proc_root)
+            if info is None:
+                return
+            rule = self._match(info)
+            if rule is not None:
+                info['rule'] = rule
+                self.stats['alerts'] += 1
+            self._push(('exec', pid, info))
+        elif what == PROC_EVENT_EXIT:
+            pid, tgid = _PID_PAIR.unpack_from(data, body)
+            if pid != tgid:
+                return
+            self.stats['exit'] += 1
+            self._push(('exit', pid, None))
+        elif what == PROC_EVENT_FORK:
+            self.stats['fork'] += 1
+
+    def drain(self, max_events=5000):
+        """Pending events as a list of (kind, pid, info), without blocking"""
+        events = []
+        for _ in range(max_events):
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        return events
@@ -0,0 +1,99 @@
+import re
+
+# Câmp -> (expresie Python peste `info`, tip, etapă). Etapa 'early' folosește doar
+# ce aduce deja psutil.process_iter; 'late' are nevoie de CPU/memorie/reguli.
+FIELDS = {
+    'pid': ("info['pid']", 'num', 'early'),
+    'name': ("(info.get('name') or '')", 'text', 'early'),
+    'user': ("(info.get('username') or '')", 'text', 'early'),
+    'cmd': ("' '.join(info.get('cmdline') or ())", 'text', 'early'),
+    'exe': ("(info.get('exe') or '')", 'text', 'early'),
+    'cpu': ("(info.get('cpu_percent') or 0.0)", 'num', 'late'),
+    'mem': ("(info.get('memory_percent') or 0.0)", 'num', 'late'),
+    'rule': ("(info.get('rule') or '')", 'text', 'late'),
+}
+ALIASES = {'username': 'user', 'cmdline': 'cmd', 'comm': 'name', 'regula': 'rule'}
+
+NUMERIC_OPS = {'=': '==', '!=': '!=', '>': '>', '<': '<', '>=': '>=', '<=': '<='}
+TEXT_OPS = ('=', '!=', '~', '!~')
+
+# câmp, operator, valoare (între ghilimele dacă are spații); altfel cuvânt liber
+_TERM_RE = re.compile(r'\s*(?:(\w+)\s*(!~|!=|>=|<=|=|~|>|<)\s*("[^"]*"|\S+)|("[^"]*"|\S+))')
+
+
+class ProcessFilter:
+    """Filter expression compiled into two predicates over a process info dict
+
+    `user=postgres cpu>5 name~worker exe!~/usr/` - terms are ANDed; `~` is
+    a case-insensitive regex search and a bare word matches name or cmdline.
+    `match_early` only touches fields psutil.process_iter already fetched,
+    so it runs before the per-process as_dict/CPU/rule work; `match_late`
+    checks the rest once those values exist.
+    """
+
+    def __init__(self, text):
+        self.text = text.strip()
+        self.needs_exe = False
+        terms = {'early': [], 'late': []}
+        env = {}
+        position = 0
+        while position < len(text):
+            match = _TERM_RE.match(text, position)
+            if match is None or match.end() == position:
+                break
+            position = match.end()
+            field, op, value, word = match.groups()
+            if word is not None:
+                if not word.startswith('"') and any(ch in word for ch in '=~<>'):
+                    raise ValueError(f"termen incomplet: {word}")
+                word = word.strip('"')
+                if not word:
+                    continue
+                name = f'c{len(env)}'
+                env[name] = re.compile(re.escape(word), re.IGNORECASE)
+                terms['early'].append(f"({name}.search({FIELDS['name'][0]}) is not None or "
+                                      f"{name}.search({FIELDS['cmd'][0]}) is not None)")
+                continue
+            expression, stage = self._compile_term(field, op, value.strip('"'), env)
+            terms[stage].append(expression)
+        self.term_count = len(terms['early']) + len(terms['late'])
+        self.match_early = self._build(terms['early'], env)
+        self.match_late = self._build(terms['late'], env)
+
+    def _compile_term(self, field, op, value, env):
+        key = ALIASES.get(field.lower(), field.lower())
+        if key not in FIELDS:
+            raise ValueError(f"câmp necunoscut: {field} (disponibile: {', '.join(FIELDS)})")
+        expression, kind, stage = FIELDS[key]
+        if key == 'exe':
+            self.needs_exe = True
+        name = f'c{len(env)}'
+        if kind == 'num':
+            if op not in NUMERIC_OPS:
+                raise ValueError(f"operatorul {op} nu se aplică lui {key} (numeric)")
+            try:
+                env[name] = float(value)
+            except ValueError:
+                raise ValueError(f"{key}{op}{value}: valoarea trebuie să fie numerică") from None
+            return f"{expression} {NUMERIC_OPS[op]} {name}", stage
+        if op not in TEXT_OPS:
+            raise ValueError(f"operatorul {op} nu se aplică lui {key} (text)")
+        if op in ('=', '!='):
+            env[name] = value
+            return f"{expression} {'==' if op == '=' else '!='} {name}", stage
+        try:
+            env[name] = re.compile(value, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"expresie regulată invalidă '{value}': {e}") from None
+        return f"{name}.search({expression}) is {'not ' if op == '~' else ''}None", stage
+
+    @staticmethod
+    def _build(terms, env):
+        """One lambda for all terms of a stage: a single call with short-circuit `and`"""
+        if not terms:
+            return lambda info: True
+        # Sursa conține doar expresii fixe din FIELDS și nume c0, c1...; valorile stau în `env`
+        return eval(f"lambda info: {' and '.join(terms)}", dict(env))
+
+    def matches(self, info):
+        return self.match_early(info) and self.match_late(info)
@@ -0,0 +1,296 @@
+import json
+import os
+import re
+import time
+from collections import namedtuple
+
+DEFAULT_RULES_PATH = os.path.expanduser('~/.config/monitor_sistem/process_rules.json')
+
+# Regulile implicite (folosite când fișierul de configurare lipsește). O regulă se
+# potrivește când TOATE condițiile ei sunt îndeplinite; procesul e suspicios dacă
+# se potrivește oricare regulă și nu e în lista globală `allow`.
+#
+# Condiții: names (nume exacte), users, exe (regex), cmdline (regex),
+# cpu_above / mem_above (procente); excepții per regulă: allow_names, allow_users.
+DEFAULT_RULES = {
+    'allow': {'names': [], 'users': []},
+    'rules': [
+        {'name': 'unelte-retea', 'names': ['nc', 'ncat', 'telnet', 'ftp', 'socat']},
+        {'name': 'exe-temporar', 'exe': [r'/tmp', r'/dev/shm', r'/var/tmp']},
+        {'name': 'cmdline-suspicioasa', 'cmdline': [
+            r'nc\s', r'\bnmap\b', r'\btcpdump\b', r'\bhping\b', r'\bwget\b\s.*http',
+            r'curl\s.*http', r'chmod\s.*777', r'/tmp/', r'\.exe\b', r'\bpython\b.*-c\s'
+        ]},
+        {'name': 'cpu-ridicat', 'cpu_above': 95,
+         'allow_names': ['chrome', 'firefox', 'python3', 'code', 'top', 'htop', 'stress']},
+    ]
+}
+
+# Ordinea de evaluare a condițiilor unei reguli compuse: cele ieftine întâi
+_CHECK_ORDER = ['names', 'users', 'cpu_above', 'mem_above', 'exe', 'cmdline']
+
+
+def _merge_patterns(patterns):
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
+
+
+def _required_literal(pattern):
+    """Longest literal every match of `pattern` must contain (lower-case), or None"""
+    if any(c in pattern for c in '|()['):
+        return None  # Alternative/grupuri: fără prefiltru
+    runs, current = [], ''
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            escaped = pattern[i + 1:i + 2]
+            i += 2
+            if escaped and not escaped.isalnum():
+                current += escaped
+                continue
+            runs.append(current)      # \b, \s, \d ...
+            current = ''
+        elif c in '*?{+':
+            if c != '+':
+                current = current[:-1]  # Caracterul anterior devine opțional
+            runs.append(current)
+            current = ''
+            i = pattern.index('}', i) + 1 if c == '{' and '}' in pattern[i:] else i + 1
+        elif c in '.^$':
+            runs.append(current)
+            current = ''
+            i += 1
+        else:
+            current += c
+            i += 1
+    runs.append(current)
+    best = max(runs, key=len)
+    return best.lower() if len(best) >= 2 else None
+
+
+def _prefilter(patterns):
+    """Literals of which at least one must occur for any of `patterns` to match"""
+    literals = [_required_literal(p) for p in patterns]
+    return None if None in literals else tuple(set(literals))
+
+
+def _lower_set(values):
+    return frozenset(v.lower() for v in values or ())
+
+
+# Forma compilată a unei configurații; imuabilă, înlocuită dintr-o singură atribuire la reîncărcare
+CompiledRules = namedtuple('CompiledRules', [
+    'allow_names', 'allow_users', 'name_rules', 'numeric_rules', 'exe_re', 'cmdline_re',
+    'rule_allow', 'compound_rules', 'needs_exe', 'rule_count'])
+
+
+class ProcessRuleEngine:
+    """Suspicious-process rules loaded from a JSON file and compiled for speed
+
+    Single-condition rules are folded into shared structures: one dict lookup
+    for all name rules, one merged regex (one named group per rule) for all
+    cmdline rules and one for all exe rules. Multi-condition rules keep their
+    checks ordered cheapest first. The file is re-read when its mtime changes.
+
+    All compiled state lives in one immutable CompiledRules swapped in with a
+    single assignment, and `match()` reads it once, so the proc-events reader
+    thread never sees half of an old rule set and half of a new one.
+    """
+
+    def __init__(self, path=DEFAULT_RULES_PATH, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.error = None
+        self.loaded_from = None
+        self._mtime = None
+        self._last_check = 0
+        self._rules = self._compile(DEFAULT_RULES)
+        self.maybe_reload(force=True)
+
+    @property
+    def needs_exe(self):
+        return self._rules.needs_exe
+
+    @property
+    def rule_count(self):
+        return self._rules.rule_count
+
+    def maybe_reload(self, force=False):
+        """Reload the rules if the config file changed; returns True on reload"""
+        now = time.time()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+
+        if mtime is None:
+            # Fișierul a dispărut: revenim la regulile implicite
+            self._rules = self._compile(DEFAULT_RULES)
+            self.loaded_from = None
+            self.error = None
+            return True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            self._rules = self._compile(config)
+            self.loaded_from = self.path
+            self.error = None
+        except (OSError, ValueError, re.error, KeyError, TypeError) as e:
+            # Configurație invalidă: păstrăm regulile anterioare
+            self.error = str(e)
+        return True
+
+    @staticmethod
+    def _compile(config):
+        """Compile a rules config into a CompiledRules (raises on invalid rules)"""
+        allow = config.get('allow', {})
+        allow_names = _lower_set(allow.get('names'))
+        allow_users = frozenset(allow.get('users') or ())
+
+        name_rules = {}       # nume -> (regulă, excepții nume, excepții utilizatori)
+        numeric_rules = []    # (regulă, prag cpu, prag mem, excepții nume, excepții utilizatori)
+        exe_patterns, cmdline_patterns = [], []
+        exe_sources, cmdline_sources = [], []
+        rule_allow = {}       # grup regex -> (regulă, excepții nume, excepții utilizatori)
+        compound_rules = []
+
+        for index, rule in enumerate(config.get('rules', [])):
+            name = rule.get('name', f'regula-{index}')
+            exceptions = (_lower_set(rule.get('allow_names')), frozenset(rule.get('allow_users') or ()))
+            conditions = [key for key in _CHECK_ORDER if rule.get(key) not in (None, [], '')]
+            if not conditions:
+                continue
+
+            if conditions == ['names']:
+                for proc_name in rule['names']:
+                    name_rules.setdefault(proc_name.lower(), (name,) + exceptions)
+            elif set(conditions) <= {'cpu_above', 'mem_above'}:
+                numeric_rules.append((name, rule.get('cpu_above'), rule.get('mem_above')) + exceptions)
+            elif conditions in (['exe'], ['cmdline']):
+                group = f'r{index}'
+                merged = _merge_patterns(rule[conditions[0]]).pattern
+                re.compile(merged)  # Validare per regulă, pentru un mesaj de eroare clar
+                target = exe_patterns if conditions == ['exe'] else cmdline_patterns
+                target.append(f'(?P<{group}>{merged})')
+                (exe_sources if conditions == ['exe'] else cmdline_sources).extend(rule[conditions[0]])
+                rule_allow[group] = (name,) + exceptions
+            else:
+                checks = []
+                for key in conditions:
+                    value = rule[key]
+                    if key == 'names':
+                        checks.append((key, _lower_set(value)))
+                    elif key == 'users':
+                        checks.append((key, frozenset(value)))
+                    elif key in ('exe', 'cmdline'):
+                        checks.append((key, (_merge_patterns(value), _prefilter(value))))
+                    else:
+                        checks.append((key, float(value)))
+                compound_rules.append((name, checks) + exceptions)
+
+        # Totul se compilează înainte de a înlocui regulile active
+        # Fiecare regex combinat are un prefiltru de literali (căutare `in`, în C): majoritatea
+        # proceselor nu conțin niciunul și nu mai ajung la motorul regex
+        exe_re = cmdline_re = None
+        if exe_patterns:
+            exe_re = (re.compile('|'.join(exe_patterns), re.IGNORECASE), _prefilter(exe_sources))
+        if cmdline_patterns:
+            cmdline_re = (re.compile('|'.join(cmdline_patterns), re.IGNORECASE), _prefilter(cmdline_sources))
+
+        needs_exe = exe_re is not None or any(key == 'exe' for rule in compound_rules for key, _ in rule[1])
+        return CompiledRules(allow_names, allow_users, name_rules, numeric_rules, exe_re, cmdline_re,
+                             rule_allow, compound_rules, needs_exe, len(config.get('rules', [])))
+
+    @staticmethod
+    def _allowed(exceptions, name, user):
+        return name in exceptions[0] or user in exceptions[1]
+
+    @staticmethod
+    def _search(compiled, text):
+        regex, literals = compiled
+        if literals is not None:
+            lowered = text.lower()
+            if not any(literal in lowered for literal in literals):
+                return False
+        return regex.search(text) is not None
+
+    @classmethod
+    def _regex_match(cls, compiled, rule_allow, text, name, user):
+        if compiled is None or not text:
+            return None
+        regex, literals = compiled
+        if literals is not None:
+            lowered = text.lower()
+            if not any(literal in lowered for literal in literals):
+                return None
+        # Primul grup potrivit poate aparține unei reguli cu excepție: încercăm și restul textului
+        for match in regex.finditer(text):
+            rule = rule_allow[match.lastgroup]
+            if not cls._allowed(rule[1:], name, user):
+                return rule[0]
+        return None
+
+    def match(self, info):
+        """Return the name of the first matching rule for a process info dict, or None
+
+        Uses the 'name', 'username', 'cpu_percent', 'memory_percent', 'exe' and
+        'cmdline' keys; missing values never match.
+        """
+        rules = self._rules
+        name = (info.get('name') or '').lower()
+        user = info.get('username')
+        if name in rules.allow_names or user in rules.allow_users:
+            return None
+
+        rule = rules.name_rules.get(name)
+        if rule is not None and not self._allowed(rule[1:], name, user):
+            return rule[0]
+
+        cpu = info.get('cpu_percent') or 0
+        mem = info.get('memory_percent') or 0
+        for rule_name, cpu_above, mem_above, allow_rule_names, allow_rule_users in rules.numeric_rules:
+            if cpu_above is not None and cpu <= cpu_above:
+                continue
+            if mem_above is not None and mem <= mem_above:
+                continue
+            if name not in allow_rule_names and user not in allow_rule_users:
+                return rule_name
+
+        exe = info.get('exe') or ''
+        found = self._regex_match(rules.exe_re, rules.rule_allow, exe, name, user)
+        if found:
+            return found
+
+        cmdline = info.get('cmdline')
+        cmdline = ' '.join(cmdline) if cmdline else ''
+        found = self._regex_match(rules.cmdline_re, rules.rule_allow, cmdline, name, user)
+        if found:
+            return found
+
+        for rule_name, checks, allow_rule_names, allow_rule_users in rules.compound_rules:
+            if name in allow_rule_names or user in allow_rule_users:
+                continue
+            for key, value in checks:
+                if key == 'names':
+                    ok = name in value
+                elif key == 'users':
+                    ok = user in value
+                elif key == 'cpu_above':
+                    ok = cpu > value
+                elif key == 'mem_above':
+                    ok = mem > value
+                elif key == 'exe':
+                    ok = self._search(value, exe)
+                else:
+                    ok = self._search(value, cmdline)
+                if not ok:
+                    break
+            else:
+                return rule_name
+        return None
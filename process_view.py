@@ -1,7 +1,22 @@
 import curses
+import heapq
 import psutil
 import time
 from datetime import datetime
+from ui.utils import draw_input_line
+from ui.log_view import format_log_time, format_log_category, get_category_color
+
+# Intervalul minim între două citiri /proc/[pid]/io ale aceluiași proces
+IO_MIN_INTERVAL = 1.0
+
+# Peste această fracțiune din procese cerută, sortarea completă e mai ieftină decât heap-ul
+TOPK_FULL_SORT_RATIO = 0.05
+
+# Găsiri din log-uri afișate în panoul procesului selectat
+PANEL_FINDINGS = 5
+
+# Coloanele READ/s și WRIT/s apar de la această lățime a listei (sau la sortarea după I/O)
+IO_COLUMNS_MIN_WIDTH = 100
 
 def format_memory(bytes_value):
     """Formatează memoria în unități citibile (KB, MB, GB, TB)"""
@@ -79,6 +94,78 @@ def calculate_cpu_percent(proc, prev_cpu_times):
     except:
         return 0.0
 
+def update_io_rates(io_cache, proc, info, now):
+    """Calculează ratele de citire/scriere pe disc (octeți/s) din /proc/[pid]/io, ca delta față de eșantionul anterior"""
+    pid = info['pid']
+    prev = io_cache.get(pid)
+    if prev is not None and now - prev[2] < IO_MIN_INTERVAL:
+        # Eșantion recent: se refolosesc ratele (desenarea nu recitește la fiecare cadru)
+        info['io_read'], info['io_write'] = prev[3], prev[4]
+        return
+    try:
+        counters = proc.io_counters()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        info['io_read'] = info['io_write'] = None
+        return
+    read_rate = write_rate = None
+    if prev is not None:
+        elapsed = now - prev[2]
+        read_rate = max(0.0, (counters.read_bytes - prev[0]) / elapsed)
+        write_rate = max(0.0, (counters.write_bytes - prev[1]) / elapsed)
+    io_cache[pid] = (counters.read_bytes, counters.write_bytes, now, read_rate, write_rate)
+    info['io_read'], info['io_write'] = read_rate, write_rate
+
+def sample_process_io(monitor, processes):
+    """Eșantionează I/O doar pentru procesele date (rândurile vizibile)"""
+    io_cache = getattr(monitor, 'io_cache', None)
+    if io_cache is None:
+        return
+    now = time.time()
+    for proc, is_susp, info in processes:
+        if proc is not None:
+            update_io_rates(io_cache, proc, info, now)
+
+def process_sort_key(sort_by):
+    """Cheia de sortare pentru tuplurile (proc, is_suspicious, info)"""
+    if sort_by == 'io':
+        return lambda x: (x[2].get('io_read') or 0.0) + (x[2].get('io_write') or 0.0)
+    field = 'cpu_percent' if sort_by == 'cpu' else 'memory_percent'
+    return lambda x: x[2].get(field, 0)
+
+def sort_processes(processes, sort_by, reverse, limit=None):
+    """Primele `limit` procese în ordinea de sortare (toate dacă limit e None)
+
+    Pentru fereastra vizibilă se folosește un heap top-K, cu același rezultat
+    ca sortarea stabilă; sortarea completă rămâne doar pentru ferestre adânci.
+    """
+    key = process_sort_key(sort_by)
+    if limit is None or limit >= len(processes) * TOPK_FULL_SORT_RATIO:
+        return sorted(processes, key=key, reverse=reverse)[:limit]
+    if reverse:
+        return heapq.nlargest(limit, processes, key=key)
+    return heapq.nsmallest(limit, processes, key=key)
+
+def process_rank(processes, pid, sort_by, reverse):
+    """Poziția procesului `pid` în lista sortată, într-o singură trecere (None dacă lipsește)"""
+    key = process_sort_key(sort_by)
+    keys = [key(entry) for entry in processes]
+    position = next((i for i, entry in enumerate(processes) if entry[2].get('pid') == pid), None)
+    if position is None:
+        return None
+    value = keys[position]
+    # Sortarea e stabilă: la egalitate contează ordinea din listă
+    if reverse:
+        before = sum(1 for k in keys if k > value)
+    else:
+        before = sum(1 for k in keys if k < value)
+    return before + sum(1 for k in keys[:position] if k == value)
+
+def format_io_rate(rate):
+    """Formatează o rată de I/O ("-" dacă nu există încă două eșantioane)"""
+    if rate is None:
+        return "-"
+    return format_memory(int(rate))
+
 def collect_processes_with_cpu(monitor):
     """Colectează procesele cu măsurarea corectă a CPU"""
     processes = []
@@ -90,15 +177,46 @@ def collect_processes_with_cpu(monitor):
     if hasattr(monitor, 'cpu_times_cache'):
         prev_cpu_times = monitor.cpu_times_cache
     
+    # I/O pentru toate procesele doar când se sortează după I/O (altfel doar rândurile vizibile)
+    io_cache = getattr(monitor, 'io_cache', None)
+    sample_io = io_cache is not None and monitor.sort_by == 'io'
+    
     # Actualizează cache-ul pentru timpi CPU
     new_cpu_times_cache = {}
     
+    # Filtrul de rețea folosește indexul de socket-uri construit la refresh
+    socket_index = getattr(monitor, 'socket_index', None)
+    only_network = getattr(monitor, 'show_only_network', False) and socket_index is not None
+    
+    # Regulile se reîncarcă dacă fișierul de configurare s-a schimbat
+    rules = monitor.detector.process_rules
+    rules.maybe_reload()
+    attrs = ['pid', 'name', 'memory_percent', 'cmdline', 'username', 'create_time']
+    if rules.needs_exe:
+        attrs.append('exe')
+    
+    # Filtrul interactiv (/): termenii ieftini se verifică pe ce aduce deja process_iter
+    process_filter = getattr(monitor, 'process_filter', None)
+    iter_attrs = ['pid', 'name', 'cmdline', 'username', 'create_time']
+    if process_filter is not None and process_filter.needs_exe:
+        iter_attrs.append('exe')
+    
+    # Cu alertele active regulile se evaluează pe toate procesele, indiferent de filtrele vederii
+    alerting = getattr(monitor, 'alerts', None) is not None
+    matched = []
+    
     # Procesează toate procesele
-    for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'username', 'create_time']):
+    total_count = 0
+    for proc in psutil.process_iter(iter_attrs):
+        total_count += 1
         try:
+            filtered_out = ((only_network and not socket_index.has_network(proc.pid))
+                            or (process_filter is not None and not process_filter.match_early(proc.info)))
+            if filtered_out and not alerting:
+                continue
+                
             # Obține informații de bază
-            info = proc.as_dict(attrs=['pid', 'name', 'memory_percent', 
-                                     'cmdline', 'username', 'create_time'])
+            info = proc.as_dict(attrs=attrs)
             
             # Calculează utilizarea CPU
             cpu_percent = calculate_cpu_percent(proc, prev_cpu_times)
@@ -107,11 +225,23 @@ def collect_processes_with_cpu(monitor):
             # Salvează timpii CPU pentru următorul calcul
             new_cpu_times_cache[proc.pid] = (proc.cpu_times(), current_time)
             
+            if sample_io:
+                update_io_rates(io_cache, proc, info, current_time)
+            
             # Verifică dacă procesul este suspicios
-            is_suspicious = monitor.detector.is_suspicious_process(proc)
+            rule = monitor.detector.match_process(info)
+            is_suspicious = rule is not None
+            if is_suspicious:
+                info['rule'] = rule
+                if alerting:
+                    matched.append(info)
             
+            if filtered_out:
+                continue
             if monitor.show_only_suspicious and not is_suspicious:
                 continue
+            if process_filter is not None and not process_filter.match_late(info):
+                continue
                 
             processes.append((proc, is_suspicious, info))
             if is_suspicious:
@@ -122,9 +252,75 @@ def collect_processes_with_cpu(monitor):
     
     # Actualizează cache-ul în monitor pentru următorul refresh
     monitor.cpu_times_cache = new_cpu_times_cache
+    monitor.total_process_count = total_count
+    monitor.matched_processes = matched
+    if io_cache is not None:
+        # Procesele terminate ies din cache-ul de I/O
+        monitor.io_cache = {pid: sample for pid, sample in io_cache.items() if pid in new_cpu_times_cache}
     
     return processes, suspicious_count
 
+def filter_cgroup_processes(monitor, processes):
+    """Restrânge lista la grupul cgroup deschis (drill-down din vederea pe grupuri)"""
+    cgroup_filter = getattr(monitor, 'cgroup_filter', None)
+    if cgroup_filter is None:
+        return processes
+    path_for = monitor.cgroup_index.path_for
+    return [entry for entry in processes if path_for(entry[2]['pid']) == cgroup_filter]
+
+def sort_cgroup_groups(monitor):
+    """Grupurile cgroup ordonate după criteriul de sortare al proceselor"""
+    key = (lambda g: g.mem) if monitor.sort_by == 'memory' else (lambda g: g.cpu)
+    return sorted(monitor.cgroup_index.groups, key=key, reverse=monitor.sort_reverse)
+
+def draw_cgroup_list(stdscr, height, width, monitor):
+    """Desenează procesele agregate pe cgroup (unitate systemd / container)"""
+    try:
+        groups = sort_cgroup_groups(monitor)
+        sort_info = f"Sortat după: {monitor.sort_by.upper()} {'↓' if monitor.sort_reverse else '↑'}"
+        stdscr.addstr(6, 2, "PROCESE GRUPATE PE CGROUP", curses.A_BOLD | curses.color_pair(2))
+        stdscr.addstr(6, width - len(sort_info) - 2, sort_info, curses.A_DIM)
+        stdscr.addstr(7, 2, "─" * (width - 4))
+        header = f"{'TIP':<10} {'GRUP':<34} {'PROC':>5} {'CPU%':>7} {'MEM%':>6} {'SUSP':>5}  CGROUP"
+        stdscr.addstr(8, 2, header[:width - 4], curses.A_BOLD)
+        
+        stats_text = f"Grupuri: {len(groups)} | Procese: {sum(g.count for g in groups)}"
+        try:
+            stdscr.addstr(8, width - len(stats_text) - 2, stats_text, curses.A_DIM)
+        except curses.error:
+            pass
+        
+        available_height = height - 9 - 3
+        if groups:
+            monitor.cgroup_selected_index = min(monitor.cgroup_selected_index, len(groups) - 1)
+        if monitor.cgroup_selected_index < monitor.cgroup_scroll_offset:
+            monitor.cgroup_scroll_offset = monitor.cgroup_selected_index
+        elif monitor.cgroup_selected_index >= monitor.cgroup_scroll_offset + available_height:
+            monitor.cgroup_scroll_offset = monitor.cgroup_selected_index - available_height + 1
+        
+        y = 9
+        for idx, group in enumerate(groups[monitor.cgroup_scroll_offset:
+                                           monitor.cgroup_scroll_offset + available_height]):
+            global_idx = idx + monitor.cgroup_scroll_offset
+            line = (f"{group.kind:<10} {group.label[:34]:<34} {group.count:>5} {group.cpu:>7.1f} "
+                    f"{group.mem:>6.1f} {group.suspicious:>5}  {group.path}")
+            if global_idx == monitor.cgroup_selected_index:
+                color = curses.color_pair(2) | curses.A_REVERSE
+            elif group.suspicious:
+                color = curses.color_pair(3) | curses.A_BOLD
+            else:
+                color = curses.color_pair(3) if group.cpu > 80 else curses.A_NORMAL
+            stdscr.addstr(y, 2, line[:width - 4], color)
+            y += 1
+        
+        if not groups:
+            stdscr.addstr(10, 4, "Niciun proces în snapshot", curses.A_DIM)
+        
+        help_text = "TAB:schimbă | ↑/↓:navighează | ENTER:procesele grupului | G:listă plată | C:CPU | M:MEM | R:inversează"
+        stdscr.addstr(height - 1, 2, help_text[:width - 4], curses.A_DIM)
+    except curses.error:
+        pass
+
 def find_selected_process_in_list(processes, selected_pid):
     """Găsește indexul procesului selectat în lista curentă de procese"""
     if selected_pid is None:
@@ -140,24 +336,48 @@ def draw_process_header(stdscr, y, width, monitor):
     try:
         # Linia de titlu
         title = f"PROCESE {'(DOAR SUSPICIOASE)' if monitor.show_only_suspicious else '(TOATE)'}"
+        if getattr(monitor, 'cgroup_filter', None) is not None:
+            title += f" [GRUP: {monitor.cgroup_filter}]"
+        process_filter = getattr(monitor, 'process_filter', None)
+        if process_filter is not None:
+            title += " [FILTRAT]"
         sort_info = f"Sortat după: {monitor.sort_by.upper()} {'↓' if monitor.sort_reverse else '↑'}"
         
         stdscr.addstr(y, 2, title, curses.A_BOLD | curses.color_pair(2))
         stdscr.addstr(y, width - len(sort_info) - 2, sort_info, curses.A_DIM)
         
-        # Linia separator
+        # Linia separator (găzduiește câmpul de filtru când e activ)
         stdscr.addstr(y + 1, 2, "─" * (width - 4))
+        typing = getattr(monitor, 'process_filter_typing', False)
+        if typing or process_filter is not None:
+            draw_input_line(stdscr, y + 1, 2, " Filtru: /", monitor.process_filter_text,
+                            width // 2, active=typing)
+        error = getattr(monitor, 'process_filter_error', None)
+        if error:
+            stdscr.addstr(y + 1, width // 2 + 2, f" {error} "[:width // 2 - 4], curses.color_pair(3) | curses.A_BOLD)
         
         # Header-ul coloanelor
-        header = f"{'ST':<2} {'PID':<8} {'USER':<10} {'NAME':<18} {'CPU%':<6} {'MEM%':<6} {'VMEM':<8} {'TIME':<6} CMD"
+        io_header = f"{'READ/s':>7} {'WRIT/s':>7} " if show_io_columns(width, monitor.sort_by) else ""
+        header = f"{'ST':<2} {'PID':<8} {'USER':<10} {'NAME':<18} {'CPU%':<6} {'MEM%':<6} {'VMEM':<8} {io_header}{'TIME':<6} CMD"
         stdscr.addstr(y + 2, 2, header, curses.A_BOLD)
         
         return y + 3
     except curses.error:
         return y + 3
 
-def draw_process_details(stdscr, y, width, proc_info, is_selected=False, is_suspicious=False):
-    """Desenează detaliile unui proces"""
+def show_io_columns(width, sort_by):
+    """Whether the list is wide enough for the I/O columns (always shown when sorting by I/O)"""
+    return sort_by == 'io' or width >= IO_COLUMNS_MIN_WIDTH
+
+def findings_since(info):
+    """Oldest finding timestamp that can belong to this process (the pid may have been reused)"""
+    create_time = info.get('create_time')
+    # Log-urile au rezoluție de o secundă
+    return create_time - 1 if create_time else None
+
+def draw_process_details(stdscr, y, width, proc_info, is_selected=False, is_suspicious=False, has_findings=False,
+                         show_io=True):
+    """Desenează detaliile unui proces (`*` după simbolul de stare = are găsiri în log-uri)"""
     try:
         proc, is_susp, info = proc_info
         pid = info.get('pid', 0)
@@ -167,8 +387,10 @@ def draw_process_details(stdscr, y, width, proc_info, is_selected=False, is_susp
         user = info.get('username', 'UNKNOWN')[:9]
         create_time = info.get('create_time', 0)
         
-        # Obține informații suplimentare
+        # Obține informații suplimentare (rândurile redate dintr-o înregistrare nu au proces viu)
         try:
+            if proc is None:
+                raise psutil.NoSuchProcess(pid)
             proc_obj = psutil.Process(pid)
             memory_info = proc_obj.memory_info()
             vmem = format_memory(memory_info.vms)
@@ -186,9 +408,9 @@ def draw_process_details(stdscr, y, width, proc_info, is_selected=False, is_susp
         else:
             cmd = f"[{name}]"
         
-        cmd_width = width - 65
+        cmd_width = max(0, width - (81 if show_io else 65))
         if len(cmd) > cmd_width:
-            cmd = cmd[:cmd_width-3] + "..."
+            cmd = cmd[:cmd_width-3] + "..." if cmd_width > 3 else cmd[:cmd_width]
         
         # Determină culoarea
         color = curses.A_NORMAL
@@ -204,15 +426,20 @@ def draw_process_details(stdscr, y, width, proc_info, is_selected=False, is_susp
             color = curses.color_pair(3)
         
         # Desenează linia procesului
-        line = f"{status_symbol:<2} {pid:<8} {user:<10} {name:<18} {cpu:<6.1f} {mem:<6.1f} {vmem:<8} {runtime:<6} {cmd}"
+        io_columns = ""
+        if show_io:
+            io_columns = f"{format_io_rate(info.get('io_read')):>7} {format_io_rate(info.get('io_write')):>7} "
+        marker = status_symbol + ('*' if has_findings else '')
+        line = (f"{marker:<2} {pid:<8} {user:<10} {name:<18} {cpu:<6.1f} {mem:<6.1f} {vmem:<8} "
+                f"{io_columns}{runtime:<6} {cmd}")
         stdscr.addstr(y, 2, line[:width-4], color)
         
         return True
     except curses.error:
         return False
 
-def draw_selected_process_panel(stdscr, height, width, selected_proc_info):
-    """Desenează panoul cu procesul selectat și copiii săi în partea dreaptă"""
+def draw_selected_process_panel(stdscr, height, width, selected_proc_info, details=None, refreshing=False, findings=()):
+    """Desenează panoul cu procesul selectat și copiii săi în partea dreaptă (din detaliile din cache)"""
     try:
         if not selected_proc_info:
             return
@@ -222,7 +449,6 @@ def draw_selected_process_panel(stdscr, height, width, selected_proc_info):
         # Calculăm lățimea panoului (1/3 din ecran)
         panel_width = width // 3
         panel_x = width - panel_width
-        panel_height = height - 8  # Lasă spațiu pentru header și footer
         
         # Desenează rama panoului
         for y in range(6, height - 2):
@@ -242,82 +468,134 @@ def draw_selected_process_panel(stdscr, height, width, selected_proc_info):
         except curses.error:
             pass
         
-        # Informații despre proces
+        # Informații de bază (status-ul vine din fetcher, restul din snapshot-ul listei)
         current_y = 8
-        try:
-            proc_obj = psutil.Process(pid)
-            
-            # Informații de bază
-            user = info.get('username', 'UNKNOWN')
-            status = proc_obj.status()
-            cpu = info.get('cpu_percent', 0)
-            mem = info.get('memory_percent', 0)
-            
-            stdscr.addstr(current_y, panel_x, f"User: {user}", curses.A_BOLD)
-            stdscr.addstr(current_y + 1, panel_x, f"Status: {status}")
-            stdscr.addstr(current_y + 2, panel_x, f"CPU: {cpu:.1f}%")
-            stdscr.addstr(current_y + 3, panel_x, f"MEM: {mem:.1f}%")
-            
-            current_y += 5
-            
-            # Separator pentru copii
-            stdscr.addstr(current_y, panel_x, "PROCESE COPIL:", curses.A_BOLD | curses.color_pair(2))
-            stdscr.addstr(current_y + 1, panel_x, "─" * (panel_width - 2))
-            current_y += 2
+        user = info.get('username', 'UNKNOWN')
+        cpu = info.get('cpu_percent') or 0
+        mem = info.get('memory_percent') or 0
+        status = details.status if details is not None and details.status else '?'
+        
+        stdscr.addstr(current_y, panel_x, f"User: {user}", curses.A_BOLD)
+        stdscr.addstr(current_y + 1, panel_x, f"Status: {status}")
+        if refreshing:
+            stdscr.addstr(current_y + 1, panel_x + 10 + len(status), "⟳ se reîmprospătează", curses.A_DIM)
+        stdscr.addstr(current_y + 2, panel_x, f"CPU: {cpu:.1f}%")
+        stdscr.addstr(current_y + 3, panel_x, f"MEM: {mem:.1f}%")
+        
+        current_y += 5
+        
+        # Găsirile din log-uri ale procesului (din indexul pid -> găsiri al detectorului)
+        if findings:
+            stdscr.addstr(current_y, panel_x, f"GĂSIRI ÎN LOG-URI ({len(findings)}):", curses.A_BOLD | curses.color_pair(3))
+            current_y += 1
+            for entry in findings[:PANEL_FINDINGS]:
+                category = format_log_category(entry.categories)
+                message = entry.content.split(']: ', 1)[-1]
+                line = f"{format_log_time(entry.ts)} {message}"
+                stdscr.addstr(current_y, panel_x, line[:panel_width-2], get_category_color(category))
+                current_y += 1
+            current_y += 1
+        
+        # Separator pentru copii
+        stdscr.addstr(current_y, panel_x, "PROCESE COPIL:", curses.A_BOLD | curses.color_pair(2))
+        stdscr.addstr(current_y + 1, panel_x, "─" * (panel_width - 2))
+        current_y += 2
+        
+        if details is None:
+            if refreshing:
+                stdscr.addstr(current_y, panel_x, "Se încarcă...", curses.A_DIM)
+            return
+        if details.error and not details.children:
+            stdscr.addstr(current_y, panel_x, f"Eroare: {details.error}"[:panel_width-2], curses.color_pair(3))
+            return
+        if not details.child_count:
+            stdscr.addstr(current_y, panel_x, "Nu are procese copil", curses.color_pair(1))
+            return
+        
+        # Cel mult MAX_CHILDREN copii, citiți de fetcher
+        for i, (child_pid, child_name, child_cpu, child_mem) in enumerate(details.children):
+            if current_y + i >= height - 3:
+                break
+            indent = "├─" if i < details.child_count - 1 else "└─"
+            line = f"{indent} {child_pid} {child_name[:10]}"
+            stdscr.addstr(current_y + i, panel_x, line[:panel_width-2], curses.color_pair(1))
             
-            # Afișează procesele copil (maxim 10 pentru performanță)
+            # Afișează CPU/MEM pe linia următoare dacă încape
+            if current_y + i + 1 < height - 3:
+                stats = f"   CPU: {child_cpu:.1f}% MEM: {child_mem:.1f}%"
+                stdscr.addstr(current_y + i + 1, panel_x, stats[:panel_width-2], curses.A_DIM)
+                current_y += 1
+        
+        # Afișează numărul total dacă sunt mai mulți
+        remaining = details.child_count - len(details.children)
+        if remaining > 0:
             try:
-                children = proc_obj.children(recursive=True)  # Recursiv pentru toți copiii
-                
-                if not children:
-                    stdscr.addstr(current_y, panel_x, "Nu are procese copil", curses.color_pair(1))
-                else:
-                    # Afișează până la maxim 10 copii
-                    max_children = min(len(children), 10)
-                    
-                    for i, child in enumerate(children[:max_children]):
-                        try:
-                            # Folosește oneshot pentru eficiență
-                            with child.oneshot():
-                                child_pid = child.pid
-                                child_name = child.name()[:12]
-                                child_cpu = child.cpu_percent(interval=0)  # Nu bloca
-                                child_mem = child.memory_percent()
-                            
-                            # Determină nivelul de indentare
-                            indent = "├─" if i < len(children) - 1 else "└─"
-                            
-                            line = f"{indent} {child_pid} {child_name[:10]}"
-                            stdscr.addstr(current_y + i, panel_x, line[:panel_width-2], curses.color_pair(1))
-                            
-                            # Afișează CPU/MEM pe linia următoare dacă încape
-                            if current_y + i + 1 < height - 3:
-                                stats = f"   CPU: {child_cpu:.1f}% MEM: {child_mem:.1f}%"
-                                stdscr.addstr(current_y + i + 1, panel_x, stats[:panel_width-2], curses.A_DIM)
-                                current_y += 1
-                            
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            continue
-                    
-                    # Afișează numărul total dacă sunt mai mulți
-                    if len(children) > max_children:
-                        remaining = len(children) - max_children
-                        try:
-                            stdscr.addstr(current_y + max_children, panel_x, 
-                                        f"... și încă {remaining} copii", curses.A_DIM)
-                        except curses.error:
-                            pass
-                            
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                stdscr.addstr(current_y, panel_x, "Eroare la citirea copiilor", curses.color_pair(3))
-                
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            stdscr.addstr(current_y, panel_x, "Procesul nu mai există", curses.color_pair(3))
+                stdscr.addstr(current_y + len(details.children), panel_x,
+                            f"... și încă {remaining} copii", curses.A_DIM)
+            except curses.error:
+                pass
             
     except curses.error:
         pass
 
-def draw_process_info_panel(stdscr, height, width, selected_proc_info):
+def draw_thread_panel(stdscr, height, width, selected_proc_info, sampler):
+    """Desenează thread-urile procesului selectat, cele mai încărcate primele (în locul panoului cu copii)"""
+    try:
+        proc, is_susp, info = selected_proc_info
+        panel_width = width // 3
+        panel_x = width - panel_width
+        
+        for y in range(6, height - 2):
+            try:
+                stdscr.addstr(y, panel_x - 1, "│", curses.color_pair(1))
+            except curses.error:
+                pass
+        
+        header_text = f" THREAD-URI: {info.get('name', 'UNKNOWN')} ({info.get('pid', 0)}) "
+        stdscr.addstr(6, panel_x, header_text[:panel_width - 2], curses.A_BOLD | curses.color_pair(2))
+        stdscr.addstr(7, panel_x, "─" * (panel_width - 2))
+        
+        if sampler.error:
+            stdscr.addstr(8, panel_x, f"Thread-uri indisponibile: {sampler.error}"[:panel_width - 2], curses.color_pair(3))
+            return
+        
+        summary = f"Total: {sampler.total_threads}"
+        if sampler.last_read < sampler.total_threads:
+            summary += f" | citite/ciclu: {sampler.last_read}"
+        stdscr.addstr(8, panel_x, summary[:panel_width - 2], curses.A_DIM)
+        stdscr.addstr(9, panel_x, f"{'TID':<8} {'NUME':<16} {'ST':<2} {'CPU%':>6} {'CPU#':>4}"[:panel_width - 2], curses.A_BOLD)
+        
+        y = 10
+        for thread in sampler.hottest(max(0, height - 3 - y)):
+            cpu = thread.cpu_percent
+            cpu_text = f"{cpu:>6.1f}" if cpu is not None else f"{'-':>6}"
+            line = f"{thread.tid:<8} {thread.name[:16]:<16} {thread.state:<2} {cpu_text} {thread.processor if thread.processor is not None else '-':>4}"
+            color = curses.A_NORMAL
+            if cpu is not None and cpu > 50:
+                color = curses.color_pair(3) | curses.A_BOLD
+            elif thread.state == 'R':
+                color = curses.color_pair(1)
+            elif thread.state == 'D':
+                color = curses.color_pair(2)
+            stdscr.addstr(y, panel_x, line[:panel_width - 2], color)
+            y += 1
+    except curses.error:
+        pass
+
+def format_socket_summary(socket_index, pid, max_width, inodes=None):
+    """Formatează porturile ascultate și conexiunile stabilite ale unui proces"""
+    listening, established, _ = socket_index.summarize_pid(pid, inodes)
+    parts = []
+    if listening:
+        parts.append("Ascultă: " + ' '.join(f"{proto}/{port}" for proto, port in listening))
+    if established:
+        peers = ' '.join(f"{ip}:{port}" for ip, port in established[:3])
+        if len(established) > 3:
+            peers += f" +{len(established) - 3}"
+        parts.append(f"Stabilite: {peers}")
+    return " | ".join(parts)[:max_width]
+
+def draw_process_info_panel(stdscr, height, width, selected_proc_info, socket_index=None, details=None, refreshing=False):
     """Desenează panoul cu informații detaliate despre procesul selectat"""
     try:
         if not selected_proc_info:
@@ -326,42 +604,59 @@ def draw_process_info_panel(stdscr, height, width, selected_proc_info):
         proc, is_susp, info = selected_proc_info
         pid = info.get('pid', 0)
         
-        try:
-            proc_obj = psutil.Process(pid)
-            
-            # Calculăm lățimea disponibilă (2/3 din ecran pentru că panoul lateral ocupă 1/3)
-            available_width = (width * 2) // 3
-            
-            # Poziția panoului (în partea de jos a secțiunii principale)
-            panel_height = 4
-            panel_y = height - panel_height - 1
-            
-            # Desenează rama panoului
-            stdscr.addstr(panel_y - 1, 2, "─" * (available_width - 4))
-            stdscr.addstr(panel_y, 2, f"DETALII PROCES PID={pid}", curses.A_BOLD | curses.color_pair(2))
-            
-            # Comandă completă
-            cmdline = ' '.join(info.get('cmdline', []))
-            if cmdline:
-                cmd_display = cmdline[:available_width-10]
-                if len(cmdline) > available_width-10:
-                    cmd_display += "..."
-                stdscr.addstr(panel_y + 1, 4, f"CMD: {cmd_display}")
-            
-            # Fișiere și conexiuni
-            try:
-                open_files = len(proc_obj.open_files())
-                connections = len(proc_obj.connections())
-                threads = proc_obj.num_threads()
-                
-                stats_line = f"Fișiere: {open_files} | Conexiuni: {connections} | Thread-uri: {threads}"
-                stdscr.addstr(panel_y + 2, 4, stats_line[:available_width-8])
-            except:
-                pass
-            
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            stdscr.addstr(panel_y + 1, 4, "Procesul nu mai există sau accesul este refuzat", 
+        # Calculăm lățimea disponibilă (2/3 din ecran pentru că panoul lateral ocupă 1/3)
+        available_width = (width * 2) // 3
+        
+        # Poziția panoului (în partea de jos a secțiunii principale)
+        panel_height = 4
+        panel_y = height - panel_height - 1
+        
+        # Desenează rama panoului
+        stdscr.addstr(panel_y - 1, 2, "─" * (available_width - 4))
+        title = f"DETALII PROCES PID={pid}"
+        stdscr.addstr(panel_y, 2, title, curses.A_BOLD | curses.color_pair(2))
+        
+        # Porturi ascultate / conexiuni stabilite; inode-urile socket-urilor vin din fetcher
+        inodes = details.socket_inodes if details is not None and details.error is None else None
+        if socket_index is not None and inodes is not None:
+            net_summary = format_socket_summary(socket_index, pid, available_width - len(title) - 8, inodes)
+            if net_summary:
+                stdscr.addstr(panel_y, 4 + len(title), net_summary, curses.A_DIM)
+        
+        # Comandă completă
+        cmdline = ' '.join(info.get('cmdline') or [])
+        if cmdline:
+            cmd_display = cmdline[:available_width-10]
+            if len(cmdline) > available_width-10:
+                cmd_display += "..."
+            stdscr.addstr(panel_y + 1, 4, f"CMD: {cmd_display}")
+        
+        # Fișiere, conexiuni și thread-uri: ultimele valori cunoscute
+        if details is None:
+            stats_line = "Se încarcă detaliile..." if refreshing else ""
+        elif details.error and details.fds is None:
+            stdscr.addstr(panel_y + 2, 4, f"Detalii indisponibile: {details.error}"[:available_width-8],
                          curses.color_pair(3))
+            return
+        else:
+            if socket_index is not None:
+                connections = len(socket_index.connections_for_pid(pid, details.socket_inodes))
+            else:
+                connections = len(details.socket_inodes)
+            files = '?' if details.open_files is None else details.open_files
+            fds = '?' if details.fds is None else details.fds
+            stats_line = f"Fișiere: {files} | FD-uri: {fds}"
+            if details.partial:
+                stats_line += " (scanare parțială)"
+            stats_line += f" | Conexiuni: {connections} | Thread-uri: {details.threads}"
+            if details.error:
+                stats_line += f" | {details.error}"
+        if info.get('rule'):
+            stats_line += f" | Regulă: {info['rule']}"
+        if refreshing and details is not None:
+            stats_line += " | ⟳"
+        if stats_line:
+            stdscr.addstr(panel_y + 2, 4, stats_line.lstrip(" |")[:available_width-8])
             
     except curses.error:
         pass
@@ -373,16 +668,23 @@ def draw_process_list(stdscr, height, width, monitor):
         has_selected = hasattr(monitor, 'selected_process_pid') and monitor.selected_process_pid is not None
         list_width = (width * 2) // 3 if has_selected else width
         
-        # Colectează procesele cu măsurarea corectă a CPU
-        processes, suspicious_count = collect_processes_with_cpu(monitor)
+        # Folosește snapshot-ul colectat la ultimul refresh (nu re-parcurge /proc la fiecare cadru)
+        processes = filter_cgroup_processes(monitor, monitor.processes_cache)
+        suspicious_count = monitor.suspicious_count
+        total_processes = len(processes)
         
-        # Sortează procesele
-        sort_key = 'cpu_percent' if monitor.sort_by == 'cpu' else 'memory_percent'
-        processes.sort(key=lambda x: x[2].get(sort_key, 0), reverse=monitor.sort_reverse)
+        # Sortează doar până la capătul ferestrei vizibile (top-K); header-ul ocupă rândurile 6-8
+        window_end = monitor.process_scroll_offset + height - 9 - 3 - (5 if has_selected else 0)
+        window = sort_processes(processes, monitor.sort_by, monitor.sort_reverse, window_end)
         
         # Găsește procesul selectat în lista nouă (stabilizează selecția)
         if has_selected:
-            new_selected_index = find_selected_process_in_list(processes, monitor.selected_process_pid)
+            new_selected_index = next((i for i, entry in enumerate(window)
+                                       if entry[2].get('pid') == monitor.selected_process_pid), None)
+            if new_selected_index is None:
+                # În afara ferestrei: poziția exactă dintr-o singură trecere, fără sortare completă
+                new_selected_index = process_rank(processes, monitor.selected_process_pid,
+                                                  monitor.sort_by, monitor.sort_reverse)
             if new_selected_index is not None:
                 monitor.selected_process_index = new_selected_index
             else:
@@ -396,9 +698,11 @@ def draw_process_list(stdscr, height, width, monitor):
         current_y = draw_process_header(stdscr, 6, list_width, monitor)
         
         # Afișează statistici
-        stats_text = f"Total: {len(processes)} | Suspicioase: {suspicious_count}"
+        stats_text = f"Total: {total_processes} | Suspicioase: {suspicious_count}"
         if monitor.show_only_suspicious:
             stats_text += " | Mod: DOAR SUSPICIOASE"
+        if monitor.show_only_network:
+            stats_text += " | Mod: DOAR REȚEA"
             
         try:
             stdscr.addstr(current_y - 1, list_width - len(stats_text) - 2, stats_text, curses.A_DIM)
@@ -411,8 +715,8 @@ def draw_process_list(stdscr, height, width, monitor):
         
         # Ajustează scroll offset-ul pentru a menține procesul selectat vizibil
         if monitor.selected_process_index is not None:
-            if monitor.selected_process_index >= len(processes):
-                monitor.selected_process_index = max(0, len(processes) - 1)
+            if monitor.selected_process_index >= total_processes:
+                monitor.selected_process_index = max(0, total_processes - 1)
             
             # Auto-scroll pentru a menține procesul selectat vizibil
             if monitor.selected_process_index < monitor.process_scroll_offset:
@@ -420,17 +724,30 @@ def draw_process_list(stdscr, height, width, monitor):
             elif monitor.selected_process_index >= monitor.process_scroll_offset + available_height:
                 monitor.process_scroll_offset = monitor.selected_process_index - available_height + 1
         
+        # Fereastra s-a mutat (auto-scroll sau deselectare): top-K până la noul capăt
+        window_end = monitor.process_scroll_offset + available_height
+        if len(window) < min(window_end, total_processes):
+            window = sort_processes(processes, monitor.sort_by, monitor.sort_reverse, window_end)
+        processes = window
+        
         # Desenează procesele vizibile
         visible_processes = processes[monitor.process_scroll_offset:
                                    monitor.process_scroll_offset + available_height]
+        show_io = show_io_columns(list_width, monitor.sort_by)
+        if show_io:
+            sample_process_io(monitor, visible_processes)
+        pid_findings = getattr(monitor.detector, 'pid_findings', None)
         
         y = current_y
         for idx, proc_info in enumerate(visible_processes):
             global_idx = idx + monitor.process_scroll_offset
             is_selected = (monitor.selected_process_index == global_idx)
             is_suspicious = proc_info[1]
+            has_findings = pid_findings is not None and pid_findings.has_findings(
+                proc_info[2]['pid'], findings_since(proc_info[2]))
             
-            if not draw_process_details(stdscr, y, list_width, proc_info, is_selected, is_suspicious):
+            if not draw_process_details(stdscr, y, list_width, proc_info, is_selected, is_suspicious, has_findings,
+                                        show_io):
                 break
                 
             y += 1
@@ -441,13 +758,25 @@ def draw_process_list(stdscr, height, width, monitor):
         # Desenează panourile cu informații detaliate
         if has_selected and monitor.selected_process_index is not None and monitor.selected_process_index < len(processes):
             selected_proc_info = processes[monitor.selected_process_index]
-            draw_process_info_panel(stdscr, height, width, selected_proc_info)
-            draw_selected_process_panel(stdscr, height, width, selected_proc_info)
+            # Detaliile se citesc în fundal; panourile arată ultima valoare cunoscută
+            fetcher = getattr(monitor, 'detail_fetcher', None)
+            details, refreshing = None, False
+            if fetcher is not None:
+                selected_info = selected_proc_info[2]
+                details, refreshing = fetcher.get(selected_info['pid'], selected_info.get('create_time'))
+            draw_process_info_panel(stdscr, height, width, selected_proc_info, monitor.socket_index, details, refreshing)
+            if getattr(monitor, 'thread_view', False):
+                draw_thread_panel(stdscr, height, width, selected_proc_info, monitor.thread_sampler)
+            else:
+                findings = ()
+                if pid_findings is not None:
+                    findings = pid_findings.findings(selected_proc_info[2]['pid'], findings_since(selected_proc_info[2]))
+                draw_selected_process_panel(stdscr, height, width, selected_proc_info, details, refreshing, findings)
         
         # Desenează indicatorul de scroll
-        if len(processes) > available_height:
-            scroll_pos = int((monitor.process_scroll_offset / len(processes)) * available_height)
-            scroll_size = max(1, int((available_height / len(processes)) * available_height))
+        if total_processes > available_height:
+            scroll_pos = int((monitor.process_scroll_offset / total_processes) * available_height)
+            scroll_size = max(1, int((available_height / total_processes) * available_height))
             
             scroll_x = list_width - 2 if has_selected else width - 2
             
@@ -459,7 +788,9 @@ def draw_process_list(stdscr, height, width, monitor):
                     pass
         
         # Ajutoare pentru taste
-        help_text = "TAB:schimbă | ↑/↓:navighează | ENTER:selectează/deselectează | S:suspicioase | C:CPU | M:MEM | R:inversează"
+        help_text = "TAB:schimbă | ↑/↓:navighează | ENTER:selectează/deselectează | S:suspicioase | N:rețea | T:thread-uri | /:filtru | G:grupuri | C:CPU | M:MEM | I:I/O | R:inversează"
+        if getattr(monitor, 'cgroup_filter', None) is not None:
+            help_text = "←/BACKSPACE:înapoi la grupuri | " + help_text
         try:
             stdscr.addstr(height - 1, 2, help_text[:width-4], curses.A_DIM)
         except curses.error:
@@ -0,0 +1,238 @@
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from core.log_entry import CATEGORY_BITS, CATEGORY_ORDER, LogEntry
+
+DEFAULT_RATE_RULES_PATH = os.path.expanduser('~/.config/monitor_sistem/rate_rules.json')
+
+# Praguri implicite (folosite când fișierul de configurare lipsește); fișierul are forma
+# {"rules": [...]} cu reguli de aceeași formă. `scope` alege cheia contorului: categoria,
+# fișierul sursă sau o captură regex din linie (ex. IP-ul sursă al unei încercări SSH eșuate)
+DEFAULT_RATE_RULES = [
+    {'name': 'ssh-bruteforce', 'scope': 'key', 'category': 'SECURITY',
+     'pattern': r'from (\d{1,3}(?:\.\d{1,3}){3}|[0-9a-f:]+:[0-9a-f:]+)',
+     'window': 60, 'threshold': 20, 'severity': 'SECURITY'},
+    {'name': 'security-burst', 'scope': 'category', 'category': 'SECURITY',
+     'window': 60, 'threshold': 100, 'severity': 'SECURITY'},
+    {'name': 'critical-burst', 'scope': 'category', 'category': 'CRITICAL',
+     'window': 60, 'threshold': 10, 'severity': 'CRITICAL'},
+    {'name': 'source-flood', 'scope': 'source',
+     'window': 60, 'threshold': 1000, 'severity': 'CRITICAL'},
+]
+
+
+class SlidingWindowCounter:
+    """Event count over a sliding time window, kept in a ring of buckets
+
+    `add` and `total` are O(1) amortized and memory is fixed by the bucket
+    count, whatever the event volume.
+    """
+
+    __slots__ = ('bucket_width', 'counts', 'total', 'head')
+
+    def __init__(self, window=60, buckets=60):
+        self.bucket_width = window / buckets
+        self.counts = [0] * buckets
+        self.total = 0
+        self.head = None  # Indexul absolut al celui mai nou bucket
+
+    def _advance(self, bucket):
+        if self.head is None:
+            self.head = bucket
+            return
+        steps = bucket - self.head
+        if steps <= 0:
+            return
+        counts = self.counts
+        size = len(counts)
+        if steps >= size:
+            for i in range(size):
+                counts[i] = 0
+            self.total = 0
+        else:
+            for i in range(self.head + 1, bucket + 1):
+                slot = i % size
+                self.total -= counts[slot]
+                counts[slot] = 0
+        self.head = bucket
+
+    def add(self, ts, count=1):
+        bucket = int(ts // self.bucket_width)
+        self._advance(bucket)
+        if bucket <= self.head - len(self.counts):
+            return  # Mai vechi decât fereastra
+        self.counts[bucket % len(self.counts)] += count
+        self.total += count
+
+    def value(self, now):
+        """Events in the window ending at `now`"""
+        self._advance(int(now // self.bucket_width))
+        return self.total
+
+
+class RateTracker:
+    """Per-category, per-source and per-key burst detection over log findings
+
+    Keyed counters live in bounded LRU tables (`max_keys`), so memory stays
+    constant regardless of log volume or key cardinality. The rules are read
+    from `path` (JSON) and re-read when its mtime changes; `rules` are the
+    built-in fallback used while the file is absent.
+    """
+
+    def __init__(self, rules=None, path=DEFAULT_RATE_RULES_PATH, window=60, buckets=60,
+                 max_keys=1024, check_interval=2.0):
+        self.window = window
+        self.buckets = buckets
+        self.max_keys = max_keys
+        self.path = path
+        self.check_interval = check_interval
+        self.error = None
+        self.loaded_from = None
+        self._mtime = None
+        self._last_check = 0
+        self.default_rules = [self._compile_rule(rule) for rule in (rules if rules is not None else DEFAULT_RATE_RULES)]
+        self.rules = self.default_rules
+        self.category_counters = {c: SlidingWindowCounter(window, buckets) for c in CATEGORY_ORDER}
+        self.source_counters = OrderedDict()
+        self.rule_counters = OrderedDict()   # (index regulă, cheie) -> contor
+        self._last_alert = OrderedDict()     # (index regulă, cheie) -> ts
+        self.alerts_raised = 0
+        self.maybe_reload(force=True)
+
+    @staticmethod
+    def _compile_rule(rule):
+        """Validate and compile one rate rule (raises on an invalid rule)"""
+        compiled = dict(rule)
+        compiled.setdefault('window', 60)
+        compiled.setdefault('severity', 'SECURITY')
+        compiled.setdefault('scope', 'category')
+        compiled.setdefault('name', f"{compiled['scope']}-{compiled.get('category') or '*'}")
+        if compiled['scope'] not in ('category', 'source', 'key'):
+            raise ValueError(f"scope necunoscut: {compiled['scope']}")
+        if compiled['scope'] == 'key' and not rule.get('pattern'):
+            raise ValueError(f"regula {compiled['name']}: scope 'key' cere un pattern")
+        if compiled.get('category') and compiled['category'] not in CATEGORY_BITS:
+            raise ValueError(f"categorie necunoscută: {compiled['category']}")
+        if compiled['severity'] not in CATEGORY_BITS:
+            raise ValueError(f"severitate necunoscută: {compiled['severity']}")
+        for key in ('window', 'threshold'):
+            value = compiled[key]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"regula {compiled['name']}: {key} trebuie să fie un număr pozitiv")
+        compiled['regex'] = re.compile(rule['pattern'], re.IGNORECASE) if rule.get('pattern') else None
+        return compiled
+
+    def maybe_reload(self, force=False):
+        """Reload the rules if the config file changed; returns True on reload"""
+        if self.path is None:
+            return False
+        now = time.time()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+
+        if mtime is None:
+            # Fișierul a dispărut: revenim la pragurile implicite
+            self._set_rules(self.default_rules)
+            self.loaded_from = None
+            self.error = None
+            return True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            rules = [self._compile_rule(rule) for rule in config.get('rules', [])]
+            self._set_rules(rules)
+            self.loaded_from = self.path
+            self.error = None
+        except (OSError, ValueError, re.error, KeyError, TypeError, AttributeError) as e:
+            # Configurație invalidă: păstrăm regulile anterioare
+            self.error = str(e)
+        return True
+
+    def _set_rules(self, rules):
+        # Contoarele sunt indexate după poziția regulii: nu supraviețuiesc unei reîncărcări
+        self.rules = rules
+        self.rule_counters.clear()
+        self._last_alert.clear()
+
+    def _lru_counter(self, table, key, window):
+        counter = table.get(key)
+        if counter is None:
+            counter = SlidingWindowCounter(window, self.buckets)
+            table[key] = counter
+            if len(table) > self.max_keys:
+                table.popitem(last=False)
+        else:
+            table.move_to_end(key)
+        return counter
+
+    def observe(self, entry):
+        """Count one finding; returns the synthetic alert entries it triggers"""
+        ts = entry.ts
+        categories = entry.categories
+        source = entry.source
+
+        for category in categories:
+            counter = self.category_counters.get(category)
+            if counter is not None:
+                counter.add(ts)
+        self._lru_counter(self.source_counters, source, self.window).add(ts)
+
+        alerts = []
+        for index, rule in enumerate(self.rules):
+            wanted = rule.get('category')
+            if wanted and wanted not in categories:
+                continue
+            scope = rule.get('scope', 'category')
+            if scope == 'source':
+                key = source
+            elif scope == 'key':
+                match = rule['regex'].search(entry.line) if rule['regex'] else None
+                if match is None:
+                    continue
+                key = match.group(1) if match.groups() else match.group(0)
+            else:
+                key = wanted or '*'
+
+            counter = self._lru_counter(self.rule_counters, (index, key), rule['window'])
+            counter.add(ts)
+            if counter.total >= rule['threshold']:
+                alert = self._maybe_alert(index, rule, key, counter.total, ts)
+                if alert is not None:
+                    alerts.append(alert)
+        return alerts
+
+    def _maybe_alert(self, index, rule, key, count, ts):
+        # O alertă per (regulă, cheie) per fereastră
+        last = self._last_alert.get((index, key))
+        if last is not None and ts - last < rule['window']:
+            return None
+        self._last_alert[(index, key)] = ts
+        self._last_alert.move_to_end((index, key))
+        if len(self._last_alert) > self.max_keys:
+            self._last_alert.popitem(last=False)
+
+        self.alerts_raised += 1
+        message = (f"RATE ALERT {rule['name']}: {key} - {count} evenimente în "
+                   f"{rule['window']}s (prag {rule['threshold']})")
+        return LogEntry(ts, 'rate-detector', message, CATEGORY_BITS.get(rule['severity'], 0))
+
+    def category_rates(self, now):
+        """Findings per category in the current window"""
+        return {c: counter.value(now) for c, counter in self.category_counters.items()}
+
+    def top_sources(self, now, limit=3):
+        """Busiest sources in the current window"""
+        values = [(counter.value(now), source) for source, counter in self.source_counters.items()]
+        values = [v for v in values if v[0] > 0]
+        values.sort(reverse=True)
+        return [(source, count) for count, source in values[:limit]]
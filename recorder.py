@@ -0,0 +1,205 @@
+import bisect
+import json
+import os
+import struct
+import time
+import zlib
+from core.snapshot import build_snapshot, diff_snapshot, apply_delta
+
+# Fișier: MAGIC, apoi înregistrări [tip (K/D), timestamp, lungime] + date zlib.
+# Un cadru cheie (K) pornește un flux zlib nou și conține snapshot-ul complet;
+# delta-urile (D) continuă fluxul, deci se pot decoda doar de la cadrul cheie anterior.
+MAGIC = b'MSREC1\n'
+_RECORD = struct.Struct('>cdI')
+KEYFRAME = b'K'
+DELTA = b'D'
+
+
+def _scan_records(f, offset, records):
+    """Append (offset, kind, ts, length) for every complete record from `offset`; returns the end offset"""
+    f.seek(offset)
+    while True:
+        header = f.read(_RECORD.size)
+        if len(header) < _RECORD.size:
+            break
+        kind, ts, length = _RECORD.unpack(header)
+        if kind not in (KEYFRAME, DELTA):
+            break
+        f.seek(length, os.SEEK_CUR)
+        if f.tell() > os.fstat(f.fileno()).st_size:
+            break  # Înregistrare trunchiată (în curs de scriere sau oprire bruscă)
+        records.append((offset, kind, ts, length))
+        offset += _RECORD.size + length
+    return offset
+
+
+def compact_delta(previous, delta):
+    """Rows where only CPU/MEM changed shrink to [cpu, mem] (most changes on a busy host)"""
+    old = previous['processes']
+    changed = delta['changed']
+    for pid, row in changed.items():
+        prev = old.get(pid)
+        if prev is not None and prev[:2] == row[:2] and prev[4:] == row[4:]:
+            changed[pid] = row[2:4]
+    return delta
+
+
+def expand_delta(state, delta):
+    """Inverse of compact_delta, against the state the delta applies to"""
+    processes = state['processes']
+    changed = delta['changed']
+    for pid, row in changed.items():
+        if len(row) == 2:
+            full = list(processes[pid])
+            full[2:4] = row
+            changed[pid] = full
+    return delta
+
+
+class SessionRecorder:
+    """Appends monitor snapshots to a compressed, delta-encoded recording
+
+    Each tick stores only what changed since the previous one; a full
+    keyframe every `keyframe_interval` seconds bounds how much a seek has
+    to decode. The file is append-only and flushed per record, so a crash
+    loses at most the record being written.
+    """
+
+    def __init__(self, path, interval=2.0, keyframe_interval=300.0, level=6):
+        self.path = path
+        self.interval = interval
+        self.keyframe_interval = keyframe_interval
+        self.level = level
+        self._file = open(path, 'a+b')
+        self._file.seek(0)
+        magic = self._file.read(len(MAGIC))
+        if not magic:
+            self._file.write(MAGIC)
+        elif magic != MAGIC:
+            self._file.close()
+            raise ValueError(f'{path} nu este o înregistrare a monitorului')
+        else:
+            # Continuare: se taie o eventuală înregistrare incompletă de la final
+            end = _scan_records(self._file, len(MAGIC), [])
+            self._file.truncate(end)
+        self._file.seek(0, os.SEEK_END)
+        self._compressor = None
+        self._state = None
+        self._last_finding_id = None
+        self._last_record = 0
+        self._last_keyframe = 0
+        self.frames = 0
+        self.bytes_written = self._file.tell()
+
+    def maybe_record(self, monitor, force=False):
+        """Record a tick if `interval` has elapsed; returns True when something was written"""
+        now = time.time()
+        if not force and now - self._last_record < self.interval:
+            return False
+        started = time.perf_counter()
+        keyframe = self._state is None or now - self._last_keyframe >= self.keyframe_interval
+        snapshot = build_snapshot(monitor, None if keyframe else self._last_finding_id)
+        if snapshot['findings']:
+            self._last_finding_id = max(row[0] for row in snapshot['findings'])
+
+        if keyframe:
+            self._compressor = zlib.compressobj(self.level)
+            message = snapshot
+            self._last_keyframe = now
+        else:
+            message = compact_delta(self._state, diff_snapshot(self._state, snapshot))
+        self._state = snapshot
+
+        payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+        data = self._compressor.compress(payload) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        self._file.write(_RECORD.pack(KEYFRAME if keyframe else DELTA, now, len(data)) + data)
+        self._file.flush()
+        self.bytes_written += _RECORD.size + len(data)
+        self.frames += 1
+        self._last_record = now
+        monitor.record_timing('record', started)
+        return True
+
+    def close(self):
+        self._file.close()
+
+
+class RecordingReader:
+    """Random access to a recording: seek decodes from the nearest keyframe
+
+    Sequential reads continue from the current position, so normal playback
+    decodes every record once. `refresh()` picks up records appended by a
+    recorder that is still running.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(f'{path} nu este o înregistrare a monitorului')
+        self.records = []
+        self.timestamps = []
+        self._keyframes = []  # indici în `records`
+        self._end = len(MAGIC)
+        self._cursor = None
+        self._state = None
+        self._decompressor = None
+        self.refresh()
+
+    def refresh(self):
+        """Index records appended since the last call; returns how many were added"""
+        before = len(self.records)
+        self._end = _scan_records(self._file, self._end, self.records)
+        for index in range(before, len(self.records)):
+            _, kind, ts, _ = self.records[index]
+            self.timestamps.append(ts)
+            if kind == KEYFRAME:
+                self._keyframes.append(index)
+        return len(self.records) - before
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def start_ts(self):
+        return self.timestamps[0] if self.timestamps else 0.0
+
+    @property
+    def end_ts(self):
+        return self.timestamps[-1] if self.timestamps else 0.0
+
+    def index_at(self, ts):
+        """Index of the last record at or before `ts` (0 before the start)"""
+        return max(0, bisect.bisect_right(self.timestamps, ts) - 1)
+
+    def state_at(self, index):
+        """Reconstructed snapshot after record `index` (shared; do not modify)"""
+        if not self._keyframes or index < self._keyframes[0]:
+            return None
+        keyframe = self._keyframes[bisect.bisect_right(self._keyframes, index) - 1]
+        if self._cursor is None or index < self._cursor or keyframe > self._cursor:
+            start = keyframe
+        elif index == self._cursor:
+            return self._state
+        else:
+            start = self._cursor + 1
+        for position in range(start, index + 1):
+            self._apply(position)
+        return self._state
+
+    def _apply(self, position):
+        offset, kind, _, length = self.records[position]
+        self._file.seek(offset + _RECORD.size)
+        data = self._file.read(length)
+        if kind == KEYFRAME:
+            self._decompressor = zlib.decompressobj()
+        message = json.loads(self._decompressor.decompress(data))
+        if kind == KEYFRAME:
+            self._state = message
+        else:
+            apply_delta(self._state, expand_delta(self._state, message))
+        self._cursor = position
+
+    def close(self):
+        self._file.close()
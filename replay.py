@@ -0,0 +1,215 @@
+import curses
+import time
+import zlib
+from collections import Counter
+from datetime import datetime
+from types import SimpleNamespace
+from core.log_entry import LogEntry
+from core.pid_findings import PidFindingIndex
+from core.recorder import RecordingReader
+from ui.utils import init_colors, draw_system_stats
+from ui.process_view import draw_process_list
+from ui.log_view import draw_suspicious_logs
+
+SPEEDS = [0.25, 0.5, 1, 2, 4, 8, 16, 32, 64]
+SEEK_SHORT = 10    # ←/→
+SEEK_LONG = 300    # PgUp/PgDn
+LOG_FILTERS = ['ALL', 'CRITICAL', 'SECURITY', 'NETWORK', 'SYSTEM', 'WARNING']
+
+
+def format_offset(seconds):
+    seconds = int(max(0, seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class ReplayMonitor:
+    """Plays a recording back through the live process and log views (main.py --replay)
+
+    Exposes the attributes `draw_process_list` and `draw_suspicious_logs`
+    read from SystemMonitor, filled from the reconstructed snapshot instead
+    of /proc and the log files.
+    """
+
+    def __init__(self, path):
+        self.reader = RecordingReader(path)
+        self.position = self.reader.start_ts
+        self.paused = False
+        self.speed_index = SPEEDS.index(1)
+        self.index = None
+        self.error = None
+        self.snapshot = None
+
+        # Starea citită de vederile de procese/log-uri
+        self.current_tab = 0
+        self.processes_cache = []
+        self.suspicious_count = 0
+        self.sort_by = 'cpu'
+        self.sort_reverse = True
+        self.selected_process_pid = None
+        self.selected_process_index = None
+        self.process_scroll_offset = 0
+        self.show_only_suspicious = False
+        self.show_only_network = False
+        self.socket_index = None
+        self.suspicious_logs = []
+        self.log_scroll_offset = 0
+        self.log_filter = 'ALL'
+        self.log_time_window = None
+        self.log_search_query = ''
+        self.log_search_typing = False
+        self.log_grouped = False
+        self.last_log_scan = 0
+        self.detector = SimpleNamespace(store=None, debug_stats={}, log_categories=Counter(),
+                                        pid_findings=PidFindingIndex())
+        self.stats = {}
+
+    def seek(self, ts):
+        self.position = min(max(ts, self.reader.start_ts), self.reader.end_ts)
+
+    def load(self, index):
+        """Rebuild the view state from the snapshot after record `index`"""
+        try:
+            snapshot = self.reader.state_at(index)
+        except (zlib.error, ValueError, KeyError) as e:
+            self.error = f"Înregistrare coruptă la cadrul {index}: {e}"
+            self.paused = True
+            return
+        if snapshot is None:
+            return
+        self.index = index
+        self.snapshot = snapshot
+        self.stats = dict(snapshot['stats'])
+
+        processes = []
+        for pid, (name, user, cpu, mem, rule, cmdline) in snapshot['processes'].items():
+            info = {'pid': int(pid), 'name': name, 'username': user, 'cpu_percent': cpu,
+                    'memory_percent': mem, 'cmdline': [cmdline] if cmdline else []}
+            if rule:
+                info['rule'] = rule
+            processes.append((None, bool(rule), info))
+        self.processes_cache = processes
+        self.suspicious_count = snapshot['suspicious']
+
+        logs = []
+        pid_findings = self.detector.pid_findings
+        pid_findings.clear()
+        for finding_id, ts, source, mask, pid, line in reversed(snapshot['findings']):
+            entry = LogEntry(ts, source, line, mask, pid)
+            entry.id = finding_id
+            logs.append(entry)
+            pid_findings.add(entry)
+        self.suspicious_logs = logs
+        self.detector.log_categories = Counter(snapshot['categories'])
+        self.detector.debug_stats = {'total_entries': sum(snapshot['categories'].values()),
+                                     'returned_entries': len(logs), 'cache_size': len(logs)}
+        self.last_log_scan = snapshot['ts']
+
+    def advance(self, elapsed):
+        """Move the playback clock and load the record under it"""
+        if not self.paused:
+            self.position += elapsed * SPEEDS[self.speed_index]
+            if self.position >= self.reader.end_ts:
+                # Înregistrarea poate fi încă scrisă: se așteaptă cadre noi la final
+                self.reader.refresh()
+                self.position = min(self.position, self.reader.end_ts)
+        index = self.reader.index_at(self.position)
+        if index != self.index:
+            self.load(index)
+
+    def draw_status(self, stdscr, height, width):
+        if self.snapshot is None:
+            state = "Înregistrare goală"
+        else:
+            moment = datetime.fromtimestamp(self.snapshot['ts']).strftime('%Y-%m-%d %H:%M:%S')
+            mode = "⏸ PAUZĂ" if self.paused else f"▶ x{SPEEDS[self.speed_index]:g}"
+            state = (f"REDARE {self.snapshot.get('host', '')} | {moment} | {mode} | "
+                     f"{format_offset(self.position - self.reader.start_ts)} / "
+                     f"{format_offset(self.reader.end_ts - self.reader.start_ts)} | "
+                     f"Cadru {self.index + 1}/{len(self.reader)}")
+        help_text = ("SPAȚIU:pauză | +/-:viteză | ←/→:±10s | PgUp/PgDn:±5m | Home/End:început/sfârșit"
+                     " | TAB:schimbă | ↑/↓:derulează | C/M/R:sortare | F:filtru | Q:ieșire")
+        try:
+            stdscr.addstr(height - 2, 2, (self.error or state)[:width - 4],
+                          curses.color_pair(3) if self.error else curses.A_BOLD | curses.color_pair(2))
+            stdscr.move(height - 1, 0)
+            stdscr.clrtoeol()
+            stdscr.addstr(height - 1, 2, help_text[:width - 4], curses.A_DIM)
+        except curses.error:
+            pass
+
+    def handle_key(self, key):
+        """Returns False when the replay should end"""
+        if key in [ord('q'), ord('Q'), 27]:
+            return False
+        if key == ord(' '):
+            self.paused = not self.paused
+        elif key in [ord('+'), ord('=')]:
+            self.speed_index = min(len(SPEEDS) - 1, self.speed_index + 1)
+        elif key in [ord('-'), ord('_')]:
+            self.speed_index = max(0, self.speed_index - 1)
+        elif key == curses.KEY_RIGHT:
+            self.seek(self.position + SEEK_SHORT)
+        elif key == curses.KEY_LEFT:
+            self.seek(self.position - SEEK_SHORT)
+        elif key == curses.KEY_NPAGE:
+            self.seek(self.position + SEEK_LONG)
+        elif key == curses.KEY_PPAGE:
+            self.seek(self.position - SEEK_LONG)
+        elif key == curses.KEY_HOME:
+            self.seek(self.reader.start_ts)
+        elif key == curses.KEY_END:
+            self.reader.refresh()
+            self.seek(self.reader.end_ts)
+        elif key == ord('\t'):
+            self.current_tab = (self.current_tab + 1) % 2
+            self.process_scroll_offset = 0
+            self.log_scroll_offset = 0
+        elif key == curses.KEY_UP:
+            if self.current_tab == 0:
+                self.process_scroll_offset = max(0, self.process_scroll_offset - 1)
+            else:
+                self.log_scroll_offset = max(0, self.log_scroll_offset - 1)
+        elif key == curses.KEY_DOWN:
+            if self.current_tab == 0:
+                self.process_scroll_offset = min(max(0, len(self.processes_cache) - 1),
+                                                 self.process_scroll_offset + 1)
+            else:
+                self.log_scroll_offset += 1
+        elif self.current_tab == 0 and key in [ord('c'), ord('C')]:
+            self.sort_by = 'cpu'
+        elif self.current_tab == 0 and key in [ord('m'), ord('M')]:
+            self.sort_by = 'memory'
+        elif self.current_tab == 0 and key in [ord('r'), ord('R')]:
+            self.sort_reverse = not self.sort_reverse
+        elif self.current_tab == 1 and key in [ord('f'), ord('F')]:
+            self.log_filter = LOG_FILTERS[(LOG_FILTERS.index(self.log_filter) + 1) % len(LOG_FILTERS)]
+            self.log_scroll_offset = 0
+        return True
+
+    def run(self, stdscr):
+        init_colors()
+        curses.curs_set(0)
+        stdscr.nodelay(1)
+        stdscr.timeout(100)
+        last = time.monotonic()
+        try:
+            while True:
+                now = time.monotonic()
+                self.advance(now - last)
+                last = now
+
+                height, width = stdscr.getmaxyx()
+                stdscr.erase()
+                draw_system_stats(stdscr, self.stats)
+                if self.current_tab == 0:
+                    draw_process_list(stdscr, height, width, self)
+                else:
+                    draw_suspicious_logs(stdscr, height, width, self)
+                self.draw_status(stdscr, height, width)
+                stdscr.refresh()
+
+                key = stdscr.getch()
+                if key != -1 and not self.handle_key(key):
+                    break
+        finally:
+            self.reader.close()
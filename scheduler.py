@@ -0,0 +1,102 @@
+import os
+import time
+
+# Bugetul implicit: 2% dintr-un nucleu pentru tot monitorul
+DEFAULT_BUDGET = 0.02
+# Colectările unui tab ascuns (rulate doar pentru înregistrare/metrici) se rar de atâtea ori
+HIDDEN_BACKOFF = 4.0
+# Peste load/nuclee = 1 intervalele cresc proporțional, până la această limită
+MAX_LOAD_BACKOFF = 4.0
+# Cât din buget rămâne pentru colectări chiar dacă restul monitorului îl consumă
+MIN_BUDGET_SHARE = 0.25
+# Netezirea costului măsurat (EWMA)
+COST_ALPHA = 0.3
+UPDATE_INTERVAL = 2.0
+
+
+class ScheduledTask:
+    """One periodic collection with its measured cost and current interval"""
+
+    __slots__ = ('name', 'interval', 'min_interval', 'max_interval', 'weight', 'cost', 'runs')
+
+    def __init__(self, name, interval, min_interval, max_interval, weight):
+        self.name = name
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.weight = weight
+        self.cost = None  # secunde CPU per rulare
+        self.runs = 0
+
+
+class AdaptiveScheduler:
+    """Refresh intervals sized to keep the monitor's own CPU within a budget
+
+    Each collection reports the CPU time it used; its interval becomes the
+    time it takes for that cost to fit in its weighted share of the budget
+    (cheap collections run more often, expensive ones less). The CPU the
+    rest of the process spends (drawing, sampling, background threads) is
+    measured from process_time, plus what worker processes report (not part
+    of process_time), and taken out of the budget first. Intervals grow with
+    the system load average and for tabs that are not visible.
+    """
+
+    def __init__(self, budget=DEFAULT_BUDGET):
+        self.budget = budget
+        self.tasks = {}
+        self.load_factor = 1.0
+        self.cpu_percent = 0.0  # CPU-ul propriu măsurat, % dintr-un nucleu
+        self.overhead = 0.0     # CPU/s în afara colectărilor programate
+        self._task_cpu = 0.0
+        self._mark = (time.monotonic(), time.process_time(), 0.0)
+        try:
+            self._cpus = len(os.sched_getaffinity(0))
+        except (AttributeError, OSError):
+            self._cpus = os.cpu_count() or 1
+
+    def add(self, name, interval, min_interval, max_interval, weight=1.0):
+        self.tasks[name] = ScheduledTask(name, interval, min_interval, max_interval, weight)
+
+    def interval(self, name, hidden=False):
+        """Effective interval of a task (longer while its view is hidden)"""
+        interval = self.tasks[name].interval
+        return interval * HIDDEN_BACKOFF if hidden else interval
+
+    def record(self, name, cpu_seconds):
+        """Report the CPU time one run of a task took"""
+        task = self.tasks[name]
+        task.cost = cpu_seconds if task.cost is None else task.cost + COST_ALPHA * (cpu_seconds - task.cost)
+        task.runs += 1
+        self._task_cpu += cpu_seconds
+        self._resize(task)
+
+    def update(self, worker_cpu=0.0):
+        """Re-measure the process CPU and the system load (at most every UPDATE_INTERVAL)
+
+        `worker_cpu` is the cumulative CPU time of worker processes (archive scan pool).
+        """
+        now, cpu = time.monotonic(), time.process_time()
+        elapsed = now - self._mark[0]
+        if elapsed < UPDATE_INTERVAL:
+            return False
+        used = cpu - self._mark[1] + max(0.0, worker_cpu - self._mark[2])
+        self.cpu_percent = used / elapsed * 100
+        self.overhead = max(0.0, used - self._task_cpu) / elapsed
+        self._task_cpu = 0.0
+        self._mark = (now, cpu, worker_cpu)
+        try:
+            load = os.getloadavg()[0] / self._cpus
+        except OSError:
+            load = 0.0
+        self.load_factor = min(MAX_LOAD_BACKOFF, max(1.0, load))
+        for task in self.tasks.values():
+            self._resize(task)
+        return True
+
+    def _resize(self, task):
+        if task.cost is None:
+            return
+        available = max(self.budget - self.overhead, self.budget * MIN_BUDGET_SHARE)
+        share = available * task.weight / sum(t.weight for t in self.tasks.values())
+        interval = max(task.min_interval, task.cost / share) * self.load_factor
+        task.interval = min(task.max_interval, interval)
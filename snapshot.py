@@ -0,0 +1,131 @@
+import json
+import socket
+import struct
+import time
+
+# Cadru pe fir: lungime (4 octeți, big-endian) + JSON compact UTF-8
+_LENGTH = struct.Struct('>I')
+MAX_FRAME = 16 * 1024 * 1024
+
+STAT_KEYS = ('cpu_percent', 'mem_percent', 'disk_percent', 'net_percent', 'load_avg',
+             'boot_time', 'process_count', 'per_core')
+CMDLINE_LIMIT = 200
+FINDINGS_LIMIT = 200
+
+
+def process_row(is_suspicious, info):
+    """Compact, comparable row for one process: [name, user, cpu, mem, rule, cmdline]"""
+    rule = (info.get('rule') or '*') if is_suspicious else ''
+    return [info.get('name') or '', info.get('username') or '',
+            round(info.get('cpu_percent') or 0.0, 1), round(info.get('memory_percent') or 0.0, 1),
+            rule, ' '.join(info.get('cmdline') or [])[:CMDLINE_LIMIT]]
+
+
+def finding_row(entry):
+    return [entry.id, entry.ts, entry.source, entry.mask, entry.pid, entry.line[:300]]
+
+
+def build_snapshot(monitor, last_finding_id=None):
+    """Snapshot of a monitor's cached state (no /proc walks, no log scans)
+
+    Findings are chosen by id, in id order: with `last_finding_id`, only
+    findings retained after it are included (archive backfill and process
+    events get new ids with older timestamps). When more than FINDINGS_LIMIT
+    are new, the newest are sent and `findings_omitted` counts the rest.
+    """
+    stats = monitor.stats_sampler.stats
+    processes = {}
+    for _, is_suspicious, info in monitor.processes_cache:
+        processes[str(info['pid'])] = process_row(is_suspicious, info)
+
+    findings = []
+    newest_id = None
+    for entry in reversed(monitor.detector.recent_by_id):
+        if newest_id is None:
+            newest_id = entry.id
+        if last_finding_id is not None and entry.id <= last_finding_id:
+            break
+        if len(findings) >= FINDINGS_LIMIT:
+            break
+        findings.append(finding_row(entry))
+    findings.reverse()
+    # Id-urile intrărilor reținute sunt consecutive: ce lipsește între ultimul trimis și cele noi a fost omis
+    omitted = 0
+    if last_finding_id is not None and newest_id is not None:
+        omitted = max(0, newest_id - last_finding_id - len(findings))
+
+    return {
+        'host': socket.gethostname(),
+        'ts': time.time(),
+        'stats': {key: stats.get(key) for key in STAT_KEYS},
+        'processes': processes,
+        'suspicious': monitor.suspicious_count,
+        'categories': dict(monitor.detector.log_categories),
+        'findings': findings,
+        'findings_omitted': omitted,
+    }
+
+
+def diff_snapshot(previous, current):
+    """Delta from `previous` to `current`: changed/new process rows, removed pids, new findings"""
+    old = previous['processes']
+    new = current['processes']
+    changed = {pid: row for pid, row in new.items() if old.get(pid) != row}
+    removed = [pid for pid in old if pid not in new]
+    delta = {key: value for key, value in current.items() if key != 'processes'}
+    delta['changed'] = changed
+    delta['removed'] = removed
+    return delta
+
+
+def apply_delta(state, delta):
+    """Apply a delta in place to a full snapshot; findings are appended (bounded)"""
+    processes = state['processes']
+    for pid in delta['removed']:
+        processes.pop(pid, None)
+    processes.update(delta['changed'])
+    for key, value in delta.items():
+        if key not in ('changed', 'removed', 'findings', 'findings_omitted'):
+            state[key] = value
+    # Găsirile omise se adună peste toate delta-urile
+    state['findings_omitted'] = state.get('findings_omitted', 0) + delta.get('findings_omitted', 0)
+    findings = state['findings']
+    findings.extend(delta['findings'])
+    if len(findings) > FINDINGS_LIMIT:
+        del findings[:len(findings) - FINDINGS_LIMIT]
+    return state
+
+
+def encode_frame(message):
+    payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    return _LENGTH.pack(len(payload)) + payload
+
+
+class FrameReader:
+    """Reassembles length-prefixed JSON frames from a byte stream"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Add received bytes; returns the complete messages"""
+        self._buffer.extend(data)
+        messages = []
+        while len(self._buffer) >= _LENGTH.size:
+            length = _LENGTH.unpack_from(self._buffer)[0]
+            if length > MAX_FRAME:
+                raise ValueError(f'cadru prea mare: {length}')
+            end = _LENGTH.size + length
+            if len(self._buffer) < end:
+                break
+            messages.append(json.loads(self._buffer[_LENGTH.size:end]))
+            del self._buffer[:end]
+        return messages
+
+
+def parse_address(address):
+    """'unix:/path' or '[host:]port' -> (family, sockaddr)"""
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[5:]
+    host, _, port = address.rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
@@ -0,0 +1,121 @@
+import os
+import socket
+import time
+from collections import namedtuple
+
+# Stările TCP din /proc/net/tcp* (câmpul "st", hexazecimal)
+TCP_STATES = {
+    '01': 'ESTABLISHED', '02': 'SYN_SENT', '03': 'SYN_RECV', '04': 'FIN_WAIT1',
+    '05': 'FIN_WAIT2', '06': 'TIME_WAIT', '07': 'CLOSE', '08': 'CLOSE_WAIT',
+    '09': 'LAST_ACK', '0A': 'LISTEN', '0B': 'CLOSING',
+}
+
+SocketEntry = namedtuple('SocketEntry', ['proto', 'state', 'local', 'remote', 'inode'])
+
+
+def decode_address(hex_addr):
+    """Convert an 'ADDR:PORT' hex pair from /proc/net into (ip, port)"""
+    addr, port = hex_addr.split(':')
+    raw = bytes.fromhex(addr)
+    try:
+        if len(raw) == 4:
+            ip = socket.inet_ntop(socket.AF_INET, raw[::-1])
+        else:
+            # IPv6: four 32-bit words, each in host (little-endian) order
+            ip = socket.inet_ntop(socket.AF_INET6,
+                                  b''.join(raw[i:i + 4][::-1] for i in range(0, 16, 4)))
+    except (ValueError, OSError):
+        ip = '?'
+    return ip, int(port, 16)
+
+
+class SocketIndex:
+    """Socket inode index built from a single /proc/net parse per refresh"""
+
+    PROC_NET_FILES = (('tcp', 'tcp'), ('tcp6', 'tcp'), ('udp', 'udp'), ('udp6', 'udp'))
+
+    def __init__(self, proc_root='/proc'):
+        self.proc_root = proc_root
+        self.sockets = {}       # inode -> SocketEntry
+        self._pid_inodes = {}   # pid -> frozenset de inode-uri, valid până la următorul refresh
+        self.last_refresh = 0
+
+    def refresh(self):
+        """Re-read /proc/net/{tcp,udp}[6] once and drop the per-pid cache"""
+        sockets = {}
+        for file_name, proto in self.PROC_NET_FILES:
+            path = os.path.join(self.proc_root, 'net', file_name)
+            try:
+                with open(path, 'r') as f:
+                    next(f, None)  # Header
+                    for line in f:
+                        fields = line.split()
+                        if len(fields) < 10:
+                            continue
+                        inode = int(fields[9])
+                        if inode == 0:
+                            continue
+                        sockets[inode] = SocketEntry(proto, fields[3], fields[1], fields[2], inode)
+            except OSError:
+                continue
+
+        self.sockets = sockets
+        self._pid_inodes = {}
+        self.last_refresh = time.time()
+
+    def inodes_for_pid(self, pid):
+        """Return the socket inodes held by a process (cached until next refresh)"""
+        cached = self._pid_inodes.get(pid)
+        if cached is not None:
+            return cached
+
+        inodes = set()
+        fd_dir = os.path.join(self.proc_root, str(pid), 'fd')
+        try:
+            for fd in os.listdir(fd_dir):
+                try:
+                    target = os.readlink(os.path.join(fd_dir, fd))
+                except OSError:
+                    continue
+                if target.startswith('socket:['):
+                    inodes.add(int(target[8:-1]))
+        except OSError:
+            pass
+
+        result = frozenset(inodes)
+        self._pid_inodes[pid] = result
+        return result
+
+    def connections_for_pid(self, pid, inodes=None):
+        """Return the inet sockets (SocketEntry) owned by a process (`inodes` if already known)"""
+        sockets = self.sockets
+        if inodes is None:
+            inodes = self.inodes_for_pid(pid)
+        return [sockets[i] for i in inodes if i in sockets]
+
+    def has_network(self, pid):
+        """Check whether the process holds at least one inet socket"""
+        sockets = self.sockets
+        return any(i in sockets for i in self.inodes_for_pid(pid))
+
+    def summarize_pid(self, pid, inodes=None):
+        """Return (listening ports, established peers, total sockets) for a process"""
+        listening = set()
+        established = []
+        conns = self.connections_for_pid(pid, inodes)
+
+        for entry in conns:
+            if entry.proto == 'tcp':
+                if entry.state == '0A':
+                    listening.add(('tcp', decode_address(entry.local)[1]))
+                elif entry.state == '01':
+                    established.append(decode_address(entry.remote))
+            else:
+                # UDP fără peer = socket legat (echivalentul unui port ascultat)
+                remote_ip, remote_port = decode_address(entry.remote)
+                if remote_port == 0:
+                    listening.add(('udp', decode_address(entry.local)[1]))
+                else:
+                    established.append((remote_ip, remote_port))
+
+        return sorted(listening), established, len(conns)
@@ -0,0 +1,208 @@
+import os
+import time
+import psutil
+from array import array
+
+# Câmpurile din /proc/stat folosite pentru contabilizarea CPU (guest e deja inclus în user)
+CPU_FIELDS = ('user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal')
+CPU_FIELD_COUNT = len(CPU_FIELDS)
+CPU_IDLE_INDEX = CPU_FIELDS.index('idle')
+CPU_IOWAIT_INDEX = CPU_FIELDS.index('iowait')
+
+# Cadențe implicite (secunde) pentru fiecare metrică
+DEFAULT_CADENCES = {
+    'cpu': 1.0,
+    'memory': 1.0,
+    'network': 1.0,
+    'load': 2.0,
+    'disk': 10.0,
+}
+
+
+def cpu_busy_percent(row):
+    """Busy share of a CPU breakdown row (everything except idle and iowait)"""
+    return max(0.0, min(100.0, 100.0 - row[CPU_IDLE_INDEX] - row[CPU_IOWAIT_INDEX]))
+
+
+class SystemStatsSampler:
+    """Batch reader for /proc system stats with per-metric refresh cadences
+
+    The UI only reads `self.stats`; all I/O happens in `tick()`, which reads
+    the /proc files of every metric that is due in a single batch.
+    """
+
+    def __init__(self, proc_root='/proc', cadences=None, disk_path='/', max_net_speed_mbps=100):
+        self.proc_root = proc_root
+        self.cadences = dict(DEFAULT_CADENCES)
+        if cadences:
+            self.cadences.update(cadences)
+        self.disk_path = disk_path
+        self.max_net_speed_mbps = max_net_speed_mbps
+
+        self.stats = {
+            'cpu_percent': 0.0,
+            'cpu_breakdown': {},
+            'per_core': [],
+            'per_core_breakdown': [],
+            'mem_percent': 0.0,
+            'disk_percent': 0.0,
+            'net_percent': 0.0,
+            'load_avg': [0.0, 0.0, 0.0],
+            'boot_time': None,
+            'process_count': 0,
+        }
+        self._last_run = {}
+        self._prev_cpu = None
+        self._prev_net = None
+
+    def _read(self, name):
+        """Read a /proc file, returning None when it is not available"""
+        try:
+            with open(os.path.join(self.proc_root, name), 'r') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set_process_count(self, count):
+        """Take the process count from the process snapshot instead of listing /proc"""
+        self.stats['process_count'] = count
+
+    def due_metrics(self, now):
+        """Return the metrics whose cadence has elapsed"""
+        return [name for name, cadence in self.cadences.items()
+                if now - self._last_run.get(name, 0) >= cadence]
+
+    def tick(self, now=None):
+        """Refresh every due metric; returns the list of refreshed metrics"""
+        if now is None:
+            now = time.time()
+
+        due = self.due_metrics(now)
+        if not due:
+            return due
+
+        # Citește o singură dată fiecare fișier /proc necesar acestui batch
+        if 'cpu' in due or self.stats['boot_time'] is None:
+            self._update_cpu(self._read('stat'))
+        if 'memory' in due:
+            self._update_memory(self._read('meminfo'))
+        if 'network' in due:
+            self._update_network(self._read('net/dev'), now)
+        if 'load' in due:
+            self._update_load(self._read('loadavg'))
+        if 'disk' in due:
+            self._update_disk()
+
+        for name in due:
+            self._last_run[name] = now
+        return due
+
+    def _update_cpu(self, content):
+        if content is None:
+            try:
+                self.stats['cpu_percent'] = psutil.cpu_percent(interval=None)
+                if self.stats['boot_time'] is None:
+                    self.stats['boot_time'] = psutil.boot_time()
+            except Exception:
+                pass
+            return
+
+        # Rândul agregat "cpu" urmat de "cpuN", toate aplatizate într-un singur vector
+        counters = array('q')
+        for line in content.splitlines():
+            if line.startswith('cpu'):
+                fields = line.split()[1:CPU_FIELD_COUNT + 1]
+                fields += ['0'] * (CPU_FIELD_COUNT - len(fields))
+                counters.extend(int(v) for v in fields)
+            elif line.startswith('btime '):
+                self.stats['boot_time'] = float(line.split()[1])
+
+        prev = self._prev_cpu
+        self._prev_cpu = counters
+        if prev is None or len(prev) != len(counters):
+            # Prima citire sau nuclee adăugate/scoase (hotplug)
+            return
+
+        deltas = [c - p for c, p in zip(counters, prev)]
+        rows = []
+        for start in range(0, len(deltas), CPU_FIELD_COUNT):
+            row = deltas[start:start + CPU_FIELD_COUNT]
+            total = sum(row)
+            if total > 0:
+                rows.append(tuple(v * 100.0 / total for v in row))
+            else:
+                rows.append((0.0,) * CPU_IDLE_INDEX + (100.0,) + (0.0,) * (CPU_FIELD_COUNT - CPU_IDLE_INDEX - 1))
+
+        aggregate = rows[0]
+        self.stats['cpu_breakdown'] = dict(zip(CPU_FIELDS, aggregate))
+        self.stats['cpu_percent'] = cpu_busy_percent(aggregate)
+        self.stats['per_core'] = [cpu_busy_percent(row) for row in rows[1:]]
+        self.stats['per_core_breakdown'] = rows[1:]
+
+    def _update_memory(self, content):
+        if content is None:
+            try:
+                self.stats['mem_percent'] = psutil.virtual_memory().percent
+            except Exception:
+                pass
+            return
+
+        fields = {}
+        for line in content.splitlines():
+            key, _, value = line.partition(':')
+            if key in ('MemTotal', 'MemAvailable', 'MemFree', 'Buffers', 'Cached'):
+                fields[key] = int(value.split()[0])
+
+        total = fields.get('MemTotal', 0)
+        if total > 0:
+            available = fields.get('MemAvailable')
+            if available is None:
+                available = fields.get('MemFree', 0) + fields.get('Buffers', 0) + fields.get('Cached', 0)
+            self.stats['mem_percent'] = (total - available) / total * 100
+
+    def _update_network(self, content, now):
+        if content is None:
+            try:
+                counters = psutil.net_io_counters()
+                total_bytes = counters.bytes_sent + counters.bytes_recv
+            except Exception:
+                return
+        else:
+            total_bytes = 0
+            for line in content.splitlines()[2:]:
+                _, _, data = line.partition(':')
+                values = data.split()
+                if len(values) >= 9:
+                    total_bytes += int(values[0]) + int(values[8])
+
+        if self._prev_net is not None:
+            prev_bytes, prev_time = self._prev_net
+            time_diff = now - prev_time
+            if time_diff > 0:
+                bytes_per_sec = max(0, total_bytes - prev_bytes) / time_diff
+                mbps = (bytes_per_sec * 8) / 1_000_000
+                self.stats['net_percent'] = min(100.0, (mbps / self.max_net_speed_mbps) * 100)
+        self._prev_net = (total_bytes, now)
+
+    def _update_load(self, content):
+        try:
+            if content is not None:
+                self.stats['load_avg'] = [float(v) for v in content.split()[:3]]
+            else:
+                self.stats['load_avg'] = list(os.getloadavg())
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def _update_disk(self):
+        try:
+            st = os.statvfs(self.disk_path)
+            total = st.f_blocks * st.f_frsize
+            used = (st.f_blocks - st.f_bfree) * st.f_frsize
+            if total > 0:
+                self.stats['disk_percent'] = used / total * 100
+        except (OSError, AttributeError):
+            try:
+                disk = psutil.disk_usage(self.disk_path)
+                self.stats['disk_percent'] = (disk.used / disk.total) * 100
+            except Exception:
+                pass
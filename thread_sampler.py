@@ -0,0 +1,129 @@
+import os
+import time
+
+CLK_TCK = os.sysconf('SC_CLK_TCK')
+
+# Thread-uri deja văzute active, recitite la fiecare eșantion chiar dacă procesul are mii
+HOT_THREADS = 64
+
+
+class ThreadSample:
+    """One thread of the sampled process"""
+
+    __slots__ = ('tid', 'name', 'state', 'cpu_percent', 'processor', 'ticks', 'sampled_at')
+
+    def __init__(self, tid):
+        self.tid = tid
+        self.name = '?'
+        self.state = '?'
+        self.cpu_percent = None
+        self.processor = None
+        self.ticks = None
+        self.sampled_at = None
+
+
+def read_thread_stat(path):
+    """(name, state, utime+stime ticks, processor) from a task's stat file, None if it is gone"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    # Numele poate conține spații și paranteze: câmpurile încep după ultimul ')'
+    start = data.find(b'(')
+    end = data.rfind(b')')
+    fields = data[end + 2:].split()
+    if start < 0 or len(fields) < 37:
+        return None
+    name = data[start + 1:end].decode('utf-8', 'replace')
+    return name, fields[0].decode(), int(fields[11]) + int(fields[12]), int(fields[36])
+
+
+class ThreadSampler:
+    """Per-thread CPU usage of one process, from /proc/[pid]/task/*/stat
+
+    Only sampled while the thread view is open. At most `max_reads` stat
+    files are read per sample; a process with more threads is covered
+    round-robin over several samples, each thread's CPU% computed over its
+    own elapsed time, so the cost per refresh stays bounded. Threads already
+    seen busy are re-read on every sample.
+    """
+
+    def __init__(self, proc_root='/proc', max_reads=512, interval=1.0):
+        self.proc_root = proc_root
+        self.max_reads = max_reads
+        self.interval = interval
+        self.pid = None
+        self.threads = {}   # tid -> ThreadSample
+        self.total_threads = 0
+        self.last_read = 0
+        self.error = None
+        self._cursor = 0
+        self._last_sample = 0
+
+    def reset(self, pid=None):
+        self.pid = pid
+        self.threads = {}
+        self.total_threads = 0
+        self.last_read = 0
+        self.error = None
+        self._cursor = 0
+        self._last_sample = 0
+
+    def sample(self, pid, force=False):
+        """Read a bounded batch of thread stats for `pid` (re-sampled at most every `interval`)"""
+        if pid != self.pid:
+            self.reset(pid)
+        now = time.monotonic()
+        if not force and now - self._last_sample < self.interval:
+            return False
+        self._last_sample = now
+
+        task_dir = os.path.join(self.proc_root, str(pid), 'task')
+        try:
+            tids = sorted(int(tid) for tid in os.listdir(task_dir) if tid.isdigit())
+        except OSError as e:
+            self.threads = {}
+            self.total_threads = 0
+            self.error = e.strerror or str(e)
+            return False
+        self.error = None
+        self.total_threads = len(tids)
+        live = set(tids)
+        self.threads = {tid: thread for tid, thread in self.threads.items() if tid in live}
+
+        if len(tids) > self.max_reads:
+            # Cele active la fiecare eșantion, restul într-o fereastră circulară
+            hot = [t.tid for t in self.hottest(HOT_THREADS) if t.cpu_percent or t.state == 'R']
+            hot_set = set(hot)
+            rest = [tid for tid in tids if tid not in hot_set]
+            count = self.max_reads - len(hot)
+            start = self._cursor % len(rest)
+            batch = hot + (rest[start:] + rest[:start])[:count]
+            self._cursor = start + count
+        else:
+            batch = tids
+
+        for tid in batch:
+            stat = read_thread_stat(os.path.join(task_dir, str(tid), 'stat'))
+            if stat is None:
+                self.threads.pop(tid, None)
+                continue
+            thread = self.threads.get(tid)
+            if thread is None:
+                thread = self.threads[tid] = ThreadSample(tid)
+            name, state, ticks, processor = stat
+            if thread.ticks is not None:
+                elapsed = now - thread.sampled_at
+                if elapsed > 0:
+                    thread.cpu_percent = max(0.0, (ticks - thread.ticks) / CLK_TCK / elapsed * 100)
+            thread.name, thread.state, thread.processor = name, state, processor
+            thread.ticks, thread.sampled_at = ticks, now
+        self.last_read = len(batch)
+        return True
+
+    def hottest(self, limit=None):
+        """Threads by CPU% (unmeasured last), at most `limit`"""
+        rows = sorted(self.threads.values(),
+                      key=lambda t: (t.cpu_percent is not None, t.cpu_percent or 0.0, -t.tid), reverse=True)
+        return rows[:limit]
@@ -1,17 +1,33 @@
 import curses
-import psutil
-import os
-import time
-import platform
+import math
 from datetime import datetime
 
-# Variabile globale pentru statistici CPU
-_prev_cpu_times = None
-_prev_cpu_time = None
+# Coloana pentru informațiile din dreapta barelor de progres (barele ocupă ~46 de caractere)
+INFO_COLUMN_X = 50
 
-# Variabile globale pentru statistici rețea
-_prev_net_io = None
-_prev_net_time = None
+# Glife pentru grila per-nucleu (un caracter per nucleu)
+CORE_GLYPHS = '▁▂▃▄▅▆▇█'
+
+def handle_text_input(text, key):
+    """Aplică o tastă unui câmp de text; returnează (text, stare), stare în 'edit'/'done'/'cancel'"""
+    if key in (10, 13, curses.KEY_ENTER):
+        return text, 'done'
+    if key == 27:
+        return text, 'cancel'
+    if key in (curses.KEY_BACKSPACE, 127, 8):
+        return text[:-1], 'edit'
+    if 32 <= key < 127:
+        return text + chr(key), 'edit'
+    return text, 'edit'
+
+def draw_input_line(stdscr, y, x, prompt, text, width, active=True):
+    """Desenează un câmp de text pe o linie (cu cursor când este activ)"""
+    line = f"{prompt}{text}{'█' if active else ''}"
+    try:
+        stdscr.addstr(y, x, line[-(width - 1):] if len(line) >= width else line,
+                      curses.A_BOLD | curses.color_pair(2))
+    except curses.error:
+        pass
 
 def init_colors():
     """Inițializează paleta de culori pentru interfața curses"""
@@ -44,172 +60,68 @@ def draw_progress_bar(stdscr, y, x, width, percent, label):
     except curses.error:
         pass
 
-def reset_cpu_stats():
-    """Resetează statisticile CPU pentru recalculare"""
-    global _prev_cpu_times, _prev_cpu_time
-    _prev_cpu_times = None
-    _prev_cpu_time = None
-
-def get_cpu_usage():
-    """
-    Calculează utilizarea reală a CPU-ului la nivel de sistem
-    folosind diferențele de timp între măsurători
-    """
-    global _prev_cpu_times, _prev_cpu_time
-    
-    try:
-        # Obține timpii curenti de CPU
-        current_cpu_times = psutil.cpu_times()
-        current_time = time.time()
-        
-        if _prev_cpu_times is None or _prev_cpu_time is None:
-            # Prima apelare, inițializează valorile
-            _prev_cpu_times = current_cpu_times
-            _prev_cpu_time = current_time
-            return 0.0
-        
-        # Calculează diferența de timp
-        time_diff = current_time - _prev_cpu_time
-        if time_diff <= 0:
-            return 0.0
-        
-        # Calculează diferențele de utilizare CPU
-        user_diff = current_cpu_times.user - _prev_cpu_times.user
-        system_diff = current_cpu_times.system - _prev_cpu_times.system
-        idle_diff = current_cpu_times.idle - _prev_cpu_times.idle
-        
-        # Calculează timpul total de CPU
-        total_diff = user_diff + system_diff + idle_diff
-        if total_diff <= 0:
-            return 0.0
-        
-        # Calculează procentajul de utilizare
-        # (timp activ / timp total) * 100
-        active_diff = user_diff + system_diff
-        cpu_percent = (active_diff / total_diff) * 100
-        
-        # Actualizează valorile anterioare
-        _prev_cpu_times = current_cpu_times
-        _prev_cpu_time = current_time
-        
-        return min(100.0, cpu_percent)
-        
-    except Exception:
-        return 0.0
+def load_color(percent):
+    """Alege culoarea pentru un procent de încărcare"""
+    if percent > 80:
+        return curses.color_pair(3)
+    elif percent > 60:
+        return curses.color_pair(2)
+    return curses.color_pair(1)
 
-def reset_network_stats():
-    """Resetează statisticile de rețea pentru recalculare"""
-    global _prev_net_io, _prev_net_time
-    _prev_net_io = None
-    _prev_net_time = None
+def format_cpu_breakdown(breakdown):
+    """Formatează defalcarea CPU agregată pe stări (us/sy/wa/hi/si/st)"""
+    if not breakdown:
+        return ""
+    # Procente întregi, fără spații: încape în coloana de informații la 80 de coloane
+    user = breakdown.get('user', 0.0) + breakdown.get('nice', 0.0)
+    return (f"us{user:.0f} sy{breakdown.get('system', 0.0):.0f} "
+            f"wa{breakdown.get('iowait', 0.0):.0f} hi{breakdown.get('irq', 0.0):.0f} "
+            f"si{breakdown.get('softirq', 0.0):.0f} st{breakdown.get('steal', 0.0):.0f}")
 
-def get_network_usage_percent(max_speed_mbps=100):
-    """
-    Calculează utilizarea rețelei ca procent din viteza maximă așteptată
+def draw_core_grid(stdscr, y, x, max_width, per_core, rows=4):
+    """Desenează grila compactă per-nucleu: un glif per nucleu, `rows` rânduri"""
+    if not per_core or max_width < 4:
+        return
     
-    Args:
-        max_speed_mbps: Viteza maximă așteptată în Mbps (implicit 100)
+    # Dacă nucleele nu încap, fiecare celulă afișează maximul unui grup de nuclee
+    group = max(1, math.ceil(len(per_core) / (rows * max_width)))
+    if group > 1:
+        cells = [max(per_core[i:i + group]) for i in range(0, len(per_core), group)]
+    else:
+        cells = per_core
+    columns = math.ceil(len(cells) / rows)
     
-    Returns:
-        Procentul utilizării rețelei (0-100)
-    """
-    global _prev_net_io, _prev_net_time
-    
-    try:
-        current_net_io = psutil.net_io_counters()
-        if current_net_io is None:
-            return 0.0
-            
-        current_time = time.time()
-        
-        if _prev_net_io is None or _prev_net_time is None:
-            # Prima apelare, inițializează și returnează 0
-            _prev_net_io = current_net_io
-            _prev_net_time = current_time
-            return 0.0
-        
-        # Calculează diferența de timp
-        time_diff = current_time - _prev_net_time
-        if time_diff <= 0:
-            return 0.0
-        
-        # Calculează bytes transferați pe secundă
-        bytes_sent_per_sec = max(0, (current_net_io.bytes_sent - _prev_net_io.bytes_sent) / time_diff)
-        bytes_recv_per_sec = max(0, (current_net_io.bytes_recv - _prev_net_io.bytes_recv) / time_diff)
-        total_bytes_per_sec = bytes_sent_per_sec + bytes_recv_per_sec
-        
-        # Convertește în Mbps (1 byte = 8 bits, 1 Mbps = 1,000,000 bits/sec)
-        mbps = (total_bytes_per_sec * 8) / 1_000_000
-        
-        # Calculează procentul din viteza maximă
-        percent = min(100.0, (mbps / max_speed_mbps) * 100)
-        
-        # Actualizează valorile anterioare
-        _prev_net_io = current_net_io
-        _prev_net_time = current_time
-        
-        return percent
-        
-    except Exception:
-        return 0.0
+    for row in range(rows):
+        row_cells = cells[row * columns:(row + 1) * columns]
+        col = 0
+        # Un singur addstr per secvență de celule cu aceeași culoare
+        while col < len(row_cells):
+            color = load_color(row_cells[col])
+            end = col
+            while end < len(row_cells) and load_color(row_cells[end]) == color:
+                end += 1
+            text = ''.join(CORE_GLYPHS[min(7, int(v * 8 / 100))] for v in row_cells[col:end])
+            try:
+                stdscr.addstr(y + row, x + col, text, color)
+            except curses.error:
+                pass
+            col = end
 
-def get_load_average():
-    """Obține load average-ul sistemului, compatibil cross-platform"""
+def draw_system_stats(stdscr, stats):
+    """Desenează statisticile sistemului din ultimul eșantion (fără I/O)"""
     try:
-        if platform.system() == "Windows":
-            # Pe Windows, folosim CPU usage ca aproximare pentru load
-            return [psutil.cpu_percent(interval=None)] * 3
+        cpu_percent = stats.get('cpu_percent', 0.0)
+        mem_percent = stats.get('mem_percent', 0.0)
+        disk_percent = stats.get('disk_percent', 0.0)
+        net_percent = stats.get('net_percent', 0.0)
+        process_count = stats.get('process_count', 0)
+        
+        boot_time = stats.get('boot_time')
+        if boot_time:
+            uptime = datetime.now() - datetime.fromtimestamp(boot_time)
+            uptime_str = str(uptime).split('.')[0]  # Elimină microsecondele
         else:
-            # Pe Unix/Linux/macOS
-            return list(os.getloadavg())
-    except Exception:
-        return [0.0, 0.0, 0.0]
-
-def get_disk_usage(path='/'):
-    """Obține utilizarea discului pentru calea specificată"""
-    try:
-        disk = psutil.disk_usage(path)
-        return (disk.used / disk.total) * 100
-    except Exception:
-        return 0.0
-
-def draw_system_stats(stdscr):
-    """Desenează statisticile sistemului cu gestionare robustă a erorilor"""
-    try:
-        # Obține statisticile cu gestionare individuală a erorilor
-        
-        # Folosim noua metodă precisă pentru CPU
-        try:
-            cpu_percent = get_cpu_usage()
-        except Exception:
-            cpu_percent = 0.0
-            
-        try:
-            mem = psutil.virtual_memory()
-            mem_percent = mem.percent
-        except Exception:
-            mem_percent = 0.0
-            
-        try:
-            disk_percent = get_disk_usage('/')
-        except Exception:
-            disk_percent = 0.0
-            
-        try:
-            net_percent = get_network_usage_percent()
-        except Exception:
-            net_percent = 0.0
-            
-        try:
-            uptime = datetime.now() - datetime.fromtimestamp(psutil.boot_time())
-            uptime_str = str(uptime).split('.')[0]  # Elimină microsecondle
-        except Exception:
             uptime_str = "N/A"
-            
-        try:
-            process_count = len(psutil.pids())
-        except Exception:
-            process_count = 0
 
         # Desenează barele de progres
         draw_progress_bar(stdscr, 1, 2, 30, cpu_percent, "CPU")
@@ -219,21 +131,38 @@ def draw_system_stats(stdscr):
 
         # Informații suplimentare
         try:
-            stdscr.addstr(1, 40, f"Procese: {process_count}")
+            stdscr.addstr(1, INFO_COLUMN_X, f"Procese: {process_count}")
         except curses.error:
             pass
             
         try:
-            stdscr.addstr(2, 40, f"Uptime: {uptime_str}")
+            stdscr.addstr(2, INFO_COLUMN_X, f"Uptime: {uptime_str}")
         except curses.error:
             pass
             
         try:
-            load_avg = get_load_average()
+            load_avg = stats.get('load_avg', [0.0, 0.0, 0.0])
             load_str = ' '.join(f'{x:.2f}' for x in load_avg)
-            stdscr.addstr(3, 40, f"Load: {load_str}")
+            stdscr.addstr(3, INFO_COLUMN_X, f"Load: {load_str}")
+        except curses.error:
+            pass
+        
+        # Defalcarea CPU pe stări (iowait/irq/softirq/steal incluse)
+        width = stdscr.getmaxyx()[1]
+        breakdown_str = format_cpu_breakdown(stats.get('cpu_breakdown'))
+        try:
+            stdscr.addstr(4, INFO_COLUMN_X, breakdown_str[:max(0, width - INFO_COLUMN_X - 2)], curses.A_DIM)
         except curses.error:
             pass
+        
+        # Grila per-nucleu în dreapta header-ului; pe terminale înguste, pe rândul liber de sub bare
+        per_core = stats.get('per_core')
+        if per_core:
+            grid_x = INFO_COLUMN_X + max(30, len(breakdown_str)) + 2
+            if width - grid_x - 2 >= 4:
+                draw_core_grid(stdscr, 1, grid_x, width - grid_x - 2, per_core)
+            else:
+                draw_core_grid(stdscr, 5, 2, width - 4, per_core, rows=1)
             
     except Exception:
         # Fallback în caz de eroare generală